@@ -0,0 +1,6 @@
+#!/bin/bash
+
+# Mede cada etapa do gerador, por exemplo:
+#   ./bench.sh --pages 1000 --save bench-baseline.json
+#   ./bench.sh --pages 1000 --compare bench-baseline.json --threshold 0.2
+python3 src/benchmark.py "$@"
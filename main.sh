@@ -1,3 +1,9 @@
-python3 src/main.py
-cd public
-python3 -m http.server 8888
\ No newline at end of file
+#!/bin/bash
+
+# Gera o site e continua reconstruindo em segundo plano a cada alteração
+python3 src/main.py --watch &
+WATCH_PID=$!
+trap 'kill $WATCH_PID' EXIT
+
+# Serve docs/static_site com ETag/304, gzip e cache em memória (ver src/server.py)
+python3 src/server.py docs/static_site --port 8888
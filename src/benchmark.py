@@ -0,0 +1,254 @@
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+from blocktype import BlockType, classify_block
+from markdown import extract_title, iter_blocks, markdown_to_html_node
+from template import compile_template
+from textnode import text_to_textnodes
+
+STAGES = ["markdown_to_blocks", "block_to_block_type", "text_to_textnodes", "to_html", "template", "write"]
+
+WORDS = (
+    "tolkien hobbit ring elf dwarf wizard shire mordor gondor rohan river mountain forest "
+    "journey quest song tale legend king queen sword shield fire shadow light star sea"
+).split()
+
+BENCH_TEMPLATE = """<!doctype html>
+<html>
+  <head>
+    <title>{{ Title }}</title>
+    <link href="/index.css" rel="stylesheet" />
+  </head>
+  <body>
+    <article>{{ Content }}</article>
+  </body>
+</html>
+"""
+
+
+def _sentence(rng, words, link_density, image_density):
+    """Gera uma frase com marcações inline aleatórias."""
+    parts = []
+    for _ in range(words):
+        word = rng.choice(WORDS)
+        roll = rng.random()
+        if roll < 0.05:
+            word = f"**{word}**"
+        elif roll < 0.08:
+            word = f"_{word}_"
+        elif roll < 0.10:
+            word = f"`{word}`"
+        parts.append(word)
+    if rng.random() < link_density:
+        parts.append(f"[{rng.choice(WORDS)}](/blog/{rng.choice(WORDS)})")
+    if rng.random() < image_density:
+        parts.append(f"![{rng.choice(WORDS)}](/images/{rng.choice(WORDS)}.png)")
+    return " ".join(parts).capitalize() + "."
+
+
+def generate_page_markdown(rng, paragraphs=5, paragraph_words=60, list_density=0.3,
+                           code_density=0.1, image_density=0.2, link_density=0.3):
+    """Gera o markdown de uma página sintética."""
+    blocks = [f"# {rng.choice(WORDS).title()} {rng.randint(1, 10_000)}"]
+    for index in range(paragraphs):
+        if index % 3 == 0:
+            blocks.append(f"## {rng.choice(WORDS).title()}")
+        blocks.append(_sentence(rng, paragraph_words, link_density, image_density))
+        if rng.random() < list_density:
+            items = [_sentence(rng, 8, link_density, 0) for _ in range(rng.randint(2, 6))]
+            if rng.random() < 0.5:
+                blocks.append("\n".join(f"- {item}" for item in items))
+            else:
+                blocks.append("\n".join(f"{n}. {item}" for n, item in enumerate(items, 1)))
+        if rng.random() < code_density:
+            lines = [f"print(\"{rng.choice(WORDS)}\")" for _ in range(rng.randint(2, 8))]
+            blocks.append("```\n" + "\n".join(lines) + "\n```")
+        if rng.random() < 0.1:
+            blocks.append("> " + _sentence(rng, 20, 0, 0))
+    return "\n\n".join(blocks) + "\n"
+
+
+def generate_corpus(dest_dir, pages=100, seed=0, pages_per_dir=50, **options):
+    """
+    Gera uma árvore content/ sintética em `dest_dir`.
+
+    As opções (paragraphs, paragraph_words, list_density, code_density,
+    image_density, link_density) controlam o tamanho e a densidade de cada
+    tipo de bloco. Com a mesma semente o corpus é sempre o mesmo.
+    """
+    rng = random.Random(seed)
+    paths = []
+    for index in range(pages):
+        directory = os.path.join(dest_dir, f"section{index // pages_per_dir:03d}", f"page{index:05d}")
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, "index.md")
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(generate_page_markdown(rng, **options))
+        paths.append(path)
+    return paths
+
+
+def _inline_texts(block):
+    """Textos inline de um bloco classificado (o que text_to_textnodes recebe)."""
+    if block.block_type == BlockType.CODE:
+        return []
+    if block.items is not None:
+        return block.items
+    return [block.text]
+
+
+def _timed(function, repeat):
+    """Executa `function` `repeat` vezes e retorna o menor tempo, em segundos."""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def run_benchmark(content_dir, repeat=3):
+    """
+    Mede o tempo de cada etapa do pipeline sobre todos os markdown de `content_dir`.
+
+    Cada etapa é medida isoladamente, com as entradas já preparadas pela
+    etapa anterior, e o resultado é o menor tempo entre `repeat` execuções.
+    """
+    documents = []
+    for root, dirs, files in os.walk(content_dir):
+        dirs.sort()
+        for name in sorted(files):
+            if name.endswith(".md"):
+                with open(os.path.join(root, name), "r", encoding="utf-8") as file:
+                    documents.append(file.read())
+
+    # Entradas de cada etapa, preparadas fora da medição
+    blocks = [block for document in documents for block in iter_blocks(document)]
+    classified = [classify_block(block) for block in blocks]
+    inline = [text for block in classified for text in _inline_texts(block)]
+    trees = [markdown_to_html_node(document) for document in documents]
+    bodies = [tree.to_html() for tree in trees]
+    titles = [extract_title(document) for document in documents]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        template_path = os.path.join(tmp, "template.html")
+        with open(template_path, "w", encoding="utf-8") as file:
+            file.write(BENCH_TEMPLATE)
+        template = compile_template(template_path)
+        pages = [template.render({"Title": title, "Content": body}) for title, body in zip(titles, bodies)]
+
+        def write_pages():
+            for index, page in enumerate(pages):
+                with open(os.path.join(tmp, f"page{index}.html"), "w", encoding="utf-8") as file:
+                    file.write(page)
+
+        stages = {
+            "markdown_to_blocks": _timed(lambda: [list(iter_blocks(document)) for document in documents], repeat),
+            "block_to_block_type": _timed(lambda: [classify_block(block) for block in blocks], repeat),
+            "text_to_textnodes": _timed(lambda: [text_to_textnodes(text) for text in inline], repeat),
+            "to_html": _timed(lambda: [tree.to_html() for tree in trees], repeat),
+            "template": _timed(
+                lambda: [template.render({"Title": t, "Content": b}) for t, b in zip(titles, bodies)], repeat),
+            "write": _timed(write_pages, repeat),
+        }
+
+    return {
+        "corpus": {
+            "pages": len(documents),
+            "bytes": sum(len(document.encode("utf-8")) for document in documents),
+            "blocks": len(blocks),
+            "inline_fragments": len(inline),
+        },
+        "repeat": repeat,
+        "python": platform.python_version(),
+        "stages": stages,
+    }
+
+
+def save_results(results, path):
+    """Grava os resultados em JSON para servirem de baseline."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(results, file, indent=2, sort_keys=True)
+
+
+def load_results(path):
+    """Lê resultados gravados por save_results."""
+    with open(path, "r", encoding="utf-8") as file:
+        return json.load(file)
+
+
+def compare_results(baseline, current, threshold=0.2):
+    """
+    Compara duas medições e retorna as regressões.
+
+    Uma etapa regrediu quando ficou mais de `threshold` (fração) mais lenta
+    que no baseline. Retorna uma lista de (etapa, tempo_base, tempo_atual, razão).
+    """
+    regressions = []
+    for stage in STAGES:
+        before = baseline["stages"].get(stage)
+        after = current["stages"].get(stage)
+        if not before or after is None:
+            continue
+        ratio = after / before
+        if ratio > 1 + threshold:
+            regressions.append((stage, before, after, ratio))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mede o tempo de cada etapa do gerador sobre um corpus sintético.")
+    parser.add_argument("--pages", type=int, default=200, help="número de páginas do corpus")
+    parser.add_argument("--paragraphs", type=int, default=5, help="parágrafos por página")
+    parser.add_argument("--paragraph-words", type=int, default=60, help="palavras por parágrafo")
+    parser.add_argument("--list-density", type=float, default=0.3, help="probabilidade de lista após cada parágrafo")
+    parser.add_argument("--code-density", type=float, default=0.1, help="probabilidade de bloco de código")
+    parser.add_argument("--image-density", type=float, default=0.2, help="probabilidade de imagem por parágrafo")
+    parser.add_argument("--link-density", type=float, default=0.3, help="probabilidade de link por frase")
+    parser.add_argument("--seed", type=int, default=0, help="semente do gerador de conteúdo")
+    parser.add_argument("--repeat", type=int, default=3, help="repetições por etapa (usa o menor tempo)")
+    parser.add_argument("--content", help="usa um diretório content/ existente em vez do corpus sintético")
+    parser.add_argument("--save", help="grava os resultados em JSON neste caminho")
+    parser.add_argument("--compare", help="compara com um baseline em JSON e falha se houver regressão")
+    parser.add_argument("--threshold", type=float, default=0.2, help="regressão tolerada por etapa (0.2 = 20%%)")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        content_dir = args.content
+        if content_dir is None:
+            content_dir = os.path.join(tmp, "content")
+            generate_corpus(content_dir, pages=args.pages, seed=args.seed,
+                            paragraphs=args.paragraphs, paragraph_words=args.paragraph_words,
+                            list_density=args.list_density, code_density=args.code_density,
+                            image_density=args.image_density, link_density=args.link_density)
+        results = run_benchmark(content_dir, repeat=args.repeat)
+
+    corpus = results["corpus"]
+    print(f"Corpus: {corpus['pages']} pages, {corpus['bytes']} bytes, {corpus['blocks']} blocks")
+    for stage in STAGES:
+        print(f"{stage:>20}: {results['stages'][stage] * 1000:9.2f} ms")
+
+    if args.save:
+        save_results(results, args.save)
+        print(f"Results saved to {args.save}")
+
+    if args.compare:
+        regressions = compare_results(load_results(args.compare), results, args.threshold)
+        for stage, before, after, ratio in regressions:
+            print(f"REGRESSION {stage}: {before * 1000:.2f} ms -> {after * 1000:.2f} ms ({ratio:.2f}x)")
+        if regressions:
+            return 1
+        print(f"No stage slower than {args.threshold:.0%} over {args.compare}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
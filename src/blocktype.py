@@ -12,10 +12,96 @@ class BlockType(Enum):
     ORDERED_LIST = "ordered_list"
 
 
+FENCE = "```"
+HEADING_PATTERN = re.compile(r"(#{1,6}) ")
+ORDERED_ITEM_PATTERN = re.compile(r"\d+\. ")
+
+
+class Block:
+    """
+    Bloco Markdown já classificado, com as partes extraídas durante a classificação.
+
+    - text: texto do título, corpo do código, texto da citação ou do parágrafo;
+    - level: nível do título (1 a 6), apenas para cabeçalhos;
+    - items: conteúdo de cada item, apenas para listas.
+    """
+    __slots__ = ("block_type", "text", "level", "items")
+
+    def __init__(self, block_type, text="", level=None, items=None):
+        self.block_type = block_type
+        self.text = text
+        self.level = level
+        self.items = items
+
+    def __eq__(self, other):
+        if not isinstance(other, Block):
+            return False
+        return (self.block_type, self.text, self.level, self.items) == (other.block_type, other.text, other.level, other.items)
+
+    def __repr__(self):
+        return f"Block({self.block_type.value}, {self.text!r}, level={self.level}, items={self.items})"
+
+
+def classify_block(block: str) -> Block:
+    """
+    Classifica um bloco Markdown e extrai suas partes em uma única varredura.
+
+    Segue as mesmas regras de block_to_block_type, mas já devolve o nível e
+    o texto dos cabeçalhos, o corpo do código e os itens das listas, para que
+    o bloco não precise ser analisado de novo ao gerar o HTML.
+    """
+    # Cabeçalho: o nível é o número de '#' do prefixo, não do texto inteiro
+    heading = HEADING_PATTERN.match(block)
+    if heading:
+        return Block(BlockType.HEADING, block[heading.end():], level=len(heading.group(1)))
+
+    lines = block.split("\n")
+
+    # Código: o corpo fica entre a cerca de abertura e a de fechamento
+    if lines[0].startswith(FENCE) and lines[-1].startswith(FENCE):
+        if len(lines) == 1:
+            return Block(BlockType.CODE, block[len(FENCE):-len(FENCE)])
+        return Block(BlockType.CODE, "\n".join(lines[1:-1]) + "\n")
+
+    # Citação e listas são verificadas juntas, linha a linha
+    quote, unordered, ordered = [], [], []
+    for line in lines:
+        if quote is not None:
+            if line.startswith(">"):
+                quote.append(line[1:].strip())
+            else:
+                quote = None
+        if unordered is not None:
+            if line.startswith("- "):
+                unordered.append(line[2:])
+            else:
+                unordered = None
+        if ordered is not None:
+            item = ORDERED_ITEM_PATTERN.match(line)
+            if item:
+                ordered.append(line[item.end():].strip())
+            else:
+                ordered = None
+        if quote is None and unordered is None and ordered is None:
+            break
+
+    if quote is not None:
+        return Block(BlockType.QUOTE, " ".join(part for part in quote if part))
+    if unordered is not None:
+        return Block(BlockType.UNORDERED_LIST, items=unordered)
+    if ordered is not None:
+        return Block(BlockType.ORDERED_LIST, items=ordered)
+    # Caso contrário, é um parágrafo; suas linhas são unidas por espaços
+    return Block(BlockType.PARAGRAPH, " ".join(lines))
+
+
 def block_to_block_type(block: str) -> BlockType:
     """
     Determina o tipo de bloco Markdown com base no seu formato.
 
+    Mantida por compatibilidade: quem precisa também das partes do bloco
+    deve usar classify_block.
+
     Regras:
     - Cabeçalhos: Começam com # (1-6) seguido de espaço.
     - Código: Começa e termina com ```.
@@ -30,21 +116,4 @@ def block_to_block_type(block: str) -> BlockType:
     Retorno:
     - BlockType: Enum representando o tipo do bloco.
     """
-    lines = block.split("\n")
-    # Verifica se é um cabeçalho (heading)
-    if re.match(r"^#{1,6} ", lines[0]):
-        return BlockType.HEADING
-    # Verifica se é um bloco de código (code)
-    if lines[0].startswith("```") and lines[-1].startswith("```"):
-        return BlockType.CODE
-    # Verifica se é uma citação (quote)
-    if all(line.startswith(">") for line in lines):
-        return BlockType.QUOTE
-    # Verifica se é uma lista não ordenada (unordered list)
-    if all(re.match(r"^- ", line) for line in lines):
-        return BlockType.UNORDERED_LIST
-    # Verifica se é uma lista ordenada (ordered list)
-    if all(re.match(r"^\d+\. ", line) for line in lines):
-        return BlockType.ORDERED_LIST
-    # Caso contrário, é um parágrafo
-    return BlockType.PARAGRAPH
+    return classify_block(block).block_type
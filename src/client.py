@@ -0,0 +1,59 @@
+import argparse
+import json
+import os
+import socket
+import sys
+
+# Importa apenas a biblioteca padrão: o cliente precisa iniciar rápido (o trabalho fica com o daemon)
+DEFAULT_SOCKET = ".cache/build.sock"
+COMMANDS = ("rebuild", "all", "stats", "stop")
+
+
+def send(request, socket_path=DEFAULT_SOCKET):
+    """Envia um comando ao daemon de build e retorna a resposta (um dicionário)."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+        connection.connect(socket_path)
+        connection.sendall(json.dumps(request).encode("utf-8") + b"\n")
+        with connection.makefile("rb") as stream:
+            line = stream.readline()
+    if not line:
+        raise ConnectionError("build daemon closed the connection without answering")
+    return json.loads(line)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Envia comandos ao daemon de build (python3 src/main.py --daemon).")
+    parser.add_argument("command", choices=COMMANDS,
+                        help="rebuild: reconstrói os caminhos indicados; all: build incremental completo; "
+                             "stats: contadores do daemon; stop: encerra o daemon")
+    parser.add_argument("paths", nargs="*", help="arquivos alterados (markdown, estáticos ou o template)")
+    parser.add_argument("--socket", default=DEFAULT_SOCKET, help=f"socket do daemon (padrão: {DEFAULT_SOCKET})")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    request = {"command": args.command}
+    if args.command == "rebuild":
+        # O daemon pode ter outro diretório de trabalho
+        request["paths"] = [os.path.abspath(path) for path in args.paths]
+    try:
+        response = send(request, args.socket)
+    except (FileNotFoundError, ConnectionRefusedError):
+        print(f"Build daemon is not running at {args.socket} (start it with: python3 src/main.py --daemon)",
+              file=sys.stderr)
+        return 1
+    for line in response.get("log", []):
+        print(line)
+    if args.command == "stats":
+        print(json.dumps(response.get("stats", {}), indent=1, sort_keys=True))
+    if not response.get("ok"):
+        print(f"Error: {response.get('error', 'unknown error')}", file=sys.stderr)
+        return 1
+    if "elapsed_ms" in response:
+        print(f"Done in {response['elapsed_ms']:.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
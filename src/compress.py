@@ -0,0 +1,177 @@
+import contextlib
+import gzip
+import os
+from concurrent.futures import ThreadPoolExecutor
+from copy_directory import remove_file
+from output import OutputWriter
+
+# Extensões de arquivos de texto que valem a pena pré-comprimir
+TEXT_EXTENSIONS = {".html", ".css", ".js", ".mjs", ".json", ".svg", ".xml", ".txt", ".map", ".webmanifest"}
+DEFAULT_MIN_SIZE = 1024
+
+
+class CompressResult:
+    """Resultado de uma passada de pré-compressão."""
+
+    def __init__(self):
+        self.compressed = 0
+        self.skipped = 0
+        self.removed = 0
+
+    def __repr__(self):
+        return f"CompressResult(compressed={self.compressed}, skipped={self.skipped}, removed={self.removed})"
+
+
+def gzip_path(path):
+    return path + ".gz"
+
+
+def is_stale(path):
+    """
+    Verifica se o .gz de um arquivo precisa ser (re)gerado.
+
+    O .gz recebe o mesmo mtime da origem, então basta compará-los: como
+    páginas e arquivos estáticos inalterados mantêm o mtime, o .gz só é
+    refeito quando a origem muda de fato.
+    """
+    try:
+        gz_stat = os.stat(gzip_path(path))
+    except FileNotFoundError:
+        return True
+    return gz_stat.st_mtime_ns != os.stat(path).st_mtime_ns
+
+
+def gzip_file(path, level=9):
+    """
+    Grava `path`.gz de forma atômica, com o mesmo mtime da origem.
+
+    O cabeçalho gzip não inclui nome nem data, então a mesma entrada sempre
+    gera os mesmos bytes.
+    """
+    src_stat = os.stat(path)
+    tmp_path = f"{gzip_path(path)}.{os.getpid()}.tmp"
+    try:
+        with open(path, "rb") as src, open(tmp_path, "wb") as raw:
+            with gzip.GzipFile(filename="", mode="wb", compresslevel=level, fileobj=raw, mtime=0) as dest:
+                for chunk in iter(lambda: src.read(1 << 20), b""):
+                    dest.write(chunk)
+        os.utime(tmp_path, ns=(src_stat.st_atime_ns, src_stat.st_mtime_ns))
+        os.replace(tmp_path, gzip_path(path))
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def compress_directory(root, min_size=DEFAULT_MIN_SIZE, jobs=1, level=9, verbose=True):
+    """
+    Gera arquivos .gz ao lado de cada arquivo de texto de `root`.
+
+    Arquivos menores que `min_size` bytes não são comprimidos, e .gz cuja
+    origem sumiu ou ficou abaixo do limite são removidos (junto com os
+    diretórios que ficarem vazios). A compressão roda em `jobs` threads:
+    o zlib libera o GIL enquanto comprime.
+    """
+    result = CompressResult()
+    pending = []
+    for directory, dirs, files in os.walk(root):
+        dirs.sort()
+        names = set(files)
+        for name in sorted(files):
+            path = os.path.join(directory, name)
+            if name.endswith(".gz"):
+                source = name[:-3]
+                if os.path.splitext(source)[1].lower() not in TEXT_EXTENSIONS:
+                    continue  # Arquivo .gz que não foi gerado aqui (por exemplo, um .tar.gz)
+                if source not in names or not _wants_gzip(os.path.join(directory, source), min_size):
+                    remove_file(path, root)
+                    result.removed += 1
+                    if verbose:
+                        print(f"Removed stale {path}")
+                continue
+            if not _wants_gzip(path, min_size):
+                continue
+            if is_stale(path):
+                pending.append(path)
+            else:
+                result.skipped += 1
+
+    jobs = max(1, min(jobs, len(pending)))
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        for path, _ in zip(pending, pool.map(lambda path: gzip_file(path, level), pending)):
+            result.compressed += 1
+            if verbose:
+                print(f"Compressed {path}")
+    return result
+
+
+def refresh_gzip(path, root, min_size=DEFAULT_MIN_SIZE, level=9):
+    """
+    Atualiza o .gz de um único arquivo que acabou de ser gravado ou removido.
+
+    Retorna "compressed" se o .gz foi (re)gerado, "removed" se a origem
+    sumiu ou ficou abaixo do limite e o .gz foi apagado (com os diretórios
+    vazios até `root`), ou "skipped".
+    """
+    if os.path.exists(path) and _wants_gzip(path, min_size):
+        if not is_stale(path):
+            return "skipped"
+        gzip_file(path, level)
+        return "compressed"
+    if remove_file(gzip_path(path), root):
+        return "removed"
+    return "skipped"
+
+
+class GzipWriter(OutputWriter):
+    """
+    OutputWriter que mantém os .gz em dia a cada arquivo gravado, copiado ou removido.
+
+    Usado pelos modos watch e daemon, que reconstroem arquivos isolados em
+    vez de passar o destino inteiro por compress_directory. Os contadores
+    ficam em `result` (CompressResult).
+    """
+
+    def __init__(self, min_size=DEFAULT_MIN_SIZE, level=9, verbose=True):
+        super().__init__()
+        self.min_size = min_size
+        self.level = level
+        self.verbose = verbose
+        self.result = CompressResult()
+
+    def refresh(self, path, root=None):
+        status = refresh_gzip(path, root if root is not None else os.path.dirname(path), self.min_size, self.level)
+        if status == "compressed":
+            self.result.compressed += 1
+            if self.verbose:
+                print(f"Compressed {path}")
+        elif status == "removed":
+            self.result.removed += 1
+            if self.verbose:
+                print(f"Removed stale {gzip_path(path)}")
+        else:
+            self.result.skipped += 1
+
+    @contextlib.contextmanager
+    def open(self, path):
+        with super().open(path) as stream:
+            yield stream
+        self.refresh(path)
+
+    def copy(self, src_path, dest_path, checksum=False, link=False):
+        status = super().copy(src_path, dest_path, checksum, link)
+        self.refresh(dest_path)
+        return status
+
+    def remove(self, path, root):
+        # Sem a origem, o .gz também é removido, junto com os diretórios que ficarem vazios
+        removed = super().remove(path, root)
+        self.refresh(path, root)
+        return removed
+
+
+def _wants_gzip(path, min_size):
+    """Arquivos de texto com pelo menos `min_size` bytes."""
+    if os.path.splitext(path)[1].lower() not in TEXT_EXTENSIONS:
+        return False
+    return os.path.getsize(path) >= min_size
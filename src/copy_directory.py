@@ -1,22 +1,163 @@
 import os
 import shutil
+from manifest import hash_file
+
+
+class SyncResult:
+    """Resultado de uma sincronização: contadores e a lista de arquivos presentes na origem."""
+
+    def __init__(self):
+        self.copied = 0
+        self.linked = 0
+        self.skipped = 0
+        self.removed = 0
+        self.files = []
+
+    def __repr__(self):
+        return (f"SyncResult(copied={self.copied}, linked={self.linked}, "
+                f"skipped={self.skipped}, removed={self.removed})")
+
+
+def files_match(src_path, dest_path, checksum=False):
+    """
+    Verifica se o arquivo de destino já corresponde à origem.
+
+    Compara primeiro o tamanho e o mtime (preservado pela cópia); com
+    checksum=True, arquivos de mesmo tamanho são comparados pelo hash.
+    """
+    try:
+        dest_stat = os.stat(dest_path)
+    except FileNotFoundError:
+        return False
+    src_stat = os.stat(src_path)
+    if os.path.samestat(src_stat, dest_stat):
+        return True  # Hardlink para o mesmo arquivo
+    if src_stat.st_size != dest_stat.st_size:
+        return False
+    if checksum:
+        return hash_file(src_path) == hash_file(dest_path)
+    return src_stat.st_mtime_ns == dest_stat.st_mtime_ns
+
+
+def _copy_contents(src_path, dest_path):
+    """Copia os bytes de um arquivo, usando os.copy_file_range quando disponível."""
+    if hasattr(os, "copy_file_range"):
+        try:
+            with open(src_path, "rb") as src, open(dest_path, "wb") as dest:
+                remaining = os.fstat(src.fileno()).st_size
+                while remaining > 0:
+                    copied = os.copy_file_range(src.fileno(), dest.fileno(), remaining)
+                    if copied == 0:
+                        break
+                    remaining -= copied
+                if remaining == 0:
+                    return
+        except OSError:
+            pass  # Sistema de arquivos sem suporte; usa a cópia comum
+    shutil.copyfile(src_path, dest_path)
+
+
+def sync_file(src_path, dest_path, checksum=False, link=False):
+    """
+    Sincroniza um único arquivo.
+
+    Retorna "skipped" se o destino já estiver atualizado, "linked" se foi
+    criado um hardlink ou "copied" se o conteúdo foi copiado. A escrita é
+    feita em um arquivo temporário seguido de rename, de modo que um
+    hardlink antigo nunca é sobrescrito no lugar.
+    """
+    if files_match(src_path, dest_path, checksum):
+        if checksum:
+            shutil.copystat(src_path, dest_path)  # Atualiza o mtime para evitar novos hashes
+        return "skipped"
+
+    os.makedirs(os.path.dirname(dest_path) or ".", exist_ok=True)
+    tmp_path = f"{dest_path}.tmp-sync"
+    if link:
+        try:
+            os.link(src_path, tmp_path)
+            os.replace(tmp_path, dest_path)
+            return "linked"
+        except OSError:
+            # Dispositivos diferentes ou sem suporte a hardlinks
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+    try:
+        _copy_contents(src_path, tmp_path)
+        shutil.copystat(src_path, tmp_path)
+        os.replace(tmp_path, dest_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return "copied"
+
+
+def remove_file(path, root):
+    """Remove um arquivo e os diretórios que ficarem vazios até a raiz indicada."""
+    if not os.path.exists(path):
+        return False
+    os.remove(path)
+    root = os.path.abspath(root)
+    directory = os.path.dirname(os.path.abspath(path))
+    while directory != root and directory.startswith(root + os.sep):
+        try:
+            os.rmdir(directory)
+        except OSError:
+            break
+        directory = os.path.dirname(directory)
+    return True
+
+
+def sync_directory(src, dest, previous=None, checksum=False, link=False, verbose=True, names=None, writer=None,
+                   exclude=None):
+    """
+    Sincroniza incrementalmente o diretório src com dest.
+
+    Copia apenas os arquivos novos ou alterados e remove os arquivos órfãos,
+    isto é, os que constavam em `previous` (lista de caminhos relativos da
+    sincronização anterior) mas não existem mais na origem. Arquivos do
+    destino que não vieram da origem (como as páginas geradas) são mantidos.
+
+    `names` opcionalmente renomeia arquivos no destino ({caminho relativo
+    com "/": novo caminho relativo}), como nos assets com hash no nome;
+    `files` do resultado lista os caminhos usados no destino. Arquivos em
+    `exclude` (caminhos relativos com "/") não são copiados.
+
+    Com um `writer` (OutputWriter ou MemoryOutput), as cópias e remoções
+    passam pelos seus métodos copy e remove.
+    """
+    copy = writer.copy if writer is not None else sync_file
+    remove = writer.remove if writer is not None else remove_file
+    result = SyncResult()
+    for root, dirs, files in os.walk(src):
+        dirs.sort()
+        for name in sorted(files):
+            src_path = os.path.join(root, name)
+            relative_path = os.path.relpath(src_path, src)
+            url_path = relative_path.replace(os.sep, "/")
+            if exclude and url_path in exclude:
+                continue
+            if names:
+                relative_path = os.path.normpath(names.get(url_path, url_path))
+            dest_path = os.path.join(dest, relative_path)
+            result.files.append(relative_path)
+
+            status = copy(src_path, dest_path, checksum, link)
+            setattr(result, status, getattr(result, status) + 1)
+            if verbose and status != "skipped":
+                print(f"Copied {src_path} to {dest_path}")
+
+    # Remove os arquivos que deixaram de existir na origem
+    for relative_path in sorted(set(previous or ()) - set(result.files)):
+        if remove(os.path.join(dest, relative_path), dest):
+            result.removed += 1
+            if verbose:
+                print(f"Removed stale asset {os.path.join(dest, relative_path)}")
+    return result
+
 
 def copy_directory(src, dest):
     """Copia o conteúdo de um diretório src para o diretório dest."""
-    
-    # Verifica se o diretório de destino existe; se não, cria
-    if not os.path.exists(dest):
-        os.makedirs(dest)
-    
-    # Itera sobre todos os arquivos e subdiretórios no diretório de origem
-    for item in os.listdir(src):
-        src_path = os.path.join(src, item)
-        dest_path = os.path.join(dest, item)
-        
-        # Se for um diretório, faz a chamada recursiva
-        if os.path.isdir(src_path):
-            copy_directory(src_path, dest_path)
-        else:
-            # Caso contrário, copia o arquivo
-            shutil.copy2(src_path, dest_path)
-            print(f"Copied {src_path} to {dest_path}")
+    # Arquivos iguais (mesmo tamanho e mtime) não são copiados novamente
+    return sync_directory(src, dest)
@@ -0,0 +1,196 @@
+import contextlib
+import io
+import json
+import os
+import socket
+import socketserver
+import time
+from client import DEFAULT_SOCKET
+from copy_directory import sync_directory
+from images import ImageSizes
+from markdown import inline_cache_info
+
+
+def is_inside(path, directory):
+    """Verifica se o caminho absoluto `path` fica dentro de `directory`."""
+    directory = os.path.abspath(directory)
+    return path == directory or path.startswith(directory + os.sep)
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    """Lê um comando JSON por linha e responde com uma linha JSON."""
+
+    def handle(self):
+        line = self.rfile.readline()
+        if not line:
+            return
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ValueError("request must be a JSON object")
+        except ValueError as error:
+            response = {"ok": False, "error": f"invalid request: {error}"}
+        else:
+            response = self.server.build_daemon.handle(request)
+        self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+
+
+class BuildDaemon:
+    """
+    Processo de build permanente, controlado por um socket Unix.
+
+    Mantém aquecido o estado de um SiteWatcher (template compilado,
+    manifesto, cache de parse, nomes dos assets e dimensões das imagens)
+    e atende um comando por conexão, em série:
+
+    - {"command": "rebuild", "paths": [...]}: reconstrói só o que depende
+      dos arquivos indicados (markdown, estáticos, template ou parciais);
+    - {"command": "all"}: build incremental completo, como o main.py;
+    - {"command": "stats"}: contadores do daemon e dos caches;
+    - {"command": "stop"}: encerra o daemon.
+
+    As mensagens do build voltam ao cliente em "log", e o manifesto (e o
+    índice de busca) são salvos depois de cada reconstrução.
+    """
+
+    def __init__(self, watcher, socket_path=DEFAULT_SOCKET):
+        self.watcher = watcher
+        self.socket_path = socket_path
+        self.running = False
+        self.started = time.time()
+        self.counts = {"commands": 0, "rebuilds": 0, "failures": 0}
+        self.last_elapsed_ms = None
+
+    def handle(self, request):
+        """Executa um comando e retorna a resposta a ser enviada ao cliente."""
+        self.counts["commands"] += 1
+        command = request.get("command")
+        if command == "stats":
+            return {"ok": True, "stats": self.stats()}
+        if command == "stop":
+            self.running = False
+            return {"ok": True, "log": ["Build daemon stopping."]}
+        if command == "rebuild":
+            paths = request.get("paths")
+            if not isinstance(paths, list) or not paths:
+                return {"ok": False, "error": "rebuild needs a non-empty list of paths"}
+            return self.run_build(lambda: self.rebuild(paths))
+        if command == "all":
+            return self.run_build(self.rebuild_all)
+        return {"ok": False, "error": f"unknown command: {command!r}"}
+
+    def run_build(self, build):
+        """Executa uma reconstrução capturando as mensagens e contando as falhas do watcher."""
+        failures = self.watcher.failures
+        log = io.StringIO()
+        started = time.perf_counter()
+        try:
+            with contextlib.redirect_stdout(log):
+                build()
+                self.watcher.save()
+        except Exception as error:
+            self.counts["failures"] += 1
+            return {"ok": False, "error": f"{type(error).__name__}: {error}", "log": log.getvalue().splitlines()}
+        self.last_elapsed_ms = (time.perf_counter() - started) * 1000
+        self.counts["rebuilds"] += 1
+        response = {"ok": True, "elapsed_ms": self.last_elapsed_ms, "log": log.getvalue().splitlines()}
+        failed = self.watcher.failures - failures
+        if failed:
+            self.counts["failures"] += 1
+            response.update(ok=False, error=f"{failed} rebuild step(s) failed")
+        print(f"Rebuilt in {self.last_elapsed_ms:.1f} ms")
+        return response
+
+    def rebuild(self, paths):
+        """Separa os caminhos entre template, static/ e content/ e aplica as reconstruções do watcher."""
+        watcher = self.watcher
+        dependencies = {os.path.abspath(path) for path in [watcher.template_path, *watcher.template.dependencies]}
+        template_changed = False
+        updated, removed, pages = [], [], []
+        for path in paths:
+            absolute = os.path.abspath(path)
+            relative = os.path.relpath(absolute)
+            if absolute in dependencies:
+                template_changed = True
+            elif is_inside(absolute, watcher.static_dir):
+                (updated if os.path.isfile(absolute) else removed).append(relative)
+            elif is_inside(absolute, watcher.content_dir) and absolute.endswith(".md"):
+                pages.append(relative)
+            else:
+                print(f"Ignored {path}: not a page, static file or template")
+
+        # Mesma ordem do SiteWatcher.poll: template, estáticos e páginas
+        if template_changed:
+            watcher.on_template_change()
+        if updated or removed:
+            watcher.on_static_change(updated, removed)
+        if pages and not template_changed:
+            watcher.on_content_change(pages)
+
+    def rebuild_all(self):
+        """Sincroniza static/ por completo (incluindo remoções) e roda o build incremental de todas as páginas."""
+        watcher = self.watcher
+        if watcher.fingerprint:
+            watcher.sync_fingerprinted()
+        else:
+            previous = watcher.manifest.assets if watcher.manifest is not None else None
+            result = sync_directory(watcher.static_dir, watcher.dest_dir, previous=previous, verbose=not watcher.quiet,
+                                    writer=watcher.writer)
+            if watcher.manifest is not None:
+                watcher.manifest.assets = result.files
+        if watcher.image_cache is not None:
+            watcher.images = ImageSizes.load(watcher.static_dir, watcher.image_cache)
+        watcher.regenerate_all()
+
+    def stats(self):
+        watcher = self.watcher
+        stats = dict(self.counts)
+        stats["uptime_s"] = round(time.time() - self.started, 1)
+        stats["last_rebuild_ms"] = self.last_elapsed_ms
+        stats["template"] = watcher.template_path
+        if watcher.manifest is not None:
+            stats["pages"] = len(watcher.manifest.pages)
+            stats["assets"] = len(watcher.manifest.assets)
+        if watcher.parse_cache is not None:
+            stats["parse_cache_hits"] = watcher.parse_cache.hits
+            stats["parse_cache_misses"] = watcher.parse_cache.misses
+        info = inline_cache_info()
+        if info is not None:
+            stats["inline_cache_hits"], stats["inline_cache_misses"] = info[0], info[1]
+        return stats
+
+    def bind(self):
+        """Cria o servidor no socket; um socket antigo sem daemon ativo é removido."""
+        if os.path.exists(self.socket_path):
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+                try:
+                    probe.connect(self.socket_path)
+                except (ConnectionRefusedError, FileNotFoundError):
+                    os.remove(self.socket_path)
+                else:
+                    raise RuntimeError(f"a build daemon is already listening on {self.socket_path}")
+        directory = os.path.dirname(self.socket_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        server = socketserver.UnixStreamServer(self.socket_path, _RequestHandler)
+        server.build_daemon = self
+        return server
+
+    def serve(self):
+        """Atende comandos até receber "stop" (ou Ctrl+C)."""
+        server = self.bind()
+        self.running = True
+        print(f"Build daemon listening on {self.socket_path}")
+        try:
+            with server:
+                while self.running:
+                    server.handle_request()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(self.socket_path)
+            self.watcher.save()
+            if self.watcher.parse_cache is not None:
+                self.watcher.parse_cache.evict()
+            print("Build daemon stopped.")
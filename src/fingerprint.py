@@ -0,0 +1,91 @@
+import json
+import os
+from copy_directory import sync_directory
+from manifest import hash_file
+from output import OutputWriter
+from urls import UrlRewriter
+
+# Arquivos que precisam manter o nome (são pedidos por URLs fixas)
+FIXED_NAMES = {"robots.txt", "favicon.ico", "CNAME", "_headers", "_redirects"}
+HASH_LENGTH = 10
+ASSET_MANIFEST = "asset-manifest.json"
+HEADERS_FILE = "_headers"
+IMMUTABLE_CACHE = "public, max-age=31536000, immutable"
+GENERATED_FILES = (ASSET_MANIFEST, HEADERS_FILE)
+
+
+def fingerprint_name(relative_path, digest):
+    """Insere o hash no nome do arquivo: images/tom.png -> images/tom.<hash>.png."""
+    root, extension = os.path.splitext(relative_path)
+    return f"{root}.{digest[:HASH_LENGTH]}{extension}"
+
+
+def fingerprint_assets(static_dir, manifest=None):
+    """
+    Calcula o nome com hash de cada arquivo estático.
+
+    Retorna um dicionário {caminho relativo: caminho relativo com hash},
+    sempre com "/" como separador, que é o formato usado nas URLs. Páginas
+    HTML e nomes fixos (robots.txt, favicon.ico...) ficam de fora. Com um
+    manifesto (BuildManifest), o hash de arquivos com mesmo tamanho e mtime
+    é reaproveitado sem reler o arquivo.
+    """
+    assets = {}
+    for root, dirs, files in os.walk(static_dir):
+        dirs.sort()
+        for name in sorted(files):
+            if name in FIXED_NAMES or name.endswith(".html"):
+                continue
+            path = os.path.join(root, name)
+            relative_path = os.path.relpath(path, static_dir).replace(os.sep, "/")
+            digest = manifest.asset_hash(relative_path, path) if manifest is not None else hash_file(path)
+            assets[relative_path] = fingerprint_name(relative_path, digest)
+    if manifest is not None:
+        # Esquece os hashes de arquivos que saíram de static/
+        manifest.asset_hashes = {key: manifest.asset_hashes[key] for key in assets}
+    return assets
+
+
+def asset_files(assets, basepath="/", user_headers=None):
+    """
+    Conteúdo dos arquivos gerados junto com os assets.
+
+    Retorna {nome: texto} com o manifesto de assets (nome original -> nome
+    com hash) e um arquivo _headers que marca os assets com hash como
+    imutáveis, no formato aceito por Netlify e Cloudflare Pages. Os caminhos
+    do _headers recebem o basepath, como as URLs das páginas, e as regras
+    de um static/_headers (`user_headers`) vêm antes das geradas.
+    """
+    urls = UrlRewriter(basepath)
+    headers = [user_headers.rstrip("\n") + "\n"] if user_headers else []
+    for name in sorted(assets.values()):
+        headers.append(f"{urls('/' + name)}\n  Cache-Control: {IMMUTABLE_CACHE}\n")
+    return {
+        ASSET_MANIFEST: json.dumps(assets, indent=1, sort_keys=True) + "\n",
+        HEADERS_FILE: "\n".join(headers),
+    }
+
+
+def sync_fingerprinted(static_dir, dest_dir, manifest=None, checksum=False, link=False, verbose=True, writer=None,
+                       basepath="/"):
+    """
+    Copia static/ para o destino com os nomes com hash e grava o manifesto de assets e o _headers.
+
+    Versões antigas de um asset (com outro hash) são removidas como órfãs,
+    a partir da lista de arquivos do manifesto. Um static/_headers não é
+    copiado: as suas regras são incluídas no _headers gerado. Retorna
+    (SyncResult, assets).
+    """
+    assets = fingerprint_assets(static_dir, manifest)
+    previous = [path for path in manifest.assets if path not in GENERATED_FILES] if manifest is not None else None
+    writer = writer if writer is not None else OutputWriter()
+    result = sync_directory(static_dir, dest_dir, previous=previous, checksum=checksum, link=link,
+                            verbose=verbose, names=assets, writer=writer, exclude={HEADERS_FILE})
+    user_headers = None
+    if os.path.isfile(os.path.join(static_dir, HEADERS_FILE)):
+        with open(os.path.join(static_dir, HEADERS_FILE), "r", encoding="utf-8") as file:
+            user_headers = file.read()
+    for name, text in asset_files(assets, basepath, user_headers).items():
+        writer.write(os.path.join(dest_dir, name), text)
+        result.files.append(name)
+    return result, assets
@@ -0,0 +1,62 @@
+import contextlib
+import io
+import os
+import tempfile
+
+
+class TempDirMixin:
+    """
+    Base dos testes que trabalham com arquivos: cada teste recebe um diretório temporário em `root`.
+
+    O diretório é removido ao final do teste. As mensagens impressas pelo
+    código testado (páginas geradas, arquivos copiados...) ficam em
+    `stdout`, e não na saída dos testes. Use junto com unittest.TestCase
+    (ou IsolatedAsyncioTestCase).
+    """
+
+    def setUp(self):
+        super().setUp()
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = tmp.name
+        self.stdout = io.StringIO()
+        redirect = contextlib.redirect_stdout(self.stdout)
+        redirect.__enter__()
+        self.addCleanup(redirect.__exit__, None, None, None)
+
+    def write(self, path, data):
+        """Cria um arquivo (texto em UTF-8 ou bytes) e os diretórios dele; `path` pode ser relativo a `root`."""
+        path = os.path.join(self.root, path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        if isinstance(data, str):
+            with open(path, "w", encoding="utf-8") as file:
+                file.write(data)
+        else:
+            with open(path, "wb") as file:
+                file.write(data)
+        return path
+
+
+class SiteMixin(TempDirMixin):
+    """
+    Base dos testes que reconstroem um site pequeno dentro de `root`.
+
+    Cria `content` (index.md e about.md), `static` (index.css) e o
+    `template`; o destino `dest` começa vazio.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.content = os.path.join(self.root, "content")
+        self.static = os.path.join(self.root, "static")
+        self.dest = os.path.join(self.root, "public")
+        self.template = os.path.join(self.root, "template.html")
+        self.write(self.template, "<title>{{ Title }}</title>{{ Content }}")
+        self.write(os.path.join(self.content, "index.md"), "# Home")
+        self.write(os.path.join(self.content, "about.md"), "# About")
+        self.write(os.path.join(self.static, "index.css"), "body {}")
+
+    def read(self, relative):
+        """Conteúdo de um arquivo gerado, com o caminho relativo a `dest`."""
+        with open(os.path.join(self.dest, relative), "r", encoding="utf-8") as file:
+            return file.read()
@@ -1,51 +1,474 @@
 import os
-from markdown import extract_title, markdown_to_html_node
+import time
+from concurrent.futures import ProcessPoolExecutor
+from copy_directory import remove_file
+from manifest import hash_file
+from htmlnode import escape_text
+from markdown import enable_inline_cache, extract_title, inline_cache_info, markdown_to_html_node
+from output import OutputWriter
+from report import BuildReport, count_nodes
+from search import PageTerms
+from template import compile_template
+from urls import UrlRewriter
+from vfs import MemoryOutput
+
+
+class BuildError(Exception):
+    """Erro levantado quando uma ou mais páginas falham durante um build paralelo."""
+
+    def __init__(self, errors):
+        self.errors = errors
+        details = "\n".join(f"  {path}: {message}" for path, message in errors)
+        super().__init__(f"{len(errors)} page(s) failed to generate:\n{details}")
+
+
+def load_template(template_path):
+    """Lê e compila o template HTML (com seus parciais)."""
+    return compile_template(template_path)
+
+
+class TeeStream:
+    """Stream de texto que repassa cada escrita a vários streams."""
+
+    def __init__(self, *streams):
+        self.streams = streams
+
+    def write(self, text):
+        for stream in self.streams:
+            stream.write(text)
+
+
+class CachedBody:
+    """Corpo de uma página que, ao ser escrito no template, também é gravado na entrada do cache de parse."""
+
+    __slots__ = ("node", "entry")
+
+    def __init__(self, node, entry):
+        self.node = node
+        self.entry = entry
+
+    def write_html(self, stream):
+        self.node.write_html(TeeStream(stream, self.entry))
 
-def generate_page(from_path, template_path, dest_path, basepath):
-    """Gera um arquivo HTML a partir de um arquivo markdown e um template."""
-    print(f"Generating page from {from_path} to {dest_path} using {template_path}")
 
+def write_document(template, dest_path, title, content, writer=None):
+    """
+    Escreve o template preenchido com o título e o conteúdo direto no arquivo de destino.
+
+    A gravação passa pelo `writer` (OutputWriter), que não reescreve
+    arquivos idênticos.
+    """
+    writer = writer if writer is not None else OutputWriter()
+    with writer.open(dest_path) as file:
+        template.write(file, {"Title": title, "Content": content})
+
+
+def write_page(from_path, template, dest_path, urls=None, stats=None, parse_cache=None, writer=None, images=None,
+               terms=None):
+    """
+    Converte um arquivo markdown usando um template já compilado e grava o HTML resultante.
+
+    `urls` (UrlRewriter) aplica o basepath e os nomes dos assets aos links e
+    imagens durante a construção da árvore; o template já deve vir com as
+    URLs aplicadas (Template.with_urls). Com `images` (ImageSizes), as
+    imagens recebem width/height e atributos de carregamento lazy.
+
+    Se `stats` (um dicionário) for informado, a página é gerada etapa por
+    etapa (renderização, template e escrita separadas) e os tempos, tamanhos
+    e número de nós são registrados nele.
+
+    Com um `parse_cache` (ParseCache), o título e o HTML do corpo são
+    reaproveitados do disco quando o markdown já foi convertido antes. Numa
+    falha do cache, o corpo é escrito em streaming uma única vez, ao mesmo
+    tempo na página e na nova entrada do cache, sem montar a string do
+    corpo. Retorna a chave do corpo no cache (None sem cache).
+
+    O arquivo é gravado pelo `writer` (OutputWriter): de forma atômica e
+    apenas se o conteúdo mudou.
+
+    Com `terms` (PageTerms), os termos e o título da página são coletados
+    para o índice de busca; para isso o markdown é sempre convertido, sem
+    usar o corpo guardado no cache de parse.
+    """
+    clock = time.perf_counter
+    started = clock()
     # Lê o conteúdo do arquivo markdown
     with open(from_path, "r", encoding="utf-8") as file:
         markdown_content = file.read()
+    read_done = clock()
+
+    cached = cache_key = None
+    if parse_cache is not None:
+        cache_key = parse_cache.key(markdown_content, urls, images)
+        cached = parse_cache.get(cache_key, urls) if terms is None else None
 
-    # Lê o conteúdo do template
-    with open(template_path, "r", encoding="utf-8") as file:
-        template_content = file.read()
+    if cached is not None:
+        title, content = cached
+        html_node = None
+    else:
+        # Convert markdown to HTML
+        html_node = markdown_to_html_node(markdown_content, urls, images, terms)
 
-    # Convert markdown to HTML
-    html_node = markdown_to_html_node(markdown_content)
-    html_content = html_node.to_html()
+        # Extrai o título do markdown (escapado, como o resto do texto da página)
+        raw_title = extract_title(markdown_content)
+        title = escape_text(raw_title)
+        if terms is not None:
+            terms.title = raw_title
+        content = html_node
+    parse_done = clock()
+    store = html_node is not None and parse_cache is not None and not parse_cache.read_only
 
-    # Extrai o título do markdown
-    title = extract_title(markdown_content)
+    references = urls.references(html_node) if store and urls is not None else None
 
-    # Substitui os espaços reservados no template
-    full_html = template_content.replace("{{ Title }}", title).replace("{{ Content }}", html_content)
+    if stats is None:
+        if store:
+            with parse_cache.open(cache_key, title, references) as entry:
+                write_document(template, dest_path, title, CachedBody(html_node, entry), writer)
+        else:
+            write_document(template, dest_path, title, content, writer)
+        return cache_key
 
-    # Substituir href e src com o basepath
-    full_html = full_html.replace('href="/', f'href="{basepath}').replace('src="/', f'src="{basepath}')
+    html_content = content if isinstance(content, str) else content.to_html()
+    if store:
+        parse_cache.put(cache_key, title, html_content, references)
+    render_done = clock()
+    full_html = template.render({"Title": title, "Content": html_content})
+    template_done = clock()
+    writer = writer if writer is not None else OutputWriter()
+    writer.write(dest_path, full_html)
+    write_done = clock()
 
-    # Certifica que o diretório de destino existe
-    os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+    stats.update({
+        "source": from_path,
+        "output": dest_path,
+        "read": read_done - started,
+        "parse": parse_done - read_done,
+        "render": render_done - parse_done,
+        "template": template_done - render_done,
+        "write": write_done - template_done,
+        "bytes_in": len(markdown_content.encode("utf-8")),
+        "bytes_out": len(full_html.encode("utf-8")),
+        "nodes": count_nodes(html_node) if html_node is not None else 0,
+    })
+    return cache_key
 
-    # Escreve o conteúdo HTML no arquivo de destino
-    with open(dest_path, "w", encoding="utf-8") as file:
-        file.write(full_html)
 
+def rewrap_page(template, dest_path, body_key, parse_cache, writer=None, urls=None):
+    """
+    Reaplica o template ao título e ao corpo de uma página guardados no cache de parse.
+
+    Usado quando apenas o template (ou o hash de algum asset) mudou: o
+    markdown não é relido nem convertido. Retorna False se o corpo não
+    estiver mais no cache ou se usa uma URL que `urls` agora transforma
+    de outro jeito.
+    """
+    cached = parse_cache.get(body_key, urls)
+    if cached is None:
+        return False
+    title, body = cached
+    write_document(template, dest_path, title, body, writer)
+    return True
+
+
+def generate_page(from_path, template_path, dest_path, basepath):
+    """Gera um arquivo HTML a partir de um arquivo markdown e um template."""
+    print(f"Generating page from {from_path} to {dest_path} using {template_path}")
+    urls = UrlRewriter(basepath)
+    write_page(from_path, load_template(template_path).with_urls(urls), dest_path, urls)
     print(f"Page generated successfully at {dest_path}")
 
 
-def generate_pages_recursive(dir_path_content, template_path, dest_dir_path, basepath):
-    """Gera recursivamente páginas HTML a partir de arquivos markdown em um diretório."""
-    for root, _, files in os.walk(dir_path_content):
-        for file in files:
+def page_paths(dir_path_content, markdown_path, dest_dir_path):
+    """Retorna o caminho relativo do markdown (chave no manifesto) e o caminho do HTML gerado."""
+    relative_path = os.path.relpath(markdown_path, dir_path_content)
+    html_path = os.path.join(dest_dir_path, os.path.splitext(relative_path)[0] + ".html")
+    return relative_path, html_path
+
+
+def rebuild_page(dir_path_content, markdown_path, template, dest_dir_path, basepath, manifest=None, report=None,
+                 parse_cache=None, writer=None, assets=None, images=None, search=None):
+    """
+    Regenera uma única página (ou remove a sua saída, se o markdown não existir mais).
+
+    Usado pelo modo watch para reconstruir apenas o arquivo alterado;
+    `template` é o template compilado sem as URLs aplicadas. Com `search`
+    (SearchIndex), os termos da página são atualizados e os shards
+    afetados são regravados.
+    """
+    report = report if report is not None else BuildReport()
+    writer = writer if writer is not None else OutputWriter()
+    urls = UrlRewriter(basepath, assets)
+    relative_path, html_path = page_paths(dir_path_content, markdown_path, dest_dir_path)
+    if not os.path.exists(markdown_path):
+        if manifest is not None:
+            manifest.forget(relative_path)
+        remove_output(html_path, dest_dir_path, report, writer)
+        if search is not None:
+            search.forget(relative_path)
+            search.write(dest_dir_path, writer, urls)
+        return
+    stats = {} if report.profile else None
+    terms = PageTerms() if search is not None else None
+    body_key = write_page(markdown_path, template.with_urls(urls), html_path, urls, stats, parse_cache, writer,
+                          images, terms)
+    report.record_page(stats)
+    report.log(f"Page generated successfully at {html_path}")
+    source_hash = hash_file(markdown_path) if manifest is not None or search is not None else None
+    if manifest is not None:
+        manifest.record(relative_path, markdown_path, source_hash, html_path, body_key)
+    if search is not None:
+        search.record(relative_path, source_hash, os.path.relpath(html_path, dest_dir_path), terms.title,
+                      terms.counts)
+        search.write(dest_dir_path, writer, urls)
+
+
+# Template compilado, transformação de URLs, dimensões das imagens, cache de parse e writer de cada processo do pool
+_worker_template = None
+_worker_urls = None
+_worker_images = None
+_worker_parse_cache = None
+_worker_writer = None
+
+
+def _init_worker(template, urls, images, inline_cache_size, parse_cache, memory=False):
+    """
+    Inicializa um processo do pool com o template já compilado e, se ativos, os caches.
+
+    Com memory=True (build em um MemoryOutput), as páginas ficam em um
+    MemoryOutput do processo e voltam ao processo principal no resultado.
+    """
+    global _worker_template, _worker_urls, _worker_images, _worker_parse_cache, _worker_writer
+    _worker_template = template
+    _worker_urls = urls
+    _worker_images = images
+    _worker_parse_cache = parse_cache
+    _worker_writer = MemoryOutput() if memory else OutputWriter()
+    if inline_cache_size is not None:
+        enable_inline_cache(inline_cache_size)
+
+
+def _build_counts(parse_cache, writer):
+    """Arquivos gravados/inalterados e acertos e falhas dos caches ativos, como contadores do relatório."""
+    counts = {"pages_written": writer.written, "pages_unchanged": writer.skipped}
+    info = inline_cache_info()
+    if info is not None:
+        counts["inline_cache_hits"], counts["inline_cache_misses"] = info[0], info[1]
+    if parse_cache is not None:
+        counts["parse_cache_hits"], counts["parse_cache_misses"] = parse_cache.hits, parse_cache.misses
+    return counts
+
+
+def _count_delta(before, after):
+    return {name: after[name] - before[name] for name in after}
+
+
+def _generate_page_worker(task):
+    """
+    Gera uma página dentro de um processo do pool.
+
+    Devolve (erro como texto ou None, estatísticas, contadores desta página
+    (gravação e caches), chave do corpo no cache de parse, arquivos gerados
+    em memória ou None, (título, termos) para o índice de busca ou None).
+    """
+    markdown_path, html_path, profile, index_terms = task
+    stats = {} if profile else None
+    terms = PageTerms() if index_terms else None
+    before = _build_counts(_worker_parse_cache, _worker_writer)
+    try:
+        body_key = write_page(markdown_path, _worker_template, html_path, _worker_urls, stats,
+                              _worker_parse_cache, _worker_writer, _worker_images, terms)
+    except Exception as error:
+        return f"{type(error).__name__}: {error}", None, {}, None, None, None
+    counts = _count_delta(before, _build_counts(_worker_parse_cache, _worker_writer))
+    files = None
+    if isinstance(_worker_writer, MemoryOutput):
+        # A comparação com o conteúdo anterior (e a contagem) é feita pelo MemoryOutput do processo principal
+        files = _worker_writer.take()
+        del counts["pages_written"], counts["pages_unchanged"]
+    page_terms = (terms.title, dict(terms.counts)) if terms is not None else None
+    return None, stats, counts, body_key, files, page_terms
+
+
+def resolve_jobs(jobs):
+    """Converte o valor de --jobs em um número de processos (0 ou None = todos os núcleos)."""
+    if not jobs:
+        return os.cpu_count() or 1
+    return max(1, jobs)
+
+
+def generate_pages_recursive(dir_path_content, template_path, dest_dir_path, basepath, manifest=None, jobs=1,
+                             report=None, parse_cache=None, rewrap=None, writer=None, assets=None, images=None,
+                             search=None):
+    """
+    Gera recursivamente páginas HTML a partir de arquivos markdown em um diretório.
+
+    Se um manifesto (BuildManifest) for informado, apenas as páginas cujas
+    entradas mudaram são regeneradas, e as páginas cujo markdown foi removido
+    são apagadas do diretório de destino.
+
+    Com jobs > 1 as páginas são distribuídas entre processos; os resultados
+    voltam na ordem dos caminhos e as falhas são reunidas em um BuildError.
+    Com jobs == 1 as páginas são geradas em série e o primeiro erro é propagado.
+
+    Mensagens, contadores e tempos por página vão para `report` (BuildReport).
+    Com um `parse_cache` (ParseCache), páginas cujo markdown já foi
+    convertido antes reaproveitam o HTML do corpo guardado em disco.
+
+    Quando apenas o template mudou, as páginas cujo markdown não mudou são
+    apenas reembrulhadas: o título e o corpo guardados no
+    cache de parse recebem o novo template, sem reler nem converter o
+    markdown. `rewrap=None` escolhe esse caminho automaticamente, True
+    reembrulha todas as páginas inalteradas mesmo sem mudança detectada no
+    template e False sempre gera as páginas do zero.
+
+    As páginas são gravadas pelo `writer` (OutputWriter): páginas idênticas
+    às existentes não são reescritas e entram no contador pages_unchanged.
+    Com um MemoryOutput, o site inteiro é gerado em memória, sem tocar o
+    destino no disco.
+
+    O basepath e `assets` ({caminho em static/: nome com hash}) formam um
+    UrlRewriter, aplicado aos links e imagens durante a construção de cada
+    árvore e uma única vez aos literais do template. Como os corpos
+    guardados no cache já têm as URLs aplicadas, uma mudança no basepath ou
+    nos nomes dos assets regenera todas as páginas.
+
+    Com `images` (ImageSizes), as imagens recebem width/height e, exceto a
+    primeira de cada página, loading="lazy" e decoding="async"; uma mudança
+    nas dimensões também regenera todas as páginas.
+
+    Com `search` (SearchIndex), os termos das páginas novas ou alteradas
+    são coletados durante a conversão e o índice de busca sharded é
+    gravado em search/ no destino; páginas cujo markdown não mudou mantêm
+    os termos já guardados.
+    """
+    report = report if report is not None else BuildReport()
+    writer = writer if writer is not None else OutputWriter()
+    # O template (e seus parciais) é lido e compilado uma única vez
+    template = load_template(template_path)
+    urls = UrlRewriter(basepath, assets)
+    page_template = template.with_urls(urls)
+    inputs_changed = body_changed = False
+    if manifest is not None:
+        images_key = images.key if images is not None else None
+        # Mudanças que alteram o HTML do corpo de todas as páginas, e não só o template
+        body_changed = manifest.basepath != basepath or manifest.images != images_key
+        # Um asset com outro hash muda o template; os corpos guardados que o usam são descartados pelo cache de parse
+        inputs_changed = (body_changed or manifest.template_hash != template.digest
+                          or manifest.fingerprints != (assets or None))
+    can_rewrap = manifest is not None and parse_cache is not None and rewrap is not False and not body_changed
+
+    seen = set()
+    tasks = []
+    rewraps = []
+    for root, dirs, files in os.walk(dir_path_content):
+        dirs.sort()
+        for file in sorted(files):
             if file.endswith(".md"):
                 # Constrói os caminhos dos arquivos markdown e HTML
                 markdown_path = os.path.join(root, file)
-                relative_path = os.path.relpath(markdown_path, dir_path_content)
-                html_path = os.path.join(dest_dir_path, os.path.splitext(relative_path)[0] + ".html")
+                relative_path, html_path = page_paths(dir_path_content, markdown_path, dest_dir_path)
+
+                source_hash = None
+                seen.add(relative_path)
+                if manifest is not None:
+                    source_hash = manifest.source_hash(relative_path, markdown_path)
+                    fresh = manifest.is_fresh(relative_path, source_hash, html_path, writer.exists)
+                    # Páginas sem termos no índice de busca precisam ser convertidas de novo
+                    indexed = search is None or search.is_fresh(relative_path, source_hash)
+                    if fresh and not inputs_changed and not rewrap and indexed:
+                        report.count("pages_skipped")
+                        continue
+                    body_key = manifest.pages[relative_path].get("body") if fresh else None
+                    if can_rewrap and body_key is not None and indexed:
+                        rewraps.append((relative_path, markdown_path, html_path, source_hash, body_key))
+                        continue
+                tasks.append((relative_path, markdown_path, html_path, source_hash))
+
+    before = _build_counts(parse_cache, writer)
+    # Só o template mudou para estas páginas: reaproveita os corpos já convertidos
+    for relative_path, markdown_path, html_path, source_hash, body_key in rewraps:
+        if rewrap_page(page_template, html_path, body_key, parse_cache, writer, urls):
+            report.count("pages_rewrapped")
+            report.log(f"Page rewrapped with {template_path} at {html_path}")
+        else:
+            # O corpo saiu do cache; gera a página do zero
+            tasks.append((relative_path, markdown_path, html_path, source_hash))
+
+    jobs = min(resolve_jobs(jobs), len(tasks))
+    errors = []
+    cache = inline_cache_info()
+    if jobs <= 1:
+        for relative_path, markdown_path, html_path, source_hash in tasks:
+            # Gera a página HTML
+            report.log(f"Generating page from {markdown_path} to {html_path} using {template_path}")
+            stats = {} if report.profile else None
+            terms = PageTerms() if search is not None and not search.is_fresh(relative_path, source_hash) else None
+            body_key = write_page(markdown_path, page_template, html_path, urls, stats, parse_cache, writer, images,
+                                  terms)
+            report.record_page(stats)
+            report.log(f"Page generated successfully at {html_path}")
+            if manifest is not None:
+                manifest.record(relative_path, markdown_path, source_hash, html_path, body_key)
+            if terms is not None:
+                search.record(relative_path, source_hash, os.path.relpath(html_path, dest_dir_path), terms.title,
+                              terms.counts)
+    else:
+        work = [(markdown_path, html_path, report.profile,
+                 search is not None and not search.is_fresh(relative_path, source_hash))
+                for relative_path, markdown_path, html_path, source_hash in tasks]
+        chunksize = max(1, len(work) // (jobs * 4))
+        initargs = (page_template, urls, images, cache[2] if cache else None, parse_cache,
+                    isinstance(writer, MemoryOutput))
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=initargs) as pool:
+            results = pool.map(_generate_page_worker, work, chunksize=chunksize)
+            for (relative_path, markdown_path, html_path, source_hash), result in zip(tasks, results):
+                error, stats, counts, body_key, files, page_terms = result
+                for name, amount in counts.items():
+                    report.count(name, amount)
+                if error is not None:
+                    errors.append((markdown_path, error))
+                    report.count("pages_failed")
+                    continue
+                if files:
+                    writer.merge(files)
+                report.record_page(stats)
+                report.log(f"Page generated successfully at {html_path}")
+                if manifest is not None:
+                    manifest.record(relative_path, markdown_path, source_hash, html_path, body_key)
+                if page_terms is not None:
+                    search.record(relative_path, source_hash, os.path.relpath(html_path, dest_dir_path),
+                                  *page_terms)
+    if tasks or rewraps:
+        # Gravações e acertos de cache feitos neste processo (reembrulhos e modo serial)
+        for name, amount in _count_delta(before, _build_counts(parse_cache, writer)).items():
+            report.count(name, amount)
+
+    if manifest is not None:
+        # Remove as páginas cujo markdown não existe mais
+        for relative_path in sorted(set(manifest.pages) - seen):
+            remove_output(manifest.forget(relative_path), dest_dir_path, report, writer)
+
+        # Só considera o template/basepath/assets/imagens aplicados se todas as páginas foram geradas
+        if not errors:
+            manifest.template_hash = template.digest
+            manifest.basepath = basepath
+            manifest.fingerprints = assets or None
+            manifest.images = images.key if images is not None else None
+
+    if search is not None:
+        # Páginas removidas saem do índice; só os shards afetados são regravados
+        for relative_path in sorted(set(search.pages) - seen):
+            search.forget(relative_path)
+        search.write(dest_dir_path, writer, urls)
+
+    if errors:
+        raise BuildError(errors)
 
-                # Gera a página HTML
-                generate_page(markdown_path, template_path, html_path, basepath)
 
+def remove_output(path, dest_dir_path, report=None, writer=None):
+    """Remove uma página gerada e os diretórios que ficarem vazios dentro do destino."""
+    remove = writer.remove if writer is not None else remove_file
+    if path is not None and remove(path, dest_dir_path):
+        report = report if report is not None else BuildReport()
+        report.count("pages_removed")
+        report.log(f"Removed stale page {path}")
@@ -1,21 +1,73 @@
+from functools import lru_cache
+from types import MappingProxyType
+
+# Padrões imutáveis compartilhados por todos os nós sem filhos ou sem atributos
+EMPTY_CHILDREN = ()
+EMPTY_PROPS = MappingProxyType({})
+# Quantos atributos escapados (nome, valor) ficam guardados para reuso
+ATTRIBUTE_CACHE_SIZE = 4096
+
+
+def escape_text(text):
+    """
+    Escapa &, < e > no conteúdo de um elemento.
+
+    A maior parte do texto não tem nenhum desses caracteres, e três buscas
+    com `in` (feitas em C) custam menos que qualquer substituição: nesse
+    caso o próprio texto é devolvido, sem cópia. Quando há algo a escapar,
+    as substituições encadeadas são bem mais rápidas que str.translate com
+    um dicionário, que cai no caminho lento por caractere. Valores que não
+    são str (números, None) são convertidos com str(), como antes do escape.
+    """
+    if not isinstance(text, str):
+        text = str(text)
+    if "&" not in text and "<" not in text and ">" not in text:
+        return text
+    return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+
+
+def escape_attribute(value):
+    """Escapa um valor de atributo entre aspas duplas (&, <, > e "); valores que não são str passam por str()."""
+    if not isinstance(value, str):
+        value = str(value)
+    if "&" not in value and "<" not in value and ">" not in value and '"' not in value:
+        return value
+    return value.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;").replace('"', "&quot;")
+
+
+@lru_cache(maxsize=ATTRIBUTE_CACHE_SIZE)
+def _attribute_html(key, value):
+    """Fragmento ` key="valor"` já escapado; os mesmos atributos se repetem em muitos nós (hrefs, loading="lazy"...)."""
+    return f' {key}="{escape_attribute(value)}"'
+
+
 class HTMLNode:
+    # Sem __dict__ por instância: árvores do site inteiro ficam bem menores em memória
+    __slots__ = ("tag", "value", "children", "props")
+
     def __init__(self, tag=None, value=None, children=None, props=None):
         self.tag = tag
         self.value = value
-        self.children = children if children is not None else []
-        self.props = props if props is not None else {}
+        self.children = children if children is not None else EMPTY_CHILDREN
+        self.props = props if props is not None else EMPTY_PROPS
 
     def to_html(self):
         """Este método será implementado por classes filhas."""
         raise NotImplementedError
+
+    def write_html(self, stream):
+        """Escreve o HTML do nó em um stream de texto (arquivo aberto, io.StringIO, ...)."""
+        stream.write(self.to_html())
     
     def props_to_html(self):
-        """Converte os atributos do nó em uma string de atributos HTML."""
+        """Converte os atributos do nó em uma string de atributos HTML, com os valores escapados."""
         if not self.props:
             return ""
         else:
-            return " " + " ".join(f'{key}="{value}"' for key, value in self.props.items())
+            # Só strings vão para o cache: outros valores podem não ser hasheáveis
+            return "".join([_attribute_html(key, value) if isinstance(value, str) else f' {key}="{escape_attribute(value)}"'
+                            for key, value in self.props.items()])
         
     def __repr__(self):
         """Retorna uma representação legível do objeto HTMLNode."""
-        return f"HTMLNode(tag={self.tag}, value={self.value}, children={self.children}, props={self.props})"
+        return f"HTMLNode(tag={self.tag}, value={self.value}, children={list(self.children)}, props={dict(self.props)})"
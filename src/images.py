@@ -0,0 +1,174 @@
+import hashlib
+import json
+import os
+import struct
+from manifest import hash_file
+
+IMAGE_EXTENSIONS = {".png", ".jpg", ".jpeg", ".gif", ".webp"}
+# Quantas imagens do início da página são carregadas normalmente (as demais ficam lazy)
+LEADING_IMAGES = 1
+# Marcadores SOF do JPEG que trazem as dimensões (exclui DHT, JPG e DAC)
+JPEG_SOF_MARKERS = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+
+
+def _jpeg_size(file):
+    """Percorre os segmentos do JPEG até o primeiro SOF, lendo apenas os cabeçalhos."""
+    file.seek(2)
+    while True:
+        byte = file.read(1)
+        while byte and byte != b"\xff":
+            byte = file.read(1)
+        while byte == b"\xff":
+            byte = file.read(1)  # Bytes de preenchimento
+        if not byte:
+            return None
+        marker = byte[0]
+        if marker in (0xD8, 0x01) or 0xD0 <= marker <= 0xD7:
+            continue  # Marcadores sem tamanho
+        if marker == 0xDA:
+            return None  # Início dos dados da imagem sem nenhum SOF antes
+        header = file.read(2)
+        if len(header) < 2:
+            return None
+        length = struct.unpack(">H", header)[0]
+        if marker in JPEG_SOF_MARKERS:
+            data = file.read(5)
+            if len(data) < 5:
+                return None
+            height, width = struct.unpack(">xHH", data)
+            return width, height
+        file.seek(length - 2, os.SEEK_CUR)
+
+
+def read_image_size(path):
+    """
+    Lê a largura e a altura de uma imagem PNG, JPEG, GIF ou WebP pelo cabeçalho.
+
+    Apenas os primeiros bytes são lidos (no JPEG, só os cabeçalhos dos
+    segmentos até o SOF). Retorna (largura, altura) ou None se o formato
+    não for reconhecido.
+    """
+    with open(path, "rb") as file:
+        head = file.read(30)
+        if head.startswith(b"\x89PNG\r\n\x1a\n") and head[12:16] == b"IHDR":
+            return struct.unpack(">II", head[16:24])
+        if head[:6] in (b"GIF87a", b"GIF89a"):
+            return struct.unpack("<HH", head[6:10])
+        if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+            chunk = head[12:16]
+            if chunk == b"VP8 ":
+                width, height = struct.unpack("<HH", head[26:30])
+                return width & 0x3FFF, height & 0x3FFF
+            if chunk == b"VP8L":
+                bits = int.from_bytes(head[21:25], "little")
+                return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+            if chunk == b"VP8X":
+                return int.from_bytes(head[24:27], "little") + 1, int.from_bytes(head[27:30], "little") + 1
+            return None
+        if head[:2] == b"\xff\xd8":
+            return _jpeg_size(file)
+    return None
+
+
+class ImageSizes:
+    """
+    Dimensões das imagens de static/, indexadas pelo caminho usado nas URLs.
+
+    As dimensões ficam em um cache JSON indexado pelo hash de cada arquivo,
+    e o hash é reaproveitado enquanto o tamanho e o mtime não mudarem;
+    assim, um build sem imagens novas não lê nenhuma imagem. `key` resume
+    todas as dimensões e entra na chave do cache de parse.
+    """
+
+    def __init__(self, sizes=None):
+        self.sizes = sizes or {}
+        state = json.dumps(sorted(self.sizes.items()))
+        self.key = hashlib.sha256(state.encode("utf-8")).hexdigest()
+
+    @classmethod
+    def load(cls, static_dir, cache_path=None, read_only=False):
+        """
+        Lê as dimensões de todas as imagens de `static_dir`, usando e atualizando o cache em disco.
+
+        Com read_only=True (builds em memória), o cache é usado mas nunca
+        gravado.
+        """
+        cache = {"files": {}, "sizes": {}}
+        if cache_path is not None:
+            try:
+                with open(cache_path, "r", encoding="utf-8") as file:
+                    cache = json.load(file)
+            except (OSError, ValueError):
+                pass
+            if not isinstance(cache, dict) or not {"files", "sizes"} <= cache.keys():
+                cache = {"files": {}, "sizes": {}}
+
+        files, sizes, found = {}, {}, {}
+        for root, dirs, names in os.walk(static_dir):
+            dirs.sort()
+            for name in sorted(names):
+                if os.path.splitext(name)[1].lower() not in IMAGE_EXTENSIONS:
+                    continue
+                path = os.path.join(root, name)
+                relative_path = os.path.relpath(path, static_dir).replace(os.sep, "/")
+                stat = os.stat(path)
+                entry = cache["files"].get(relative_path)
+                if entry and entry["mtime_ns"] == stat.st_mtime_ns and entry["size"] == stat.st_size:
+                    digest = entry["hash"]
+                else:
+                    digest = hash_file(path)
+                files[relative_path] = {"hash": digest, "mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+                size = cache["sizes"].get(digest)
+                if size is None:
+                    size = read_image_size(path)
+                if size is not None:
+                    sizes[digest] = list(size)
+                    found[relative_path] = tuple(size)
+
+        if cache_path is not None and not read_only and (files != cache["files"] or sizes != cache["sizes"]):
+            directory = os.path.dirname(cache_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            tmp_path = f"{cache_path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as file:
+                json.dump({"files": files, "sizes": sizes}, file, indent=1, sort_keys=True)
+            os.replace(tmp_path, cache_path)
+        return cls(found)
+
+    def get(self, url):
+        """Dimensões de uma imagem local referenciada por uma URL absoluta do site ("/images/tom.png")."""
+        if not url.startswith("/") or url.startswith("//"):
+            return None
+        path = url[1:]
+        for separator in "?#":
+            path = path.split(separator, 1)[0]
+        return self.sizes.get(path)
+
+    def page(self):
+        """Cria o contador de imagens de uma página (ver PageImages)."""
+        return PageImages(self)
+
+
+class PageImages:
+    """
+    Atributos extras das imagens de uma página, na ordem em que aparecem.
+
+    Todas recebem width/height quando as dimensões são conhecidas; as
+    imagens depois das LEADING_IMAGES primeiras recebem também
+    loading="lazy" e decoding="async".
+    """
+
+    def __init__(self, sizes):
+        self.sizes = sizes
+        self.count = 0
+
+    def __call__(self, url):
+        props = {}
+        size = self.sizes.get(url)
+        if size is not None:
+            props["width"], props["height"] = str(size[0]), str(size[1])
+        self.count += 1
+        if self.count > LEADING_IMAGES:
+            props["loading"] = "lazy"
+            props["decoding"] = "async"
+        return props
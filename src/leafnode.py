@@ -1,7 +1,9 @@
-from htmlnode import HTMLNode
+from htmlnode import HTMLNode, escape_text
 
 
 class LeafNode(HTMLNode):
+    __slots__ = ()
+
     def __init__(self,tag,value,props=None):
         if value is None:
             raise ValueError("LeafNode requires a value.")
@@ -9,12 +11,12 @@ class LeafNode(HTMLNode):
 
     def to_html(self):
         """
-        Converte um nó (LeafNode) em HTML
+        Converte um nó (LeafNode) em HTML, escapando o texto.
         """
         if self.value is None:
             raise ValueError("LeafNode requires a value.")
         if self.tag is None:
-            return self.value
+            return escape_text(self.value)
         props_str = self.props_to_html()
-        return f"<{self.tag}{props_str}>{self.value}</{self.tag}>"
+        return f"<{self.tag}{props_str}>{escape_text(self.value)}</{self.tag}>"
     
\ No newline at end of file
@@ -1,31 +1,194 @@
+import argparse
 import os
 import shutil
-import sys
-from generator import generate_pages_recursive
+from client import DEFAULT_SOCKET
+from compress import DEFAULT_MIN_SIZE, compress_directory
+from copy_directory import sync_directory
+from daemon import BuildDaemon
+from fingerprint import sync_fingerprinted
+from generator import generate_pages_recursive, resolve_jobs
+from images import ImageSizes
+from manifest import BuildManifest
+from markdown import enable_inline_cache
+from parse_cache import ParseCache
+from report import BuildReport
+from search import SEARCH_DIR, SearchIndex
+from vfs import MemoryOutput
+from watcher import SiteWatcher
 
 DOCS_DIR = "docs/static_site"
 STATIC_DIR = "static"
 CONTENT_DIR = "content"
 TEMPLATE_FILE = "template.html"
+MANIFEST_FILE = ".cache/build-manifest.json"
+PARSE_CACHE_DIR = ".cache/pages"
+IMAGE_CACHE_FILE = ".cache/image-sizes.json"
+SEARCH_INDEX_FILE = ".cache/search-index.json"
 
 # Função para copiar arquivos estáticos
-def copy_static_files():
-    if os.path.exists(DOCS_DIR):
+# Retorna os nomes com hash dos assets com fingerprint=True (None sem fingerprinting)
+# Com um writer (MemoryOutput), os arquivos vão para a árvore em memória
+def copy_static_files(manifest, report, force=False, checksum=False, link=False, fingerprint=False, writer=None,
+                      basepath="/"):
+    if force and writer is None and os.path.exists(DOCS_DIR):
         shutil.rmtree(DOCS_DIR)  # Remove o diretório existente
-    shutil.copytree(STATIC_DIR, DOCS_DIR)  # Copia o diretório static para docs/static_site
+    # Copia apenas os arquivos alterados e remove os que saíram de static/
+    assets = None
+    if fingerprint:
+        result, assets = sync_fingerprinted(STATIC_DIR, DOCS_DIR, manifest, checksum=checksum, link=link,
+                                            verbose=not report.quiet, writer=writer, basepath=basepath)
+    else:
+        result = sync_directory(STATIC_DIR, DOCS_DIR, previous=manifest.assets, checksum=checksum, link=link,
+                                verbose=not report.quiet, writer=writer)
+    manifest.assets = result.files
+    report.count("assets_copied", result.copied + result.linked)
+    report.count("assets_skipped", result.skipped)
+    report.count("assets_removed", result.removed)
+    return assets
 
-def main():
-    # Pegando o caminho base do argumento de linha de comando ou usando o padrão "/"
-    basepath = sys.argv[1] if len(sys.argv) > 1 else "/"
+def load_search_index(args, writer=None):
+    """
+    Carrega o estado do índice de busca (None com o índice desativado).
+
+    Com --force ou em memória, o índice começa do zero. Sem --search, a
+    saída de um índice gerado antes é removida junto com o estado.
+    """
+    if not args.search:
+        if writer is None and os.path.exists(SEARCH_INDEX_FILE):
+            shutil.rmtree(os.path.join(DOCS_DIR, SEARCH_DIR), ignore_errors=True)
+            os.remove(SEARCH_INDEX_FILE)
+        return None
+    if args.memory:
+        return SearchIndex()
+    return SearchIndex(SEARCH_INDEX_FILE) if args.force else SearchIndex.load(SEARCH_INDEX_FILE)
+
+def print_memory_diff(output, report):
+    """Resume (e, fora do modo quiet, lista) as diferenças entre o build em memória e docs/static_site."""
+    added, changed, removed = output.diff(DOCS_DIR)
+    for label, paths in (("added", added), ("changed", changed), ("removed", removed)):
+        for path in paths:
+            report.log(f"  {label}: {path}")
+    print(f"In-memory build: {len(output.files)} files, {len(added)} added, {len(changed)} changed, "
+          f"{len(removed)} removed compared to {DOCS_DIR}")
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Gera o site estático a partir dos arquivos Markdown.")
+    # Caminho base do site; o padrão é "/"
+    parser.add_argument("basepath", nargs="?", default="/", help="caminho base usado nos links (padrão: /)")
+    parser.add_argument("--force", action="store_true", help="ignora o manifesto e regenera todo o site")
+    parser.add_argument("--checksum", action="store_true",
+                        help="compara os arquivos estáticos pelo hash, e não apenas por tamanho e mtime")
+    parser.add_argument("--link", action="store_true",
+                        help="usa hardlinks em vez de cópias para os arquivos estáticos, quando possível")
+    parser.add_argument("--watch", action="store_true",
+                        help="após o build, observa content/, static/ e o template e reconstrói o que mudar")
+    parser.add_argument("--daemon", action="store_true",
+                        help="após o build, fica aguardando comandos de rebuild no socket (ver src/client.py)")
+    parser.add_argument("--socket", default=DEFAULT_SOCKET,
+                        help=f"socket Unix usado por --daemon (padrão: {DEFAULT_SOCKET})")
+    parser.add_argument("-q", "--quiet", action="store_true",
+                        help="não exibe mensagens por página/arquivo, apenas o resumo final")
+    parser.add_argument("--profile", metavar="ARQUIVO",
+                        help="grava um relatório com tempos por página e por etapa (.json ou .csv)")
+    parser.add_argument("--slowest", type=int, default=10,
+                        help="quantidade de páginas mais lentas listadas no relatório JSON (padrão: 10)")
+    parser.add_argument("--inline-cache", type=int, default=0, metavar="N",
+                        help="ativa um cache LRU de até N fragmentos inline repetidos (padrão: desativado)")
+    parser.add_argument("--no-parse-cache", action="store_true",
+                        help="não reaproveita o HTML das páginas guardado em .cache/pages")
+    parser.add_argument("--parse-cache-size", type=int, default=256, metavar="MB",
+                        help="tamanho máximo do cache de parse em disco, em MB (padrão: 256)")
+    parser.add_argument("--rewrap", action="store_true",
+                        help="reaplica o template a todas as páginas inalteradas usando os corpos do cache de parse")
+    parser.add_argument("--no-image-sizes", action="store_true",
+                        help="não adiciona width/height e carregamento lazy às imagens")
+    parser.add_argument("--search", action="store_true",
+                        help="gera um índice de busca em docs/static_site/search/, dividido em shards por prefixo")
+    parser.add_argument("--fingerprint", action="store_true",
+                        help="copia os assets como nome.<hash>.ext, reescreve as referências e gera um _headers")
+    parser.add_argument("--gzip", action="store_true",
+                        help="grava arquivos .gz ao lado das páginas e dos arquivos de texto estáticos")
+    parser.add_argument("--gzip-min-size", type=int, default=DEFAULT_MIN_SIZE, metavar="BYTES",
+                        help=f"tamanho mínimo para gerar o .gz (padrão: {DEFAULT_MIN_SIZE})")
+    parser.add_argument("--memory", action="store_true",
+                        help="gera o site inteiro em memória, sem gravar em docs/, e lista o que mudaria")
+    parser.add_argument("-j", "--jobs", type=int, default=1,
+                        help="número de processos para gerar as páginas (0 = todos os núcleos; 1 = modo serial)")
+    args = parser.parse_args(argv)
+    if args.memory and (args.watch or args.daemon or args.gzip):
+        parser.error("--memory cannot be combined with --watch, --daemon or --gzip")
+    if args.watch and args.daemon:
+        parser.error("--watch and --daemon cannot be combined")
+    return args
+
+def main(argv=None):
+    args = parse_args(argv)
+    report = BuildReport(quiet=args.quiet, profile=args.profile is not None)
+    if args.inline_cache > 0:
+        enable_inline_cache(args.inline_cache)
+    parse_cache = None
+    if not args.no_parse_cache:
+        # Em memória, o cache em disco só é lido: o build não grava nada fora da árvore em memória
+        parse_cache = ParseCache(PARSE_CACHE_DIR, max_bytes=args.parse_cache_size * 1024 * 1024,
+                                 read_only=args.memory)
+
+    # Carrega o manifesto do build anterior (ou começa do zero com --force)
+    # Um build em memória sempre começa do zero e não grava o manifesto
+    writer = MemoryOutput() if args.memory else None
+    if args.memory:
+        manifest = BuildManifest()
+    else:
+        manifest = BuildManifest(MANIFEST_FILE) if args.force else BuildManifest.load(MANIFEST_FILE)
 
     # Copiar arquivos do diretório static para docs/static_site
-    copy_static_files()
+    assets = copy_static_files(manifest, report, force=args.force, checksum=args.checksum, link=args.link,
+                               fingerprint=args.fingerprint, writer=writer, basepath=args.basepath)
+    # Dimensões das imagens de static/ (lidas só dos cabeçalhos e guardadas em cache)
+    images = None if args.no_image_sizes else ImageSizes.load(STATIC_DIR, IMAGE_CACHE_FILE, read_only=args.memory)
+    search = load_search_index(args, writer)
 
     # 3. Gerando recursivamente páginas HTML a partir dos arquivos Markdown
-    print(f"Generating pages from {CONTENT_DIR} to {DOCS_DIR} using {TEMPLATE_FILE}...")
-    generate_pages_recursive(CONTENT_DIR, TEMPLATE_FILE, DOCS_DIR, basepath)
+    report.log(f"Generating pages from {CONTENT_DIR} to {DOCS_DIR} using {TEMPLATE_FILE}...")
+    try:
+        generate_pages_recursive(CONTENT_DIR, TEMPLATE_FILE, DOCS_DIR, args.basepath, manifest,
+                                 jobs=args.jobs, report=report, parse_cache=parse_cache,
+                                 rewrap=True if args.rewrap else None, writer=writer, assets=assets,
+                                 images=images, search=search)
+        if args.gzip:
+            # Pré-comprime páginas e arquivos estáticos de texto alterados
+            result = compress_directory(DOCS_DIR, min_size=args.gzip_min_size, jobs=resolve_jobs(args.jobs),
+                                        verbose=not report.quiet)
+            report.count("gzip_compressed", result.compressed)
+            report.count("gzip_skipped", result.skipped)
+            report.count("gzip_removed", result.removed)
+    finally:
+        # Salva o progresso mesmo se alguma página falhar
+        manifest.save()
+        if search is not None:
+            search.save()
+        if parse_cache is not None:
+            report.count("parse_cache_evicted", parse_cache.evict())
+        report.finish()
+        if args.profile:
+            report.write(args.profile, slowest=args.slowest)
+
+    report.log("Site generation complete!")
+    print(report.summary())
+    if args.profile:
+        print(f"Build profile written to {args.profile}")
+    if args.memory:
+        print_memory_diff(writer, report)
 
-    print("Site generation complete!")
+    if args.watch or args.daemon:
+        watcher = SiteWatcher(CONTENT_DIR, STATIC_DIR, TEMPLATE_FILE, DOCS_DIR, args.basepath, manifest,
+                              jobs=args.jobs, parse_cache=parse_cache, fingerprint=args.fingerprint,
+                              image_cache=None if args.no_image_sizes else IMAGE_CACHE_FILE, search=search,
+                              gzip_min_size=args.gzip_min_size if args.gzip else None, quiet=args.quiet)
+        if args.daemon:
+            # Mantém o estado do watcher aquecido e reconstrói sob demanda
+            BuildDaemon(watcher, args.socket).serve()
+        else:
+            watcher.run()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,142 @@
+import hashlib
+import json
+import os
+
+# Incrementar sempre que o formato do manifesto mudar de forma incompatível
+MANIFEST_VERSION = 1
+
+
+def hash_file(path):
+    """Calcula o hash SHA-256 do conteúdo de um arquivo, lendo-o em blocos."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class BuildManifest:
+    """
+    Registro persistente das entradas usadas na última geração do site.
+
+    Guarda o hash do template, o basepath e, para cada arquivo markdown,
+    o hash do conteúdo e o caminho da página gerada. Com isso é possível
+    pular páginas cujas entradas não mudaram e remover páginas órfãs.
+    Páginas geradas com o cache de parse guardam ainda a chave do corpo
+    no cache. Também guarda a lista de arquivos estáticos sincronizados,
+    usada para remover do destino os arquivos que saíram de static/, e,
+    com fingerprinting, os nomes com hash aplicados às páginas e os hashes
+    dos arquivos estáticos, além do resumo das dimensões das imagens usadas.
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self.template_hash = None
+        self.basepath = None
+        self.pages = {}
+        self.assets = []
+        self.fingerprints = None
+        self.asset_hashes = {}
+        self.images = None
+
+    @classmethod
+    def load(cls, path):
+        """Carrega o manifesto do disco; retorna um manifesto vazio se não existir ou for inválido."""
+        manifest = cls(path)
+        try:
+            with open(path, "r", encoding="utf-8") as file:
+                data = json.load(file)
+        except (OSError, ValueError):
+            return manifest
+        if not isinstance(data, dict) or data.get("version") != MANIFEST_VERSION:
+            return manifest
+        manifest.template_hash = data.get("template_hash")
+        manifest.basepath = data.get("basepath")
+        manifest.pages = data.get("pages", {})
+        manifest.assets = data.get("assets", [])
+        manifest.fingerprints = data.get("fingerprints")
+        manifest.asset_hashes = data.get("asset_hashes", {})
+        manifest.images = data.get("images")
+        return manifest
+
+    def save(self):
+        """Grava o manifesto de forma atômica (arquivo temporário + rename)."""
+        if self.path is None:
+            return
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        data = {
+            "version": MANIFEST_VERSION,
+            "template_hash": self.template_hash,
+            "basepath": self.basepath,
+            "pages": self.pages,
+            "assets": self.assets,
+            "fingerprints": self.fingerprints,
+            "asset_hashes": self.asset_hashes,
+            "images": self.images,
+        }
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as file:
+            json.dump(data, file, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+    def source_hash(self, key, path):
+        """
+        Retorna o hash do arquivo fonte.
+
+        Se o tamanho e o mtime coincidirem com os registrados, reaproveita o
+        hash salvo sem reler o arquivo.
+        """
+        stat = os.stat(path)
+        entry = self.pages.get(key)
+        if entry and entry.get("mtime_ns") == stat.st_mtime_ns and entry.get("size") == stat.st_size:
+            return entry["hash"]
+        return hash_file(path)
+
+    def asset_hash(self, key, path):
+        """Hash de um arquivo estático, reaproveitado enquanto o tamanho e o mtime não mudarem."""
+        stat = os.stat(path)
+        entry = self.asset_hashes.get(key)
+        if entry and entry["mtime_ns"] == stat.st_mtime_ns and entry["size"] == stat.st_size:
+            return entry["hash"]
+        digest = hash_file(path)
+        self.asset_hashes[key] = {"hash": digest, "mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+        return digest
+
+    def is_fresh(self, key, source_hash, output, exists=os.path.exists):
+        """
+        Verifica se a página registrada ainda corresponde à fonte e se a saída existe.
+
+        `exists` verifica a saída; o padrão olha o disco, e um build em
+        memória passa o exists do seu MemoryOutput.
+        """
+        entry = self.pages.get(key)
+        return (
+            entry is not None
+            and entry["hash"] == source_hash
+            and entry["output"] == output
+            and exists(output)
+        )
+
+    def record(self, key, path, source_hash, output, body=None):
+        """
+        Registra uma página gerada com sucesso.
+
+        `body` é a chave do corpo da página no cache de parse, usada para
+        reaplicar um novo template sem reler nem converter o markdown.
+        """
+        stat = os.stat(path)
+        self.pages[key] = {
+            "hash": source_hash,
+            "output": output,
+            "mtime_ns": stat.st_mtime_ns,
+            "size": stat.st_size,
+        }
+        if body is not None:
+            self.pages[key]["body"] = body
+
+    def forget(self, key):
+        """Remove uma página do manifesto e retorna o caminho da saída que ela gerava."""
+        entry = self.pages.pop(key, None)
+        return entry["output"] if entry else None
@@ -1,72 +1,171 @@
+import functools
 from parentnode import ParentNode
 from leafnode import LeafNode
 from textnode import text_to_textnodes, text_node_to_html_node
-from blocktype import BlockType, block_to_block_type
-import re
+from blocktype import FENCE, BlockType, classify_block
+
+# Versão da saída do parser; incrementar quando o HTML gerado mudar para invalidar caches
+PARSER_VERSION = "4"
+
+
+def iter_lines(text):
+    """Gera as linhas de um texto sem criar uma lista com todas elas."""
+    start = 0
+    while True:
+        end = text.find("\n", start)
+        if end == -1:
+            yield text[start:]
+            return
+        yield text[start:end]
+        start = end + 1
+
+
+def iter_blocks(markdown):
+    """
+    Divide um texto em Markdown em blocos, consumindo cada linha uma única vez.
+
+    Blocos são separados por linhas em branco (ou só com espaços). As linhas
+    de cada bloco têm os espaços das pontas removidos e são unidas por "\n".
+    Blocos de código cercados por ``` formam um único bloco, mesmo que
+    contenham linhas em branco; nele, a indentação do código é preservada
+    (descontada apenas a indentação da cerca de abertura).
+    """
+    lines = []          # Linhas do bloco atual
+    code_indent = None  # Indentação da cerca de abertura; None fora de bloco de código
+
+    for raw_line in iter_lines(markdown):
+        if code_indent is not None:
+            stripped = raw_line.strip()
+            if stripped.startswith(FENCE):
+                lines.append(stripped)
+                yield "\n".join(lines)
+                lines = []
+                code_indent = None
+                continue
+            line = raw_line.rstrip("\r")
+            # Remove a indentação da cerca, mas mantém a indentação própria do código
+            indent = len(line) - len(line.lstrip(" "))
+            lines.append(line[min(indent, code_indent):])
+            continue
+
+        line = raw_line.strip()
+        if not line:
+            if lines:
+                yield "\n".join(lines)
+                lines = []
+            continue
+
+        if line.startswith(FENCE):
+            if lines:
+                yield "\n".join(lines)
+                lines = []
+            if len(line) >= 2 * len(FENCE) and line.endswith(FENCE):
+                yield line  # Bloco de código em uma única linha
+                continue
+            code_indent = len(raw_line) - len(raw_line.lstrip(" "))
+            lines.append(line)
+            continue
+
+        lines.append(line)
+
+    if code_indent is not None:
+        lines.append(FENCE)  # Cerca não fechada: o código vai até o fim do documento
+    if lines:
+        yield "\n".join(lines)
+
 
 def markdown_to_blocks(markdown):
     """
     Divide um texto em Markdown em blocos separados por linhas em branco.
     """
-    blocks = []
-    for block in markdown.strip().split("\n\n"):
-        lines = [line.strip() for line in block.split("\n")]        
-        # Handling fenced code blocks (```)
-        if block.startswith("```") and block.endswith("```"):
-            blocks.append(lines[0])
-            blocks.extend(lines[1:-1])
-            blocks.append(lines[-1])        
-        # Handling unordered lists (lines starting with "- ")
-        elif all(line.startswith("- ") for line in lines):
-            blocks.append("\n".join(line.strip() for line in lines))    
-        # Handling ordered lists (lines starting with numbers followed by a period)
-        elif all(re.match(r'^\d+\.', line) for line in lines):
-            blocks.append("\n".join(line.strip() for line in lines))  
-        # For everything else (paragraphs, etc.)
-        else:
-            blocks.append(" ".join(lines))
-    return blocks
+    return list(iter_blocks(markdown))
+
+
+def _build_children(text, urls=None):
+    """Converte um texto markdown inline em uma tupla imutável de HTMLNodes."""
+    return tuple(text_node_to_html_node(node, urls) for node in text_to_textnodes(text))
 
 
-def text_to_children(text):
+# Cache LRU opcional do parse inline; None enquanto desativado
+_inline_cache = None
+
+
+def enable_inline_cache(maxsize=4096):
+    """
+    Ativa um cache LRU limitado para o parse inline, indexado pelo texto do
+    fragmento e pela transformação de URLs usada.
+
+    Fragmentos repetidos (menus, assinaturas, listas de links) passam a
+    reutilizar a mesma tupla de LeafNodes. Os nós compartilhados nunca são
+    modificados depois de criados, então podem aparecer em várias árvores.
+    """
+    global _inline_cache
+    _inline_cache = functools.lru_cache(maxsize=maxsize)(_build_children)
+    return _inline_cache
+
+
+def disable_inline_cache():
+    """Desativa (e descarta) o cache do parse inline."""
+    global _inline_cache
+    _inline_cache = None
+
+
+def inline_cache_info():
+    """Retorna (acertos, falhas, tamanho máximo) do cache inline, ou None se estiver desativado."""
+    if _inline_cache is None:
+        return None
+    info = _inline_cache.cache_info()
+    return info.hits, info.misses, info.maxsize
+
+
+def text_to_children(text, urls=None, images=None):
     """Converte um texto markdown inline em uma lista de HTMLNodes."""
+    # Fragmentos com imagens dependem da posição na página e não passam pelo cache
+    if _inline_cache is not None and (images is None or "![" not in text):
+        return _inline_cache(text, urls)
     text_nodes = text_to_textnodes(text)
-    return [text_node_to_html_node(node) for node in text_nodes]
+    return [text_node_to_html_node(node, urls, images) for node in text_nodes]
+
+
+def markdown_to_html_node(markdown, urls=None, images=None, terms=None):
+    """
+    Converte um documento Markdown completo em um único nó HTMLNode.
+
+    `urls` (UrlRewriter) é aplicado às URLs de links e imagens enquanto a
+    árvore é construída; blocos de código nunca são alterados. Com `images`
+    (ImageSizes), as imagens recebem width/height e, a partir da segunda,
+    loading="lazy" e decoding="async". Com `terms` (PageTerms), o texto de
+    cada folha é enviado ao índice de busca durante a mesma passada.
+    """
+    images = images.page() if images is not None else None
 
+    def inline(text):
+        nodes = text_to_children(text, urls, images)
+        if terms is not None:
+            terms.add_nodes(nodes)
+        return nodes
 
-def markdown_to_html_node(markdown):
-    """Converte um documento Markdown completo em um único nó HTMLNode."""
-    blocks = markdown_to_blocks(markdown) 
     children = []
-    for block in blocks:
-        block_type = block_to_block_type(block)       
+    for text in iter_blocks(markdown):
+        # Cada bloco é analisado uma única vez; as partes já vêm extraídas
+        block = classify_block(text)
+        block_type = block.block_type
         if block_type == BlockType.HEADING:
-            level = block.count('#')  # Conta os '#' para definir o nível do heading
-            text = block[level + 1:]  # Remove os '#' e o espaço seguinte
-            children.append(ParentNode(f'h{level}', text_to_children(text)))       
+            children.append(ParentNode(f"h{block.level}", inline(block.text)))
         elif block_type == BlockType.CODE:
-            code_text = block.strip('`')
-            children.append(ParentNode("pre", [LeafNode("code", code_text)]))       
+            if terms is not None:
+                terms.add(block.text)
+            children.append(ParentNode("pre", [LeafNode("code", block.text)]))
         elif block_type == BlockType.QUOTE:
-            quote_text = block.replace('> ', '')
-            children.append(ParentNode("blockquote", text_to_children(quote_text)))  
+            children.append(ParentNode("blockquote", inline(block.text)))
         elif block_type == BlockType.UNORDERED_LIST:
-            list_items = block.split('\n')
-            list_nodes = [ParentNode("li", text_to_children(item[2:])) for item in list_items]
-            children.append(ParentNode("ul", list_nodes)) 
+            list_nodes = [ParentNode("li", inline(item)) for item in block.items]
+            children.append(ParentNode("ul", list_nodes))
         elif block_type == BlockType.ORDERED_LIST:
-            list_items = block.split('\n')
-            list_nodes = []
-            for item in list_items:
-                if item.strip():
-                    # Usando expressão regular para identificar a lista ordenada
-                    match = re.match(r'^\d+\.\s+(.*)', item)
-                    if match:
-                        text = match.group(1)
-                        list_nodes.append(ParentNode("li", text_to_children(text.strip())))
+            list_nodes = [ParentNode("li", inline(item)) for item in block.items]
             children.append(ParentNode("ol", list_nodes))
         else:
-            children.append(ParentNode("p", text_to_children(block)))
+            children.append(ParentNode("p", inline(block.text)))
     return ParentNode("div", children)
 
 
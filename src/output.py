@@ -0,0 +1,126 @@
+import contextlib
+import os
+from copy_directory import remove_file, sync_file
+from manifest import hash_file
+
+# Tamanho dos blocos ao copiar o trecho já comparado para o temporário
+COPY_CHUNK = 1024 * 1024
+
+
+class ComparingStream:
+    """
+    Stream que compara o texto (em UTF-8) ou os bytes recebidos com o arquivo existente.
+
+    Enquanto o conteúdo coincide, nada é gravado. Na primeira diferença o
+    temporário é aberto, recebe o trecho já comparado (copiado do arquivo
+    antigo) e, daí em diante, o resto do conteúdo vai direto para ele.
+    """
+
+    def __init__(self, path, tmp_path):
+        self.path = path
+        self.tmp_path = tmp_path
+        self.size = 0
+        self.file = None  # Temporário, aberto só quando o conteúdo diverge
+        try:
+            self.existing = open(path, "rb")
+        except FileNotFoundError:
+            self.existing = None
+            self._diverge()
+
+    def write(self, text):
+        data = text.encode("utf-8") if isinstance(text, str) else text
+        if self.file is None and self.existing.read(len(data)) != data:
+            self._diverge()
+        if self.file is not None:
+            self.file.write(data)
+        self.size += len(data)
+        return len(data)
+
+    def finish(self):
+        """Retorna True se o conteúdo mudou (e está no temporário), False se é igual ao do arquivo existente."""
+        if self.file is None and self.existing.read(1):
+            # O arquivo antigo era mais longo
+            self._diverge()
+        self.close()
+        return self.file is not None
+
+    def close(self):
+        for file in (self.existing, self.file):
+            if file is not None:
+                file.close()
+
+    def _diverge(self):
+        directory = os.path.dirname(self.tmp_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.file = open(self.tmp_path, "wb")
+        if self.existing is not None:
+            self.existing.seek(0)
+            remaining = self.size
+            while remaining:
+                chunk = self.existing.read(min(remaining, COPY_CHUNK))
+                self.file.write(chunk)
+                remaining -= len(chunk)
+
+
+class OutputWriter:
+    """
+    Grava os arquivos gerados sem reescrever os que não mudaram.
+
+    O conteúdo é comparado com o arquivo existente durante a escrita, sem
+    ser guardado em memória. Se for idêntico, nada é gravado e o destino
+    fica intacto (inclusive o mtime); caso contrário, o conteúdo vai para
+    um arquivo temporário ao lado do destino, que o substitui com um
+    rename atômico, então um build interrompido nunca deixa páginas pela
+    metade.
+    """
+
+    def __init__(self):
+        self.written = 0
+        self.skipped = 0
+
+    @contextlib.contextmanager
+    def open(self, path):
+        """Abre um stream de texto para `path`; o arquivo só é substituído ao final do bloco with, se mudou."""
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        stream = ComparingStream(path, tmp_path)
+        try:
+            yield stream
+            changed = stream.finish()
+            if changed:
+                os.replace(tmp_path, path)
+        except BaseException:
+            stream.close()
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(tmp_path)
+            raise
+        if changed:
+            self.written += 1
+        else:
+            self.skipped += 1
+
+    def write(self, path, text):
+        """Grava `text` em `path`, a menos que o arquivo já tenha exatamente esse conteúdo."""
+        with self.open(path) as stream:
+            stream.write(text)
+
+    def copy(self, src_path, dest_path, checksum=False, link=False):
+        """Copia um arquivo estático (ver sync_file); retorna "copied", "linked" ou "skipped"."""
+        return sync_file(src_path, dest_path, checksum, link)
+
+    def remove(self, path, root):
+        """Remove um arquivo gerado e os diretórios que ficarem vazios até `root`."""
+        return remove_file(path, root)
+
+    def exists(self, path):
+        return os.path.exists(path)
+
+    @staticmethod
+    def matches(path, size, digest):
+        """Verifica se o arquivo existente tem o tamanho e depois o hash informados."""
+        try:
+            if os.stat(path).st_size != size:
+                return False
+        except FileNotFoundError:
+            return False
+        return hash_file(path) == digest
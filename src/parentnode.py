@@ -1,7 +1,10 @@
+import io
 from htmlnode import HTMLNode
 
 
 class ParentNode(HTMLNode):
+    __slots__ = ()
+
     def __init__(self,tag,children,props=None):
         if not children:
             raise ValueError("ParentNode requires at least one child.")
@@ -13,11 +16,32 @@ class ParentNode(HTMLNode):
         """
         Converte um nó (ParentNode) em HTML
         """
-        if self.children is None:
-            raise ValueError("ParentNode requires at least one child.")
-        if self.tag is None:
-            raise ValueError("ParentNode requires a tag.")
-        props_html = self.props_to_html() if self.props else ""
-        children_html = "".join(child.to_html() for child in self.children)
-        return f"<{self.tag}{props_html}>{children_html}</{self.tag}>"
-    
\ No newline at end of file
+        buffer = io.StringIO()
+        self.write_html(buffer)
+        return buffer.getvalue()
+
+    def write_html(self, stream):
+        """
+        Escreve o HTML da subárvore em um stream de texto.
+
+        A árvore é percorrida com uma pilha explícita, sem recursão: cada
+        fragmento (tag de abertura, folha, tag de fechamento) é escrito assim
+        que visitado, sem montar strings intermediárias por subárvore.
+        """
+        write = stream.write
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            if isinstance(node, str):
+                write(node)  # Tag de fechamento pendente
+            elif isinstance(node, ParentNode):
+                if node.children is None:
+                    raise ValueError("ParentNode requires at least one child.")
+                if node.tag is None:
+                    raise ValueError("ParentNode requires a tag.")
+                props_html = node.props_to_html() if node.props else ""
+                write(f"<{node.tag}{props_html}>")
+                stack.append(f"</{node.tag}>")
+                stack.extend(reversed(node.children))
+            else:
+                node.write_html(stream)
@@ -0,0 +1,146 @@
+import contextlib
+import hashlib
+import io
+import json
+import os
+from markdown import PARSER_VERSION
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+# Formato das entradas (título, URLs usadas e corpo); incrementar quando mudar
+ENTRY_VERSION = "2"
+
+
+class ParseCache:
+    """
+    Cache em disco do resultado do parse de cada página (título e HTML do corpo).
+
+    A chave é o hash do markdown junto com a versão do parser, o basepath e
+    as dimensões das imagens, então uma mudança no parser, no basepath ou
+    nas imagens invalida as entradas. Os nomes com hash dos assets não
+    entram na chave: cada entrada guarda as URLs que a página usa (ver
+    UrlRewriter.references) e só deixa de valer se alguma delas mudar.
+    Assim, editar um CSS usado apenas pelo template não invalida nenhum
+    corpo. Cada entrada é um arquivo
+    gravado de forma atômica (temporário + rename), o que permite que vários
+    processos do pool leiam e escrevam ao mesmo tempo. O mtime das entradas
+    é atualizado a cada acerto e evict() remove as menos usadas quando o
+    tamanho total passa do limite.
+
+    Com read_only=True (builds em memória), as entradas existentes são
+    lidas, mas nada é gravado, marcado como usado ou removido do disco.
+    """
+
+    def __init__(self, directory=".cache/pages", max_bytes=DEFAULT_MAX_BYTES, read_only=False):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.read_only = read_only
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, markdown_content, urls=None, images=None):
+        """
+        Chave da página: hash da versão do parser, do markdown e do contexto do parse.
+
+        O contexto é o basepath de `urls` e as dimensões das imagens, que
+        também ficam gravados no HTML do corpo.
+        """
+        digest = hashlib.sha256(f"{PARSER_VERSION}\0{ENTRY_VERSION}\0".encode("utf-8"))
+        for context in (urls.parse_key if urls is not None else None, images.key if images is not None else None):
+            if context is not None:
+                digest.update(context.encode("utf-8") + b"\0")
+        digest.update(markdown_content.encode("utf-8"))
+        return digest.hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key[:2], key)
+
+    def get(self, key, urls=None):
+        """
+        Retorna (título, html) guardados para a chave, ou None.
+
+        Com `urls` (UrlRewriter), a entrada só vale se todas as URLs que a
+        página usa continuam com a mesma transformação (por exemplo, se
+        nenhum asset referenciado pela página mudou de hash); senão conta
+        como falha.
+        """
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as file:
+                title = file.readline()[:-1]
+                references = json.loads(file.readline())
+                if urls is not None and any(urls(url) != used for url, used in references.items()):
+                    raise LookupError(key)
+                html = file.read()
+            if not self.read_only:
+                os.utime(path)  # Marca como usada recentemente
+        except (FileNotFoundError, UnicodeDecodeError, ValueError, LookupError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return title, html
+
+    def put(self, key, title, html, references=None):
+        """Guarda o título (uma linha), as URLs usadas pela página e o HTML do corpo."""
+        with self.open(key, title, references) as file:
+            file.write(html)
+
+    @contextlib.contextmanager
+    def open(self, key, title, references=None):
+        """
+        Abre um stream de texto para o HTML do corpo de uma entrada.
+
+        `references` ({URL original: URL transformada}, de
+        UrlRewriter.references) é gravado antes do corpo.
+
+        A entrada só passa a existir ao final do bloco with (temporário +
+        rename); se o bloco falhar, nada é guardado. Com read_only=True, o
+        que for escrito é descartado.
+        """
+        if self.read_only:
+            yield io.StringIO()
+            return
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as file:
+                file.write(title.replace("\n", " "))
+                file.write("\n")
+                file.write(json.dumps(references or {}, separators=(",", ":"), sort_keys=True))
+                file.write("\n")
+                yield file
+            os.replace(tmp_path, path)
+        except BaseException:
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(tmp_path)
+            raise
+
+    def evict(self):
+        """Remove as entradas menos usadas até o cache caber no limite. Retorna quantas foram removidas."""
+        if self.read_only:
+            return 0
+        entries = []
+        total = 0
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue  # Removida por outro processo
+                entries.append((stat.st_mtime_ns, stat.st_size, path))
+                total += stat.st_size
+        if total <= self.max_bytes:
+            return 0
+
+        removed = 0
+        for _, size, path in sorted(entries):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+            removed += 1
+            if total <= self.max_bytes:
+                break
+        return removed
@@ -0,0 +1,106 @@
+import csv
+import json
+import os
+import time
+
+PAGE_STAGES = ["read", "parse", "render", "template", "write"]
+PAGE_FIELDS = ["source", "output", *PAGE_STAGES, "total", "bytes_in", "bytes_out", "nodes"]
+
+
+def count_nodes(node):
+    """Conta os nós de uma árvore HTML sem recursão."""
+    total = 0
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        total += 1
+        stack.extend(current.children)
+    return total
+
+
+class BuildReport:
+    """
+    Coleta as estatísticas de um build.
+
+    Substitui os prints por arquivo: no modo quiet as mensagens por página e
+    por arquivo são suprimidas e apenas um resumo é exibido no final. Com
+    profile=True, cada página registra os tempos de leitura, parse,
+    renderização, template e escrita, além de tamanhos e número de nós.
+    """
+
+    def __init__(self, quiet=False, profile=False):
+        self.quiet = quiet
+        self.profile = profile
+        self.counters = {}
+        self.pages = []
+        self.started = time.perf_counter()
+        self.finished = None
+
+    def log(self, message):
+        """Exibe uma mensagem de progresso, exceto no modo quiet."""
+        if not self.quiet:
+            print(message)
+
+    def count(self, name, amount=1):
+        """Incrementa um contador do resumo (páginas geradas, arquivos copiados, ...)."""
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def record_page(self, stats):
+        """Registra as estatísticas de uma página gerada."""
+        self.count("pages_generated")
+        if stats:
+            stats["total"] = sum(stats.get(stage, 0.0) for stage in PAGE_STAGES)
+            self.pages.append(stats)
+
+    def finish(self):
+        self.finished = time.perf_counter()
+
+    @property
+    def elapsed(self):
+        end = self.finished if self.finished is not None else time.perf_counter()
+        return end - self.started
+
+    def totals(self):
+        """Soma os tempos e tamanhos de todas as páginas perfiladas."""
+        totals = {field: 0 for field in PAGE_FIELDS[2:]}
+        for page in self.pages:
+            for field in totals:
+                totals[field] += page.get(field, 0)
+        return totals
+
+    def slowest(self, limit=10):
+        """Retorna as `limit` páginas mais lentas."""
+        return sorted(self.pages, key=lambda page: page["total"], reverse=True)[:limit]
+
+    def summary(self):
+        """Resumo de uma linha do build."""
+        counters = ", ".join(f"{name.replace('_', ' ')}: {value}" for name, value in sorted(self.counters.items()))
+        return f"Build finished in {self.elapsed:.2f}s ({counters or 'nothing to do'})"
+
+    def to_dict(self, slowest=10):
+        return {
+            "elapsed": self.elapsed,
+            "counters": dict(sorted(self.counters.items())),
+            "totals": self.totals(),
+            "slowest": self.slowest(slowest),
+            "pages": self.pages,
+        }
+
+    def write(self, path, slowest=10):
+        """
+        Grava o relatório em JSON ou CSV, conforme a extensão do arquivo.
+
+        O CSV traz uma linha por página; o JSON inclui também contadores,
+        totais e as páginas mais lentas.
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        if path.endswith(".csv"):
+            with open(path, "w", encoding="utf-8", newline="") as file:
+                writer = csv.DictWriter(file, fieldnames=PAGE_FIELDS, extrasaction="ignore")
+                writer.writeheader()
+                writer.writerows(self.pages)
+        else:
+            with open(path, "w", encoding="utf-8") as file:
+                json.dump(self.to_dict(slowest), file, indent=2)
@@ -0,0 +1,193 @@
+import heapq
+import json
+import os
+import re
+import unicodedata
+from collections import Counter
+
+INDEX_VERSION = 1
+# Os termos são agrupados em shards pelos primeiros PREFIX_LENGTH caracteres
+PREFIX_LENGTH = 2
+MIN_TERM_LENGTH = 2
+SEARCH_DIR = "search"
+INDEX_FILE = "index.json"
+WORD = re.compile(r"\w+")
+# Prefixos usados como nome de arquivo; qualquer outro vai para o shard "_"
+SAFE_PREFIX = re.compile(r"[a-z0-9]+")
+
+
+def normalize(text):
+    """Minúsculas e sem acentos ("Númenor" -> "numenor"); o navegador deve aplicar a mesma normalização à busca."""
+    text = unicodedata.normalize("NFKD", text.lower())
+    return "".join(char for char in text if not unicodedata.combining(char))
+
+
+def tokenize(text):
+    """Termos de um texto, já normalizados; palavras com menos de MIN_TERM_LENGTH caracteres são ignoradas."""
+    return [word for word in WORD.findall(normalize(text)) if len(word) >= MIN_TERM_LENGTH]
+
+
+def shard_name(term):
+    prefix = term[:PREFIX_LENGTH]
+    return prefix if SAFE_PREFIX.fullmatch(prefix) else "_"
+
+
+def page_url(html_relative_path, urls=None):
+    """URL de uma página gerada: "blog/post/index.html" -> "/blog/post/", com o basepath de `urls`."""
+    path = "/" + html_relative_path.replace(os.sep, "/")
+    if path.endswith("/index.html"):
+        path = path[:-len("index.html")]
+    return urls(path) if urls is not None else path
+
+
+class PageTerms:
+    """
+    Termos de uma página, coletados enquanto markdown_to_html_node monta a árvore.
+
+    Recebe o texto das folhas (texto, negrito, itálico, código, links e o
+    alt das imagens) e dos blocos de código; URLs e a marcação markdown
+    ficam de fora.
+    """
+
+    def __init__(self):
+        self.counts = Counter()
+        self.title = None
+
+    def add(self, text):
+        self.counts.update(tokenize(text))
+
+    def add_nodes(self, nodes):
+        for node in nodes:
+            if node.tag == "img":
+                self.add(node.props.get("alt", ""))
+            else:
+                self.add(node.value)
+
+
+class SearchIndex:
+    """
+    Índice invertido do site, mantido de forma incremental entre builds.
+
+    Os termos de cada página ficam em um arquivo de estado (em .cache),
+    junto com o hash do markdown de onde vieram; só páginas novas ou
+    alteradas são indexadas de novo. Cada página recebe um id estável (ids
+    de páginas removidas são reaproveitados), então uma página alterada só
+    muda os shards dos seus termos.
+
+    A saída fica em `search/` no destino:
+
+    - index.json: {"version", "prefix", "pages": [[url, título] ou null], "shards": [...]};
+    - <prefixo>.json: {termo: [id, ocorrências, id, ocorrências, ...]}.
+
+    O navegador baixa o index.json e apenas os shards dos prefixos dos
+    termos buscados.
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self.pages = {}
+        self.dirty = set()  # Prefixos cujos shards precisam ser regravados
+        self._free = None  # Ids livres (heap), calculados no primeiro uso
+        self._next = 0
+
+    @classmethod
+    def load(cls, path):
+        index = cls(path)
+        try:
+            with open(path, "r", encoding="utf-8") as file:
+                data = json.load(file)
+        except (OSError, ValueError):
+            return index
+        if isinstance(data, dict) and data.get("version") == INDEX_VERSION:
+            index.pages = data.get("pages", {})
+            index.dirty = set(data.get("dirty", ()))
+        return index
+
+    def save(self):
+        """
+        Grava o estado de forma atômica (arquivo temporário + rename).
+
+        Os prefixos ainda não regravados também são guardados: se o build
+        falhar entre record() e write(), o próximo build regrava esses
+        shards mesmo que os termos das páginas não mudem mais.
+        """
+        if self.path is None:
+            return
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as file:
+            json.dump({"version": INDEX_VERSION, "pages": self.pages, "dirty": sorted(self.dirty)}, file,
+                      separators=(",", ":"), sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+    def is_fresh(self, key, source_hash):
+        """Verifica se os termos guardados de uma página vieram desta versão do markdown."""
+        entry = self.pages.get(key)
+        return entry is not None and source_hash is not None and entry["hash"] == source_hash
+
+    def _allocate_id(self):
+        """Menor id livre: os de páginas removidas são reaproveitados antes de crescer a tabela."""
+        if self._free is None:
+            used = {entry["id"] for entry in self.pages.values()}
+            self._next = max(used, default=-1) + 1
+            self._free = [page_id for page_id in range(self._next) if page_id not in used]
+        if self._free:
+            return heapq.heappop(self._free)
+        self._next += 1
+        return self._next - 1
+
+    def _mark(self, terms):
+        self.dirty.update(shard_name(term) for term in terms)
+
+    def record(self, key, source_hash, html_relative_path, title, counts):
+        """Guarda os termos (um dicionário termo -> ocorrências) de uma página indexada."""
+        entry = self.pages.get(key)
+        if entry is not None:
+            if entry["terms"] == counts and entry["title"] == title and entry["path"] == html_relative_path:
+                entry["hash"] = source_hash
+                return
+            self._mark(entry["terms"])
+            page_id = entry["id"]
+        else:
+            page_id = self._allocate_id()
+        self._mark(counts)
+        self.pages[key] = {"id": page_id, "hash": source_hash, "path": html_relative_path, "title": title,
+                           "terms": dict(counts)}
+
+    def forget(self, key):
+        entry = self.pages.pop(key, None)
+        if entry is not None:
+            self._mark(entry["terms"])
+            if self._free is not None:
+                heapq.heappush(self._free, entry["id"])
+
+    def write(self, dest_dir, writer, urls=None):
+        """
+        Grava o index.json e os shards que mudaram (ou que não existem no destino).
+
+        Shards que ficaram vazios são removidos. `writer` é o OutputWriter
+        (ou MemoryOutput) do build; `urls` aplica o basepath às URLs.
+        """
+        shards = {}
+        for entry in self.pages.values():
+            for term, count in entry["terms"].items():
+                shards.setdefault(shard_name(term), {}).setdefault(term, []).append((entry["id"], count))
+
+        directory = os.path.join(dest_dir, SEARCH_DIR)
+        for name in sorted(self.dirty - set(shards)):
+            writer.remove(os.path.join(directory, f"{name}.json"), dest_dir)
+        for name, postings in sorted(shards.items()):
+            path = os.path.join(directory, f"{name}.json")
+            if name not in self.dirty and writer.exists(path):
+                continue
+            shard = {term: [value for pair in sorted(pages) for value in pair] for term, pages in postings.items()}
+            writer.write(path, json.dumps(shard, separators=(",", ":"), sort_keys=True, ensure_ascii=False))
+        self.dirty.clear()
+
+        table = [None] * (max((entry["id"] for entry in self.pages.values()), default=-1) + 1)
+        for entry in self.pages.values():
+            table[entry["id"]] = [page_url(entry["path"], urls), entry["title"]]
+        data = {"version": INDEX_VERSION, "prefix": PREFIX_LENGTH, "pages": table, "shards": sorted(shards)}
+        writer.write(os.path.join(directory, INDEX_FILE), json.dumps(data, separators=(",", ":"), ensure_ascii=False))
@@ -0,0 +1,368 @@
+import argparse
+import asyncio
+import email.utils
+import gzip
+import hashlib
+import mimetypes
+import os
+from collections import OrderedDict
+from urllib.parse import unquote, urlsplit
+from compress import DEFAULT_MIN_SIZE, TEXT_EXTENSIONS, gzip_path, is_stale
+
+DEFAULT_ROOT = "docs/static_site"
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8888
+DEFAULT_CACHE_SIZE = 64  # MB
+# Arquivos maiores que isso são enviados em streaming do disco (ver LargeFile), sem ocupar o cache
+MAX_CACHED_FILE = 4 * 1024 * 1024
+# Tamanho dos blocos lidos ao enviar um LargeFile
+STREAM_CHUNK = 64 * 1024
+# Tempo que uma conexão keep-alive ociosa fica aberta
+KEEP_ALIVE_TIMEOUT = 15
+STATUS_TEXT = {200: "OK", 301: "Moved Permanently", 304: "Not Modified", 400: "Bad Request",
+               404: "Not Found", 405: "Method Not Allowed"}
+
+
+class CachedFile:
+    """
+    Conteúdo de um arquivo servido, com o ETag e a versão gzip.
+
+    `stamp` (inode, mtime e tamanho) identifica a versão do arquivo em
+    disco: o OutputWriter substitui os arquivos com rename, o que troca o
+    inode, então qualquer reescrita feita pelo gerador invalida a entrada.
+    """
+
+    def __init__(self, path, stamp, body):
+        self.path = path
+        self.stamp = stamp
+        self.body = body
+        self.etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+        self.content_type = content_type(path)
+        self.compressible = os.path.splitext(path)[1].lower() in TEXT_EXTENSIONS and len(body) >= DEFAULT_MIN_SIZE
+        self.gzipped = None
+
+    def gzip_body(self):
+        """Versão gzip do conteúdo: o .gz gerado pelo --gzip, se estiver em dia, ou uma compressão feita aqui."""
+        if self.gzipped is None:
+            sibling = gzip_path(self.path)
+            if os.path.exists(sibling) and not is_stale(self.path):
+                with open(sibling, "rb") as file:
+                    self.gzipped = file.read()
+            else:
+                self.gzipped = gzip.compress(self.body, compresslevel=6, mtime=0)
+        return self.gzipped
+
+    @property
+    def gzip_etag(self):
+        # Cada representação precisa de um ETag forte próprio
+        return self.etag[:-1] + '-gzip"'
+
+    @property
+    def weight(self):
+        return len(self.body) + len(self.gzipped or b"")
+
+
+class LargeFile:
+    """
+    Arquivo maior que MAX_CACHED_FILE, enviado em blocos direto do disco.
+
+    O ETag vem do stamp (inode, mtime e tamanho), então validar um
+    If-None-Match não lê o arquivo, e ele nunca é comprimido na hora.
+    """
+
+    compressible = False
+
+    def __init__(self, path, stat):
+        self.path = path
+        self.stamp = file_stamp(stat)
+        self.size = stat.st_size
+        self.etag = '"{:x}-{:x}-{:x}"'.format(*self.stamp)
+        self.content_type = content_type(path)
+
+    async def send(self, writer):
+        """Envia o conteúdo; se o arquivo foi trocado desde o stat, fecha a conexão em vez de mandar outro tamanho."""
+        loop = asyncio.get_running_loop()
+        with open(self.path, "rb") as file:
+            if file_stamp(os.fstat(file.fileno())) != self.stamp:
+                raise ConnectionResetError(self.path)
+            while True:
+                chunk = await loop.run_in_executor(None, file.read, STREAM_CHUNK)
+                if not chunk:
+                    break
+                writer.write(chunk)
+                await writer.drain()
+
+
+class FileCache:
+    """
+    Cache LRU em memória dos arquivos servidos, limitado a `max_bytes`.
+
+    Cada acesso faz um stat do arquivo e compara com o da entrada guardada;
+    se o arquivo mudou em disco, ele é relido.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_CACHE_SIZE * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+
+    def lookup(self, path, stat):
+        """Retorna a entrada de `path` se ela ainda corresponder ao `stat` atual, ou None."""
+        entry = self.entries.get(path)
+        if entry is None or entry.stamp != file_stamp(stat):
+            self.misses += 1
+            return None
+        self.entries.move_to_end(path)
+        self.hits += 1
+        return entry
+
+    def load(self, path, stat):
+        """Lê `path` do disco e guarda a entrada, descartando as menos usadas se passar do limite."""
+        with open(path, "rb") as file:
+            entry = CachedFile(path, file_stamp(stat), file.read())
+        if entry.compressible:
+            entry.gzip_body()
+        self.discard(path)
+        if stat.st_size <= MAX_CACHED_FILE and entry.weight <= self.max_bytes:
+            self.entries[path] = entry
+            self.size += entry.weight
+            while self.size > self.max_bytes:
+                _, oldest = self.entries.popitem(last=False)
+                self.size -= oldest.weight
+        return entry
+
+    def discard(self, path):
+        entry = self.entries.pop(path, None)
+        if entry is not None:
+            self.size -= entry.weight
+
+
+class Response:
+    def __init__(self, status, headers=None, body=b"", stream=None):
+        self.status = status
+        self.headers = headers or []
+        self.body = body
+        # LargeFile enviado depois do cabeçalho, no lugar de `body`
+        self.stream = stream
+
+    def encode(self, head_only=False, keep_alive=True):
+        lines = [f"HTTP/1.1 {self.status} {STATUS_TEXT[self.status]}",
+                 f"Date: {email.utils.formatdate(usegmt=True)}",
+                 f"Connection: {'keep-alive' if keep_alive else 'close'}"]
+        lines += [f"{name}: {value}" for name, value in self.headers]
+        if self.status != 304:
+            lines.append(f"Content-Length: {self.stream.size if self.stream is not None else len(self.body)}")
+        head = ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+        return head if head_only or self.status == 304 else head + self.body
+
+    def header(self, name):
+        for key, value in self.headers:
+            if key.lower() == name.lower():
+                return value
+        return None
+
+
+def file_stamp(stat):
+    return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+
+def content_type(path):
+    mime, _ = mimetypes.guess_type(path)
+    mime = mime or "application/octet-stream"
+    if mime.startswith("text/") or mime in ("application/javascript", "application/json", "image/svg+xml"):
+        mime += "; charset=utf-8"
+    return mime
+
+
+def accepts_gzip(header):
+    """Interpreta o Accept-Encoding: gzip vale se aparecer (ou houver *) com q maior que zero."""
+    accepted = {}
+    for item in (header or "").split(","):
+        name, _, params = item.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if name:
+            accepted[name.strip().lower()] = quality
+    if "gzip" in accepted:
+        return accepted["gzip"] > 0
+    return accepted.get("*", 0) > 0
+
+
+def etag_matches(header, etag):
+    """If-None-Match usa comparação fraca: W/"x" casa com "x"."""
+    if header is None:
+        return False
+    if header.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in header.split(","))
+
+
+def parse_request(head):
+    """Separa a linha de requisição e os cabeçalhos; retorna (método, alvo, versão, cabeçalhos) ou None."""
+    try:
+        lines = head.decode("latin-1").split("\r\n")
+        method, target, version = lines[0].split(" ")
+    except ValueError:
+        return None
+    if not version.startswith("HTTP/1."):
+        return None
+    headers = {}
+    for line in lines[1:]:
+        if not line:
+            continue
+        name, separator, value = line.partition(":")
+        if not separator:
+            return None
+        headers[name.strip().lower()] = value.strip()
+    return method, target, version, headers
+
+
+class PreviewServer:
+    """
+    Servidor HTTP assíncrono para visualizar o site gerado.
+
+    Atende conexões keep-alive em uma única thread com asyncio, responde
+    com ETags fortes (304 para If-None-Match), negocia gzip pelo
+    Accept-Encoding e guarda os arquivos mais pedidos em um FileCache;
+    arquivos grandes são enviados em streaming, sem gzip.
+    Apenas GET e HEAD são aceitos. "/blog" é servido de blog.html ou
+    blog/index.html, e um 404.html na raiz é usado nas páginas não
+    encontradas.
+    """
+
+    def __init__(self, root=DEFAULT_ROOT, cache=None, verbose=True):
+        self.root = os.path.realpath(root)
+        self.cache = cache if cache is not None else FileCache()
+        self.verbose = verbose
+
+    def resolve(self, url_path):
+        """Converte o caminho da URL em (caminho no disco, redirecionamento); (None, None) se não existir."""
+        parts = [part for part in url_path.split("/") if part not in ("", ".")]
+        if ".." in parts or any(os.sep in part or "\0" in part for part in parts):
+            return None, None
+        path = os.path.join(self.root, *parts)
+        if os.path.isdir(path):
+            if not url_path.endswith("/"):
+                return None, url_path + "/"
+            path = os.path.join(path, "index.html")
+        elif not os.path.isfile(path) and parts:
+            path += ".html"
+        if not os.path.isfile(path):
+            return None, None
+        return path, None
+
+    async def read(self, path):
+        stat = os.stat(path)
+        if stat.st_size > MAX_CACHED_FILE:
+            return LargeFile(path, stat)
+        entry = self.cache.lookup(path, stat)
+        if entry is None:
+            # Leitura (e compressão) fora do laço de eventos
+            entry = await asyncio.get_running_loop().run_in_executor(None, self.cache.load, path, stat)
+        return entry
+
+    async def respond(self, method, target, headers):
+        if method not in ("GET", "HEAD"):
+            return Response(405, [("Allow", "GET, HEAD")])
+        url = urlsplit(target)
+        path, redirect = self.resolve(unquote(url.path))
+        if redirect is not None:
+            location = redirect + (f"?{url.query}" if url.query else "")
+            return Response(301, [("Location", location)])
+        status = 200
+        if path is None:
+            status = 404
+            path = os.path.join(self.root, "404.html")
+            if not os.path.isfile(path):
+                return Response(404, [("Content-Type", "text/plain; charset=utf-8")], b"Not Found\n")
+
+        try:
+            entry = await self.read(path)
+        except FileNotFoundError:
+            # O arquivo sumiu entre o resolve e a leitura (durante um rebuild)
+            return Response(404, [("Content-Type", "text/plain; charset=utf-8")], b"Not Found\n")
+        response_headers = [("Content-Type", entry.content_type), ("Cache-Control", "no-cache")]
+        if isinstance(entry, LargeFile):
+            body, etag = b"", entry.etag
+        else:
+            body, etag = entry.body, entry.etag
+        if entry.compressible:
+            response_headers.append(("Vary", "Accept-Encoding"))
+            if accepts_gzip(headers.get("accept-encoding")):
+                body, etag = entry.gzip_body(), entry.gzip_etag
+                response_headers.append(("Content-Encoding", "gzip"))
+        response_headers.append(("ETag", etag))
+        if status == 200 and etag_matches(headers.get("if-none-match"), etag):
+            return Response(304, [header for header in response_headers if header[0] != "Content-Encoding"])
+        return Response(status, response_headers, body, entry if isinstance(entry, LargeFile) else None)
+
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                try:
+                    head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), KEEP_ALIVE_TIMEOUT)
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, asyncio.TimeoutError,
+                        ConnectionError):
+                    break
+                request = parse_request(head)
+                if request is None:
+                    writer.write(Response(400).encode(keep_alive=False))
+                    break
+                method, target, version, headers = request
+                connection = headers.get("connection", "").lower()
+                keep_alive = connection != "close" and (version != "HTTP/1.0" or connection == "keep-alive")
+                response = await self.respond(method, target, headers)
+                writer.write(response.encode(head_only=method == "HEAD", keep_alive=keep_alive))
+                if response.stream is not None and method != "HEAD":
+                    await response.stream.send(writer)
+                await writer.drain()
+                if self.verbose:
+                    print(f"{method} {target} {response.status}")
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        return await asyncio.start_server(self.handle, host, port)
+
+    async def serve_forever(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        server = await self.start(host, port)
+        address = server.sockets[0].getsockname()
+        print(f"Serving {self.root} at http://{address[0]}:{address[1]}/")
+        async with server:
+            await server.serve_forever()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Servidor local para visualizar o site gerado.")
+    parser.add_argument("root", nargs="?", default=DEFAULT_ROOT,
+                        help=f"diretório servido (padrão: {DEFAULT_ROOT})")
+    parser.add_argument("--host", default=DEFAULT_HOST, help=f"endereço de escuta (padrão: {DEFAULT_HOST})")
+    parser.add_argument("-p", "--port", type=int, default=DEFAULT_PORT, help=f"porta (padrão: {DEFAULT_PORT})")
+    parser.add_argument("--cache-size", type=int, default=DEFAULT_CACHE_SIZE, metavar="MB",
+                        help=f"memória máxima do cache de arquivos, em MB (padrão: {DEFAULT_CACHE_SIZE})")
+    parser.add_argument("-q", "--quiet", action="store_true", help="não exibe uma linha por requisição")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    server = PreviewServer(args.root, FileCache(args.cache_size * 1024 * 1024), verbose=not args.quiet)
+    try:
+        asyncio.run(server.serve_forever(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+import hashlib
+import os
+import re
+
+# {{ Nome }} para espaços reservados e {% include "arquivo" %} para parciais
+TOKEN_PATTERN = re.compile(r"\{\{\s*(\w+)\s*\}\}|\{%\s*include\s+[\"']([^\"']+)[\"']\s*%\}")
+
+
+class Template:
+    """
+    Template HTML compilado.
+
+    O texto é analisado uma única vez e guardado como uma lista de partes:
+    trechos literais e posições de espaços reservados. Renderizar uma página
+    é apenas preencher essas posições e juntar as partes, sem varrer o
+    template de novo.
+    """
+
+    def __init__(self, parts, slots, dependencies, digest):
+        self.parts = parts                # Trechos literais; as posições de slots contêm o texto original
+        self.slots = slots                # Lista de (índice em parts, nome do espaço reservado)
+        self.dependencies = dependencies  # Template principal e parciais incluídos
+        self.digest = digest              # Hash do conteúdo de todas as dependências
+
+    @property
+    def names(self):
+        """Nomes dos espaços reservados usados no template."""
+        return {name for _, name in self.slots}
+
+    def render(self, values):
+        """Preenche os espaços reservados com `values`; nomes sem valor mantêm o texto original."""
+        parts = self.parts[:]
+        for index, name in self.slots:
+            if name in values:
+                value = values[name]
+                parts[index] = value if isinstance(value, str) else value.to_html()
+        return "".join(parts)
+
+    def write(self, stream, values):
+        """
+        Escreve o template preenchido diretamente em um stream de texto.
+
+        Valores podem ser strings ou nós HTML; os nós são escritos com
+        write_html, sem gerar a string completa do conteúdo em memória.
+        """
+        slot_names = dict(self.slots)
+        for index, part in enumerate(self.parts):
+            name = slot_names.get(index)
+            value = values.get(name, part) if name is not None else part
+            if isinstance(value, str):
+                stream.write(value)
+            else:
+                value.write_html(stream)
+
+    def with_urls(self, urls):
+        """
+        Retorna uma cópia do template com `urls` (UrlRewriter) aplicado aos href/src dos trechos literais.
+
+        Feito uma vez por build, e não a cada página; os valores dos espaços
+        reservados não são alterados.
+        """
+        slot_indexes = {index for index, _ in self.slots}
+        parts = [part if index in slot_indexes else urls.rewrite_html(part) for index, part in enumerate(self.parts)]
+        return Template(parts, self.slots, self.dependencies, self.digest)
+
+    def __repr__(self):
+        return f"Template(dependencies={self.dependencies}, slots={[name for _, name in self.slots]})"
+
+
+def _compile_into(path, parts, slots, dependencies, digest, stack):
+    """Analisa um arquivo de template, expandindo recursivamente os parciais."""
+    path = os.path.normpath(path)
+    if path in stack:
+        chain = " -> ".join(stack + [path])
+        raise ValueError(f"Circular template include: {chain}")
+
+    with open(path, "r", encoding="utf-8") as file:
+        text = file.read()
+    dependencies.append(path)
+    digest.update(path.encode("utf-8") + b"\0" + text.encode("utf-8") + b"\0")
+
+    position = 0
+    for match in TOKEN_PATTERN.finditer(text):
+        if match.start() > position:
+            parts.append(text[position:match.start()])
+        name, include = match.groups()
+        if name is not None:
+            slots.append((len(parts), name))
+            parts.append(match.group(0))
+        else:
+            partial_path = os.path.join(os.path.dirname(path), include)
+            _compile_into(partial_path, parts, slots, dependencies, digest, stack + [path])
+        position = match.end()
+    if position < len(text):
+        parts.append(text[position:])
+
+
+def compile_template(template_path):
+    """Lê e compila um template HTML (incluindo os parciais referenciados por {% include %})."""
+    parts, slots, dependencies = [], [], []
+    digest = hashlib.sha256()
+    _compile_into(template_path, parts, slots, dependencies, digest, [])
+
+    # Junta trechos literais vizinhos (por exemplo, em volta de um parcial)
+    slot_names = dict(slots)
+    merged, merged_slots = [], []
+    last_is_literal = False
+    for index, part in enumerate(parts):
+        if index in slot_names:
+            merged_slots.append((len(merged), slot_names[index]))
+            merged.append(part)
+            last_is_literal = False
+        elif last_is_literal:
+            merged[-1] += part
+        else:
+            merged.append(part)
+            last_is_literal = True
+    return Template(merged, merged_slots, dependencies, digest.hexdigest())
@@ -0,0 +1,40 @@
+import os
+import tempfile
+import unittest
+from benchmark import STAGES, compare_results, generate_corpus, run_benchmark
+from markdown import extract_title, markdown_to_html_node
+
+
+class TestBenchmark(unittest.TestCase):
+    def test_generate_corpus_is_deterministic_and_valid(self):
+        """O corpus sintético deve ser reprodutível e conter markdown válido."""
+        with tempfile.TemporaryDirectory() as first, tempfile.TemporaryDirectory() as second:
+            paths = generate_corpus(first, pages=5, seed=7, pages_per_dir=2)
+            generate_corpus(second, pages=5, seed=7, pages_per_dir=2)
+            self.assertEqual(len(paths), 5)
+            for path in paths:
+                with open(path, encoding="utf-8") as file:
+                    markdown = file.read()
+                with open(os.path.join(second, os.path.relpath(path, first)), encoding="utf-8") as file:
+                    self.assertEqual(file.read(), markdown)
+                self.assertTrue(extract_title(markdown))
+                markdown_to_html_node(markdown).to_html()
+
+    def test_run_benchmark_reports_every_stage(self):
+        """O resultado deve trazer o tempo de todas as etapas."""
+        with tempfile.TemporaryDirectory() as tmp:
+            generate_corpus(tmp, pages=3)
+            results = run_benchmark(tmp, repeat=1)
+        self.assertEqual(results["corpus"]["pages"], 3)
+        self.assertEqual(sorted(results["stages"]), sorted(STAGES))
+
+    def test_compare_results_flags_regressions(self):
+        """Etapas mais lentas que o limite devem ser apontadas como regressão."""
+        baseline = {"stages": {"to_html": 1.0, "write": 1.0}}
+        current = {"stages": {"to_html": 1.5, "write": 1.1}}
+        regressions = compare_results(baseline, current, threshold=0.2)
+        self.assertEqual([stage for stage, *_ in regressions], ["to_html"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,5 @@
 import unittest
-from blocktype import BlockType, block_to_block_type
+from blocktype import Block, BlockType, block_to_block_type, classify_block
 
 
 class TestBlockToBlockType(unittest.TestCase):
@@ -44,5 +44,35 @@ def hello():
         self.assertEqual(block_to_block_type(md), BlockType.PARAGRAPH)
 
 
+
+class TestClassifyBlock(unittest.TestCase):
+    """Testes para a função classify_block."""
+
+    def test_heading_level_ignores_hashes_in_text(self):
+        """O nível do cabeçalho deve contar apenas os '#' do prefixo."""
+        block = classify_block("## Issue #42 and C#")
+        self.assertEqual(block, Block(BlockType.HEADING, "Issue #42 and C#", level=2))
+
+    def test_code_body(self):
+        """O corpo do código deve excluir as cercas."""
+        block = classify_block("```python\nx = 1\n\ny = 2\n```")
+        self.assertEqual(block.block_type, BlockType.CODE)
+        self.assertEqual(block.text, "x = 1\n\ny = 2\n")
+
+    def test_quote_text(self):
+        """O texto da citação deve remover os '>' e ignorar linhas vazias."""
+        block = classify_block("> First line\n>\n> -- Author")
+        self.assertEqual(block, Block(BlockType.QUOTE, "First line -- Author"))
+
+    def test_list_items(self):
+        """Os itens das listas devem vir já extraídos."""
+        self.assertEqual(classify_block("- a\n- b").items, ["a", "b"])
+        self.assertEqual(classify_block("1. First\n10. Tenth").items, ["First", "Tenth"])
+
+    def test_mixed_lines_are_paragraph(self):
+        """Linhas que não formam lista nem citação devem virar um parágrafo com linhas unidas por espaço."""
+        self.assertEqual(classify_block("- item\nnot an item"), Block(BlockType.PARAGRAPH, "- item not an item"))
+
+
 if __name__ == "__main__":
     unittest.main()
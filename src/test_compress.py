@@ -0,0 +1,44 @@
+import gzip
+import os
+import unittest
+from compress import compress_directory
+from fixtures import TempDirMixin
+
+
+class TestCompressDirectory(TempDirMixin, unittest.TestCase):
+    def setUp(self):
+        super().setUp()
+        self.write("index.html", "<p>hello</p>" * 200)
+        self.write("blog/post.html", "<p>post</p>" * 200)
+        self.write("small.css", "p{}")
+        self.write("images/logo.png", "\x89PNG" * 500)
+
+    def exists(self, relative):
+        return os.path.exists(os.path.join(self.root, relative))
+
+    def test_compresses_text_files_above_threshold(self):
+        """Somente arquivos de texto acima do limite recebem um .gz com o mesmo conteúdo."""
+        result = compress_directory(self.root, min_size=100, jobs=2, verbose=False)
+        self.assertEqual(result.compressed, 2)
+        self.assertFalse(self.exists("small.css.gz"))
+        self.assertFalse(self.exists("images/logo.png.gz"))
+        with gzip.open(os.path.join(self.root, "index.html.gz"), "rt", encoding="utf-8") as file:
+            self.assertEqual(file.read(), "<p>hello</p>" * 200)
+
+    def test_only_changed_sources_are_recompressed(self):
+        """Um .gz só é refeito quando a origem muda; .gz órfãos são removidos."""
+        compress_directory(self.root, min_size=100, verbose=False)
+        result = compress_directory(self.root, min_size=100, verbose=False)
+        self.assertEqual((result.compressed, result.skipped), (0, 2))
+
+        self.write("index.html", "<p>changed</p>" * 200)
+        os.remove(os.path.join(self.root, "blog", "post.html"))
+        result = compress_directory(self.root, min_size=100, verbose=False)
+        self.assertEqual((result.compressed, result.removed), (1, 1))
+        self.assertFalse(self.exists("blog"))
+        with gzip.open(os.path.join(self.root, "index.html.gz"), "rt", encoding="utf-8") as file:
+            self.assertEqual(file.read(), "<p>changed</p>" * 200)
+
+
+if __name__ == "__main__":
+    unittest.main()
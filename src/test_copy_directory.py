@@ -0,0 +1,65 @@
+import os
+import unittest
+from copy_directory import sync_directory, sync_file
+from fixtures import TempDirMixin
+
+
+class TestSyncDirectory(TempDirMixin, unittest.TestCase):
+    def setUp(self):
+        super().setUp()
+        self.src = os.path.join(self.root, "static")
+        self.dest = os.path.join(self.root, "public")
+        self.write(os.path.join(self.src, "index.css"), "body {}")
+        self.write(os.path.join(self.src, "images", "a.png"), "png-bytes")
+
+    def test_first_sync_copies_everything(self):
+        """A primeira sincronização deve copiar todos os arquivos e preservar o mtime."""
+        result = sync_directory(self.src, self.dest, verbose=False)
+        self.assertEqual(result.copied, 2)
+        self.assertEqual(result.files, ["index.css", os.path.join("images", "a.png")])
+        src_stat = os.stat(os.path.join(self.src, "index.css"))
+        dest_stat = os.stat(os.path.join(self.dest, "index.css"))
+        self.assertEqual(src_stat.st_mtime_ns, dest_stat.st_mtime_ns)
+
+    def test_unchanged_files_are_skipped(self):
+        """Arquivos com mesmo tamanho e mtime não devem ser copiados novamente."""
+        sync_directory(self.src, self.dest, verbose=False)
+        self.write(os.path.join(self.src, "index.css"), "body { margin: 0 }")
+        result = sync_directory(self.src, self.dest, verbose=False)
+        self.assertEqual((result.copied, result.skipped), (1, 1))
+        with open(os.path.join(self.dest, "index.css"), encoding="utf-8") as file:
+            self.assertEqual(file.read(), "body { margin: 0 }")
+
+    def test_checksum_detects_same_size_changes(self):
+        """Com checksum, uma alteração de mesmo tamanho deve ser detectada mesmo com mtime igual."""
+        sync_directory(self.src, self.dest, verbose=False)
+        path = os.path.join(self.src, "index.css")
+        stat = os.stat(path)
+        self.write(path, "body {{")
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        self.assertEqual(sync_directory(self.src, self.dest, verbose=False).copied, 0)
+        self.assertEqual(sync_directory(self.src, self.dest, checksum=True, verbose=False).copied, 1)
+
+    def test_orphans_are_removed_but_other_files_kept(self):
+        """Arquivos removidos da origem saem do destino; arquivos gerados são mantidos."""
+        first = sync_directory(self.src, self.dest, verbose=False)
+        self.write(os.path.join(self.dest, "index.html"), "<html></html>")
+        os.remove(os.path.join(self.src, "images", "a.png"))
+        result = sync_directory(self.src, self.dest, previous=first.files, verbose=False)
+        self.assertEqual(result.removed, 1)
+        self.assertFalse(os.path.exists(os.path.join(self.dest, "images")))
+        self.assertTrue(os.path.exists(os.path.join(self.dest, "index.html")))
+
+    def test_hardlink_mode(self):
+        """No modo link, o destino deve ser um hardlink e não precisa ser recriado."""
+        src_path = os.path.join(self.src, "index.css")
+        dest_path = os.path.join(self.dest, "index.css")
+        status = sync_file(src_path, dest_path, link=True)
+        self.assertIn(status, ("linked", "copied"))
+        if status == "linked":
+            self.assertTrue(os.path.samefile(src_path, dest_path))
+            self.assertEqual(sync_file(src_path, dest_path, link=True), "skipped")
+
+
+if __name__ == "__main__":
+    unittest.main()
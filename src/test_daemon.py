@@ -0,0 +1,70 @@
+import os
+import threading
+import time
+import unittest
+from client import send
+from daemon import BuildDaemon
+from fixtures import SiteMixin
+from generator import generate_pages_recursive
+from manifest import BuildManifest
+from watcher import SiteWatcher
+
+
+class TestBuildDaemon(SiteMixin, unittest.TestCase):
+    def setUp(self):
+        super().setUp()
+        manifest = BuildManifest(os.path.join(self.root, ".cache", "manifest.json"))
+        generate_pages_recursive(self.content, self.template, self.dest, "/", manifest)
+        watcher = SiteWatcher(self.content, self.static, self.template, self.dest, "/", manifest)
+        self.daemon = BuildDaemon(watcher, os.path.join(self.root, "build.sock"))
+
+    def test_rebuild_paths(self):
+        """Cada caminho é reconstruído conforme o seu tipo; caminhos desconhecidos são ignorados."""
+        self.write(os.path.join(self.content, "about.md"), "# About us")
+        self.write(os.path.join(self.static, "app.js"), "run()")
+        response = self.daemon.handle({"command": "rebuild", "paths": [
+            os.path.join(self.content, "about.md"), os.path.join(self.static, "app.js"), "/etc/hosts"]})
+        self.assertTrue(response["ok"], response)
+        self.assertIn("About us", self.read("about.html"))
+        self.assertTrue(os.path.exists(os.path.join(self.dest, "app.js")))
+        self.assertTrue(any(line.startswith("Ignored /etc/hosts") for line in response["log"]))
+        # O manifesto é salvo a cada reconstrução
+        self.assertTrue(os.path.exists(self.daemon.watcher.manifest.path))
+
+    def test_template_and_failures(self):
+        """Uma mudança no template regenera tudo; páginas com erro tornam a resposta ok=False."""
+        self.write(self.template, "<main>{{ Content }}</main><title>{{ Title }}</title>")
+        response = self.daemon.handle({"command": "rebuild", "paths": [self.template]})
+        self.assertTrue(response["ok"], response)
+        self.assertTrue(self.read("index.html").startswith("<main>"))
+
+        self.write(os.path.join(self.content, "index.md"), "no title")
+        response = self.daemon.handle({"command": "rebuild", "paths": [os.path.join(self.content, "index.md")]})
+        self.assertFalse(response["ok"])
+        self.assertEqual(self.daemon.stats()["failures"], 1)
+        self.assertFalse(self.daemon.handle({"command": "explode"})["ok"])
+
+    def test_socket_round_trip(self):
+        """O cliente conversa com o daemon pelo socket até o comando stop."""
+        self.daemon.bind().server_close()  # Deixa um socket órfão, como após uma queda
+        # Thread daemon: se o teste falhar antes do "stop", ela não impede o processo de terminar
+        thread = threading.Thread(target=self.daemon.serve, daemon=True)
+        thread.start()
+        self.addCleanup(thread.join, 5)
+        deadline = time.monotonic() + 5
+        while not self.daemon.running:
+            if not thread.is_alive() or time.monotonic() > deadline:
+                self.fail("build daemon did not start")
+            time.sleep(0.01)
+        os.remove(os.path.join(self.dest, "index.html"))
+        self.assertTrue(send({"command": "all"}, self.daemon.socket_path)["ok"])
+        self.assertIn("Home", self.read("index.html"))
+        stats = send({"command": "stats"}, self.daemon.socket_path)["stats"]
+        self.assertEqual((stats["rebuilds"], stats["pages"]), (1, 2))
+        self.assertTrue(send({"command": "stop"}, self.daemon.socket_path)["ok"])
+        thread.join(5)
+        self.assertFalse(os.path.exists(self.daemon.socket_path))
+
+
+if __name__ == "__main__":
+    unittest.main()
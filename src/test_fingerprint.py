@@ -0,0 +1,117 @@
+import os
+import unittest
+from fingerprint import fingerprint_name, sync_fingerprinted
+from fixtures import TempDirMixin
+from generator import generate_pages_recursive
+from manifest import BuildManifest
+from parse_cache import ParseCache
+from report import BuildReport
+from urls import UrlRewriter
+
+
+class TestFingerprint(TempDirMixin, unittest.TestCase):
+    def setUp(self):
+        super().setUp()
+        self.static = os.path.join(self.root, "static")
+        self.dest = os.path.join(self.root, "public")
+        self.write(os.path.join(self.static, "index.css"), "body { color: red; }")
+        self.write(os.path.join(self.static, "images", "tom.png"), "png")
+        self.write(os.path.join(self.static, "robots.txt"), "User-agent: *")
+
+    def read(self, path):
+        with open(path, "r", encoding="utf-8") as file:
+            return file.read()
+
+    def test_fingerprint_name(self):
+        self.assertEqual(fingerprint_name("images/tom.png", "0123456789abcdef"), "images/tom.0123456789.png")
+
+    def test_url_rewriter(self):
+        """Referências aos assets recebem o nome com hash e o basepath."""
+        urls = UrlRewriter("/site/", {"index.css": "index.abc.css", "images/tom.png": "images/tom.def.png"})
+        self.assertEqual(urls("/index.css"), "/site/index.abc.css")
+        self.assertEqual(urls("/images/tom.png?v=1"), "/site/images/tom.def.png?v=1")
+        self.assertEqual(urls("/blog#top"), "/site/blog#top")
+        self.assertEqual(urls("https://a.b/"), "https://a.b/")
+        self.assertEqual(urls("//cdn.example.com/x.js"), "//cdn.example.com/x.js")
+        self.assertEqual(urls("images/tom.png"), "images/tom.png")
+        self.assertEqual(urls.rewrite_html('<link href="/index.css" rel="stylesheet" />'),
+                         '<link href="/site/index.abc.css" rel="stylesheet" />')
+
+    def test_sync_renames_assets_and_removes_old_versions(self):
+        """Os assets são copiados com hash, o _headers os marca como imutáveis e versões antigas somem."""
+        manifest = BuildManifest()
+        result, assets = sync_fingerprinted(self.static, self.dest, manifest, verbose=False)
+        manifest.assets = result.files
+        css = assets["index.css"]
+        self.assertNotIn("robots.txt", assets)
+        self.assertTrue(os.path.exists(os.path.join(self.dest, css)))
+        self.assertTrue(os.path.exists(os.path.join(self.dest, "robots.txt")))
+        self.assertFalse(os.path.exists(os.path.join(self.dest, "index.css")))
+        self.assertIn(f"/{css}\n  Cache-Control: public, max-age=31536000, immutable",
+                      self.read(os.path.join(self.dest, "_headers")))
+
+        self.write(os.path.join(self.static, "index.css"), "body { color: blue; }")
+        result, assets = sync_fingerprinted(self.static, self.dest, manifest, verbose=False)
+        self.assertNotEqual(assets["index.css"], css)
+        self.assertEqual(result.removed, 1)
+        self.assertFalse(os.path.exists(os.path.join(self.dest, css)))
+
+    def test_headers_use_basepath_and_keep_user_rules(self):
+        """Os caminhos do _headers recebem o basepath das páginas; as regras de static/_headers são mantidas."""
+        self.write(os.path.join(self.static, "_headers"), "/*\n  X-Frame-Options: DENY\n")
+        result, assets = sync_fingerprinted(self.static, self.dest, verbose=False, basepath="/static_site/")
+        headers = self.read(os.path.join(self.dest, "_headers"))
+        self.assertTrue(headers.startswith("/*\n  X-Frame-Options: DENY\n\n"))
+        self.assertIn(f"/static_site/{assets['index.css']}\n  Cache-Control: public, max-age=31536000, immutable",
+                      headers)
+        self.assertNotIn(f"\n/{assets['index.css']}", headers)
+        self.assertEqual(result.files.count("_headers"), 1)
+
+    def test_pages_reference_fingerprinted_assets(self):
+        """Template e conteúdo passam a apontar para os nomes com hash; mudar um hash regenera as páginas."""
+        content = os.path.join(self.root, "content")
+        template = os.path.join(self.root, "template.html")
+        self.write(template, '<link href="/index.css" />{{ Content }}')
+        self.write(os.path.join(content, "index.md"), "# Home\n\n![Tom](/images/tom.png)")
+        manifest = BuildManifest()
+        _, assets = sync_fingerprinted(self.static, self.dest, manifest, verbose=False)
+        generate_pages_recursive(content, template, self.dest, "/", manifest, assets=assets)
+        html = self.read(os.path.join(self.dest, "index.html"))
+        self.assertIn(f'href="/{assets["index.css"]}"', html)
+        self.assertIn(f'src="/{assets["images/tom.png"]}"', html)
+
+        changed = dict(assets, **{"index.css": "index.new.css"})
+        generate_pages_recursive(content, template, self.dest, "/", manifest, assets=changed)
+        self.assertIn('href="/index.new.css"', self.read(os.path.join(self.dest, "index.html")))
+
+    def test_asset_change_reparses_only_pages_that_use_it(self):
+        """Um asset com outro hash reembrulha as páginas do cache; só as que o referenciam são convertidas de novo."""
+        content = os.path.join(self.root, "content")
+        template = os.path.join(self.root, "template.html")
+        self.write(template, '<link href="/index.css" />{{ Content }}')
+        self.write(os.path.join(content, "index.md"), "# Home\n\n![Tom](/images/tom.png?v=1)")
+        self.write(os.path.join(content, "about.md"), "# About\n\n[Home](/)")
+        manifest = BuildManifest()
+        cache = ParseCache(os.path.join(self.root, "cache"))
+        _, assets = sync_fingerprinted(self.static, self.dest, manifest, verbose=False)
+        generate_pages_recursive(content, template, self.dest, "/site/", manifest, parse_cache=cache, assets=assets)
+
+        report = BuildReport(quiet=True)
+        changed = dict(assets, **{"index.css": "index.new.css"})
+        generate_pages_recursive(content, template, self.dest, "/site/", manifest,
+                                 report=report, parse_cache=cache, assets=changed)
+        self.assertEqual(report.counters["pages_rewrapped"], 2)
+        self.assertNotIn("pages_generated", report.counters)
+        self.assertIn('href="/site/index.new.css"', self.read(os.path.join(self.dest, "about.html")))
+
+        report = BuildReport(quiet=True)
+        changed = dict(changed, **{"images/tom.png": "images/tom.new.png"})
+        generate_pages_recursive(content, template, self.dest, "/site/", manifest,
+                                 report=report, parse_cache=cache, assets=changed)
+        self.assertEqual(report.counters["pages_rewrapped"], 1)
+        self.assertEqual(report.counters["pages_generated"], 1)
+        self.assertIn('src="/site/images/tom.new.png?v=1"', self.read(os.path.join(self.dest, "index.html")))
+
+
+if __name__ == "__main__":
+    unittest.main()
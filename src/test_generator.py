@@ -0,0 +1,127 @@
+import os
+import unittest
+from fixtures import TempDirMixin
+from generator import BuildError, generate_pages_recursive
+from manifest import BuildManifest
+
+
+TEMPLATE = "<title>{{ Title }}</title><article>{{ Content }}</article>"
+
+
+class TestIncrementalBuild(TempDirMixin, unittest.TestCase):
+    def setUp(self):
+        super().setUp()
+        self.content = os.path.join(self.root, "content")
+        self.dest = os.path.join(self.root, "public")
+        self.template = os.path.join(self.root, "template.html")
+        self.manifest_path = os.path.join(self.root, ".cache", "manifest.json")
+        self.write(self.template, TEMPLATE)
+        self.write(os.path.join(self.content, "index.md"), "# Home\n\nHello")
+        self.write(os.path.join(self.content, "blog", "post.md"), "# Post\n\nText")
+
+    def build(self, basepath="/"):
+        manifest = BuildManifest.load(self.manifest_path)
+        generate_pages_recursive(self.content, self.template, self.dest, basepath, manifest)
+        manifest.save()
+
+    def mtime(self, relative):
+        return os.stat(os.path.join(self.dest, relative)).st_mtime_ns
+
+    def test_unchanged_pages_are_skipped(self):
+        """Páginas cujas entradas não mudaram não devem ser reescritas."""
+        self.build()
+        before = self.mtime("index.html")
+        os.utime(os.path.join(self.dest, "index.html"), ns=(1, 1))
+        self.build()
+        self.assertEqual(self.mtime("index.html"), 1)
+        self.assertNotEqual(before, 1)
+
+    def test_changed_source_is_rebuilt(self):
+        """Somente a página cujo markdown mudou deve ser regenerada."""
+        self.build()
+        os.utime(os.path.join(self.dest, "index.html"), ns=(1, 1))
+        os.utime(os.path.join(self.dest, "blog", "post.html"), ns=(1, 1))
+        self.write(os.path.join(self.content, "blog", "post.md"), "# Post\n\nNew text")
+        self.build()
+        self.assertEqual(self.mtime("index.html"), 1)
+        self.assertNotEqual(self.mtime(os.path.join("blog", "post.html")), 1)
+
+    def test_template_or_basepath_change_rebuilds_all(self):
+        """Uma mudança no template ou no basepath deve regenerar todas as páginas."""
+        # Com um link, o basepath altera o HTML (páginas idênticas não são reescritas)
+        self.write(os.path.join(self.content, "index.md"), "# Home\n\n[Blog](/blog)")
+        self.build()
+        os.utime(os.path.join(self.dest, "index.html"), ns=(1, 1))
+        self.build(basepath="/site/")
+        self.assertNotEqual(self.mtime("index.html"), 1)
+
+        os.utime(os.path.join(self.dest, "index.html"), ns=(1, 1))
+        self.write(self.template, "<main>{{ Content }}</main><title>{{ Title }}</title>")
+        self.build(basepath="/site/")
+        self.assertNotEqual(self.mtime("index.html"), 1)
+
+    def test_basepath_is_not_applied_to_code_samples(self):
+        """O basepath vale para links, imagens e o template, mas não para href="/ dentro de código."""
+        self.write(self.template, '<link href="/index.css" />{{ Content }}')
+        self.write(os.path.join(self.content, "index.md"),
+                   '# Home\n\n[Blog](/blog) ![Logo](/logo.png)\n\n```\n<a href="/x">x</a>\n```')
+        self.build(basepath="/site/")
+        with open(os.path.join(self.dest, "index.html"), "r", encoding="utf-8") as file:
+            html = file.read()
+        self.assertIn('<link href="/site/index.css" />', html)
+        self.assertIn('<a href="/site/blog">Blog</a>', html)
+        self.assertIn('src="/site/logo.png"', html)
+        self.assertIn('&lt;a href="/x"&gt;x&lt;/a&gt;', html)
+
+    def test_removed_source_deletes_output(self):
+        """A página gerada deve ser apagada quando o markdown for removido."""
+        self.build()
+        os.remove(os.path.join(self.content, "blog", "post.md"))
+        self.build()
+        self.assertFalse(os.path.exists(os.path.join(self.dest, "blog", "post.html")))
+        self.assertFalse(os.path.exists(os.path.join(self.dest, "blog")))
+        self.assertTrue(os.path.exists(os.path.join(self.dest, "index.html")))
+
+
+class TestParallelBuild(TempDirMixin, unittest.TestCase):
+    def setUp(self):
+        super().setUp()
+        self.content = os.path.join(self.root, "content")
+        self.template = os.path.join(self.root, "template.html")
+        with open(self.template, "w", encoding="utf-8") as file:
+            file.write(TEMPLATE)
+        os.makedirs(self.content)
+        for i in range(6):
+            with open(os.path.join(self.content, f"page{i}.md"), "w", encoding="utf-8") as file:
+                file.write(f"# Page {i}\n\nSome **text** for page {i}.")
+
+    def read_all(self, dest):
+        pages = {}
+        for name in sorted(os.listdir(dest)):
+            with open(os.path.join(dest, name), encoding="utf-8") as file:
+                pages[name] = file.read()
+        return pages
+
+    def test_parallel_matches_serial(self):
+        """O modo paralelo deve gerar exatamente as mesmas páginas do modo serial."""
+        serial = os.path.join(self.root, "serial")
+        parallel = os.path.join(self.root, "parallel")
+        generate_pages_recursive(self.content, self.template, serial, "/", jobs=1)
+        generate_pages_recursive(self.content, self.template, parallel, "/", jobs=3)
+        self.assertEqual(self.read_all(serial), self.read_all(parallel))
+
+    def test_parallel_errors_are_collected_in_order(self):
+        """As falhas do modo paralelo devem ser reunidas em um BuildError, na ordem dos caminhos."""
+        for name in ("page1.md", "page4.md"):
+            with open(os.path.join(self.content, name), "w", encoding="utf-8") as file:
+                file.write("no title here")
+        dest = os.path.join(self.root, "public")
+        with self.assertRaises(BuildError) as context:
+            generate_pages_recursive(self.content, self.template, dest, "/", jobs=2)
+        failed = [os.path.basename(path) for path, _ in context.exception.errors]
+        self.assertEqual(failed, ["page1.md", "page4.md"])
+        self.assertIn("page0.html", os.listdir(dest))
+
+
+if __name__ == "__main__":
+    unittest.main()
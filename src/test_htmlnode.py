@@ -1,5 +1,7 @@
 import unittest
-from htmlnode import HTMLNode
+from htmlnode import HTMLNode, escape_attribute, escape_text
+from leafnode import LeafNode
+from parentnode import ParentNode
 
 
 class TestHTMLNode(unittest.TestCase):
@@ -13,12 +15,37 @@ class TestHTMLNode(unittest.TestCase):
         node = HTMLNode(tag="a", value="Click here", props={"href": "https://www.google.com", "target": "_blank"})
         self.assertEqual(node.props_to_html(), ' href="https://www.google.com" target="_blank"')
 
+    def test_escape_fast_path(self):
+        """Textos sem caracteres especiais são devolvidos sem cópia."""
+        text = "plain text, nothing to escape"
+        self.assertIs(escape_text(text), text)
+        self.assertIs(escape_attribute(text), text)
+        self.assertEqual(escape_text("a&b<c>"), "a&amp;b&lt;c&gt;")
+        self.assertEqual(escape_attribute('"&'), "&quot;&amp;")
+
     def test_repr(self):
         """Testa a representação em string (__repr__) de um HTMLNode."""
         node = HTMLNode(tag="p", value="Hello, World!")
         self.assertEqual(repr(node), "HTMLNode(tag=p, value=Hello, World!, children=[], props={})")
 
 
+    def test_nodes_are_slotted(self):
+        """Os nós não devem ter __dict__ por instância."""
+        leaf = LeafNode("b", "text")
+        parent = ParentNode("p", [leaf])
+        for node in (HTMLNode(), leaf, parent):
+            self.assertFalse(hasattr(node, "__dict__"))
+
+    def test_empty_defaults_are_shared_and_immutable(self):
+        """Folhas sem atributos devem compartilhar padrões vazios e imutáveis."""
+        first = LeafNode("b", "one")
+        second = LeafNode("i", "two")
+        self.assertIs(first.props, second.props)
+        self.assertIs(first.children, second.children)
+        self.assertEqual(first.props, {})
+        with self.assertRaises(TypeError):
+            first.props["href"] = "/"
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,85 @@
+import os
+import struct
+import unittest
+from fixtures import TempDirMixin
+from images import ImageSizes, read_image_size
+from markdown import markdown_to_html_node
+
+
+PNG = b"\x89PNG\r\n\x1a\n" + struct.pack(">I", 13) + b"IHDR" + struct.pack(">II", 640, 480) + b"\x08\x06\x00\x00\x00"
+GIF = b"GIF89a" + struct.pack("<HH", 32, 16) + b"\x00" * 8
+# SOI, um segmento APP0 qualquer e o SOF0 com altura 200 e largura 300
+JPEG = (b"\xff\xd8" + b"\xff\xe0" + struct.pack(">H", 6) + b"JFIF"
+        + b"\xff\xc0" + struct.pack(">HBHH", 17, 8, 200, 300) + b"\x00" * 10)
+WEBP = b"RIFF" + struct.pack("<I", 30) + b"WEBPVP8X" + struct.pack("<I", 10) + b"\x00" * 4 \
+    + (99).to_bytes(3, "little") + (49).to_bytes(3, "little")
+
+
+class TestImageSizes(TempDirMixin, unittest.TestCase):
+    def setUp(self):
+        super().setUp()
+        self.static = os.path.join(self.root, "static")
+        self.cache_path = os.path.join(self.root, ".cache", "image-sizes.json")
+        for name, data in (("a.png", PNG), ("images/b.gif", GIF), ("c.jpg", JPEG), ("d.webp", WEBP)):
+            self.write(os.path.join(self.static, name), data)
+
+    def test_read_image_size(self):
+        """As dimensões são lidas do cabeçalho de PNG, GIF, JPEG e WebP."""
+        expected = {"a.png": (640, 480), "images/b.gif": (32, 16), "c.jpg": (300, 200), "d.webp": (100, 50)}
+        for name, size in expected.items():
+            self.assertEqual(tuple(read_image_size(os.path.join(self.static, name))), size, name)
+
+    def test_unknown_format(self):
+        path = os.path.join(self.static, "broken.png")
+        self.write(path, b"not an image")
+        self.assertIsNone(read_image_size(path))
+
+    def test_load_uses_cache(self):
+        """Um segundo load com os arquivos inalterados não relê nenhuma imagem."""
+        sizes = ImageSizes.load(self.static, self.cache_path)
+        self.assertEqual(sizes.get("/images/b.gif?v=2"), (32, 16))
+        self.assertIsNone(sizes.get("https://example.com/a.png"))
+        self.assertTrue(os.path.exists(self.cache_path))
+
+        import images
+        original = images.read_image_size
+        images.read_image_size = lambda path: self.fail(f"{path} was read again")
+        try:
+            cached = ImageSizes.load(self.static, self.cache_path)
+        finally:
+            images.read_image_size = original
+        self.assertEqual(cached.key, sizes.key)
+
+    def test_read_only_load_uses_cache_without_writing(self):
+        """Com read_only=True o cache existente evita recalcular os hashes, mas nada é gravado."""
+        ImageSizes.load(self.static, self.cache_path, read_only=True)
+        self.assertFalse(os.path.exists(self.cache_path))
+        sizes = ImageSizes.load(self.static, self.cache_path)
+        before = os.stat(self.cache_path).st_mtime_ns
+
+        import images
+        original = images.hash_file
+        images.hash_file = lambda path: self.fail(f"{path} was hashed again")
+        try:
+            cached = ImageSizes.load(self.static, self.cache_path, read_only=True)
+        finally:
+            images.hash_file = original
+        self.assertEqual(cached.key, sizes.key)
+        self.write(os.path.join(self.static, "new.png"), PNG)
+        self.assertEqual(ImageSizes.load(self.static, self.cache_path, read_only=True).get("/new.png"), (640, 480))
+        self.assertEqual(os.stat(self.cache_path).st_mtime_ns, before)
+
+    def test_page_attributes(self):
+        """Imagens recebem width/height; só as que vêm depois da primeira ficam lazy."""
+        sizes = ImageSizes.load(self.static)
+        html = markdown_to_html_node("![A](/a.png)\n\n![B](/images/b.gif)", images=sizes).to_html()
+        self.assertIn('<img src="/a.png" alt="A" width="640" height="480">', html)
+        self.assertIn('<img src="/images/b.gif" alt="B" width="32" height="16" loading="lazy" decoding="async">',
+                      html)
+        # O contador é por página: a primeira imagem da próxima página também é eager
+        again = markdown_to_html_node("![A](/a.png)", images=sizes).to_html()
+        self.assertNotIn("loading", again)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -23,6 +23,19 @@ class TestLeafNode(unittest.TestCase):
         node = LeafNode(None, "Just text")
         self.assertEqual(node.to_html(), "Just text")
 
+    def test_leaf_to_html_escapes_text(self):
+        """O texto e os valores dos atributos devem ser escapados; aspas no texto ficam como estão."""
+        node = LeafNode("a", 'Tom & "Jerry" <3', {"href": '/search?q=a&b="c"'})
+        self.assertEqual(node.to_html(), '<a href="/search?q=a&amp;b=&quot;c&quot;">Tom &amp; "Jerry" &lt;3</a>')
+        self.assertEqual(LeafNode(None, "1 < 2 > 0").to_html(), "1 &lt; 2 &gt; 0")
+
+    def test_leaf_to_html_non_string_values(self):
+        """Valores que não são str são convertidos com str(), como antes do escape."""
+        self.assertEqual(LeafNode("p", 5).to_html(), "<p>5</p>")
+        self.assertEqual(LeafNode("img", "", {"width": 100}).to_html(), '<img width="100"></img>')
+        self.assertEqual(LeafNode("a", "link", {"href": None}).to_html(), '<a href="None">link</a>')
+        self.assertEqual(LeafNode("a", "link", {"class": ["a", "b"]}).to_html(), "<a class=\"['a', 'b']\">link</a>")
+
     def test_leaf_to_html_raises_value_error(self):
         """Testa se a criação de um LeafNode sem valor levanta um erro."""
         with self.assertRaises(ValueError):
@@ -1,5 +1,5 @@
 import unittest
-from markdown import markdown_to_blocks, extract_title
+from markdown import markdown_to_blocks, extract_title, iter_blocks, markdown_to_html_node, enable_inline_cache, disable_inline_cache, inline_cache_info
 
 
 class TestMarkdownToBlocks(unittest.TestCase):
@@ -37,12 +37,32 @@ class TestMarkdownToBlocks(unittest.TestCase):
         ```
         """
         expected = [
-            "```",
-            "Code block here",
-            "```"
+            "```\nCode block here\n```"
         ]
         self.assertEqual(markdown_to_blocks(md), expected)
 
+    def test_code_block_with_blank_line(self):
+        """Testa se um bloco de código com linha em branco e indentação continua sendo um único bloco"""
+        md = "Intro\n\n```\ndef f():\n\n    return 1\n```\n\nOutro"
+        expected = [
+            "Intro",
+            "```\ndef f():\n\n    return 1\n```",
+            "Outro"
+        ]
+        self.assertEqual(markdown_to_blocks(md), expected)
+
+    def test_iter_blocks_is_lazy(self):
+        """Testa se iter_blocks produz os blocos sob demanda"""
+        blocks = iter_blocks("# Title\n\nParagraph")
+        self.assertEqual(next(blocks), "# Title")
+        self.assertEqual(list(blocks), ["Paragraph"])
+
+    def test_code_block_html(self):
+        """Testa se o bloco de código é convertido em <pre><code> com o conteúdo original"""
+        md = "```\nfunc main(){\n    fmt.Println(\"hi\")\n}\n```"
+        html = markdown_to_html_node(md).to_html()
+        self.assertEqual(html, '<div><pre><code>func main(){\n    fmt.Println("hi")\n}\n</code></pre></div>')
+
     def test_list(self):
         """Testa se a função markdown_to_blocks separa corretamente listas markdown em blocos distintos, agrupando os itens de cada lista juntos"""
         md = """
@@ -113,5 +133,35 @@ class TestMarkdownToBlocks(unittest.TestCase):
 
 
 
+class TestInlineCache(unittest.TestCase):
+    def tearDown(self):
+        disable_inline_cache()
+
+    def test_disabled_by_default(self):
+        """O cache inline deve vir desativado."""
+        self.assertIsNone(inline_cache_info())
+
+    def test_repeated_fragments_share_nodes(self):
+        """Fragmentos repetidos devem reutilizar a mesma tupla de nós e gerar o mesmo HTML."""
+        md = "- [Home](/) | [Blog](/blog)\n- other\n\n- [Home](/) | [Blog](/blog)"
+        expected = markdown_to_html_node(md).to_html()
+        enable_inline_cache(maxsize=8)
+        tree = markdown_to_html_node(md)
+        self.assertEqual(tree.to_html(), expected)
+        first = tree.children[0].children[0].children
+        second = tree.children[1].children[0].children
+        self.assertIs(first, second)
+        self.assertIsInstance(first, tuple)
+        hits, misses, maxsize = inline_cache_info()
+        self.assertEqual((hits, misses, maxsize), (1, 2, 8))
+
+    def test_cache_is_bounded(self):
+        """O cache não deve guardar mais fragmentos do que o limite."""
+        cache = enable_inline_cache(maxsize=2)
+        for i in range(5):
+            markdown_to_html_node(f"Paragraph {i}")
+        self.assertEqual(cache.cache_info().currsize, 2)
+
+
 if __name__ == "__main__":
     unittest.main()
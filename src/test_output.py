@@ -0,0 +1,94 @@
+import builtins
+import os
+import tempfile
+import unittest
+from unittest import mock
+from fixtures import TempDirMixin
+from generator import generate_pages_recursive
+from output import OutputWriter
+from report import BuildReport
+
+
+class TestOutputWriter(TempDirMixin, unittest.TestCase):
+    def setUp(self):
+        super().setUp()
+        self.path = os.path.join(self.root, "out", "page.html")
+        self.writer = OutputWriter()
+
+    def read(self):
+        with open(self.path, "r", encoding="utf-8") as file:
+            return file.read()
+
+    def test_identical_content_is_not_rewritten(self):
+        """Conteúdo idêntico não deve reescrever o arquivo nem alterar o mtime."""
+        self.writer.write(self.path, "<p>olá</p>")
+        os.utime(self.path, ns=(1, 1))
+        self.writer.write(self.path, "<p>olá</p>")
+        self.assertEqual(os.stat(self.path).st_mtime_ns, 1)
+        self.assertEqual((self.writer.written, self.writer.skipped), (1, 1))
+
+    def test_identical_content_opens_no_file_for_writing(self):
+        """A comparação é feita antes de gravar: conteúdo idêntico não cria nenhum temporário."""
+        self.writer.write(self.path, "<p>olá</p>")
+        with mock.patch.object(builtins, "open", wraps=builtins.open) as opened:
+            self.writer.write(self.path, "<p>olá</p>")
+            with self.writer.open(self.path) as stream:
+                stream.write("<p>")
+                stream.write("olá</p>")
+        modes = [call.args[1] if len(call.args) > 1 else call.kwargs.get("mode", "r") for call in opened.call_args_list]
+        self.assertNotIn("wb", modes)
+        self.assertEqual(self.writer.skipped, 2)
+
+    def test_same_size_different_content_is_written(self):
+        """Arquivos do mesmo tamanho são comparados pelo hash."""
+        self.writer.write(self.path, "<p>aaa</p>")
+        self.writer.write(self.path, "<p>bbb</p>")
+        self.assertEqual(self.read(), "<p>bbb</p>")
+        self.assertEqual(self.writer.written, 2)
+
+    def test_streamed_changes_are_detected(self):
+        """Diferenças no meio, no fim ou no tamanho do conteúdo gravado aos poucos substituem o arquivo."""
+        self.writer.write(self.path, "<p>abc</p><p>def</p>")
+        for chunks in (["<p>abc</p>", "<p>xyz</p>"], ["<p>abc</p>"], ["<p>abc</p>", "<p>def</p>", "<p>ghi</p>"]):
+            with self.writer.open(self.path) as stream:
+                for chunk in chunks:
+                    stream.write(chunk)
+            self.assertEqual(self.read(), "".join(chunks))
+        self.assertEqual((self.writer.written, self.writer.skipped), (4, 0))
+        self.assertEqual(os.listdir(os.path.dirname(self.path)), ["page.html"])
+
+    def test_interrupted_write_keeps_previous_file(self):
+        """Uma falha durante a escrita mantém o arquivo anterior e não deixa temporários."""
+        self.writer.write(self.path, "<p>old</p>")
+        with self.assertRaises(RuntimeError):
+            with self.writer.open(self.path) as stream:
+                stream.write("<p>new")
+                raise RuntimeError("interrupted")
+        self.assertEqual(self.read(), "<p>old</p>")
+        self.assertEqual(os.listdir(os.path.dirname(self.path)), ["page.html"])
+
+
+class TestUnchangedPages(unittest.TestCase):
+    def test_full_rebuild_keeps_identical_pages(self):
+        """Um build completo sem mudanças não deve tocar nas páginas existentes."""
+        with tempfile.TemporaryDirectory() as root:
+            content = os.path.join(root, "content")
+            os.makedirs(content)
+            with open(os.path.join(content, "index.md"), "w", encoding="utf-8") as file:
+                file.write("# Home\n\n[Blog](/blog)")
+            template = os.path.join(root, "template.html")
+            with open(template, "w", encoding="utf-8") as file:
+                file.write("<title>{{ Title }}</title>{{ Content }}")
+            dest = os.path.join(root, "public")
+            generate_pages_recursive(content, template, dest, "/site/", report=BuildReport(quiet=True))
+            os.utime(os.path.join(dest, "index.html"), ns=(1, 1))
+
+            report = BuildReport(quiet=True)
+            generate_pages_recursive(content, template, dest, "/site/", report=report)
+            self.assertEqual(report.counters["pages_unchanged"], 1)
+            self.assertEqual(report.counters["pages_written"], 0)
+            self.assertEqual(os.stat(os.path.join(dest, "index.html")).st_mtime_ns, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,3 +1,4 @@
+import io
 import unittest
 from parentnode import ParentNode
 from leafnode import LeafNode
@@ -44,6 +45,23 @@ class TestParentNode(unittest.TestCase):
         parent_node = ParentNode("div", [child_node], {"class": "container", "id": "main"})
         self.assertEqual(parent_node.to_html(), '<div class="container" id="main"><span>child</span></div>')
 
+    def test_write_html_to_stream(self):
+        """Testa se write_html escreve no stream o mesmo HTML de to_html"""
+        parent_node = ParentNode("div", [ParentNode("p", [LeafNode("b", "bold"), LeafNode(None, " text")])], {"id": "x"})
+        stream = io.StringIO()
+        parent_node.write_html(stream)
+        self.assertEqual(stream.getvalue(), parent_node.to_html())
+        self.assertEqual(stream.getvalue(), '<div id="x"><p><b>bold</b> text</p></div>')
+
+    def test_deep_tree_does_not_hit_recursion_limit(self):
+        """Testa a renderização de uma árvore mais profunda que o limite de recursão"""
+        node = LeafNode(None, "deep")
+        for _ in range(5000):
+            node = ParentNode("span", [node])
+        html = node.to_html()
+        self.assertTrue(html.startswith("<span>" * 5000 + "deep"))
+        self.assertTrue(html.endswith("</span>" * 5000))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,129 @@
+import os
+import time
+import unittest
+from unittest import mock
+import generator
+import parse_cache
+from fixtures import TempDirMixin
+from generator import generate_pages_recursive
+from manifest import BuildManifest
+from parentnode import ParentNode
+from parse_cache import ParseCache
+from report import BuildReport
+
+
+class TestParseCache(TempDirMixin, unittest.TestCase):
+    def setUp(self):
+        super().setUp()
+        self.cache = ParseCache(os.path.join(self.root, "pages"))
+
+    def test_put_and_get(self):
+        """Uma entrada gravada deve ser lida de volta e contada como acerto."""
+        key = self.cache.key("# Title\n\nText")
+        self.assertIsNone(self.cache.get(key))
+        self.cache.put(key, "Title", "<div><p>Text</p></div>")
+        self.assertEqual(self.cache.get(key), ("Title", "<div><p>Text</p></div>"))
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+
+    def test_key_depends_on_content_and_parser_version(self):
+        """A chave muda com o markdown e com a versão do parser."""
+        key = self.cache.key("# Title")
+        self.assertNotEqual(key, self.cache.key("# Other"))
+        with mock.patch.object(parse_cache, "PARSER_VERSION", "test"):
+            self.assertNotEqual(key, self.cache.key("# Title"))
+
+    def test_evict_removes_least_recently_used(self):
+        """evict() remove primeiro as entradas usadas há mais tempo."""
+        self.cache.max_bytes = 250
+        keys = [self.cache.key(str(n)) for n in range(3)]
+        for age, key in enumerate(keys):
+            self.cache.put(key, "T", "x" * 100)
+            timestamp = time.time() - 100 + age
+            os.utime(self.cache._path(key), (timestamp, timestamp))
+        self.cache.get(keys[0])  # Passa a ser a mais recente
+        self.assertEqual(self.cache.evict(), 1)
+        self.assertIsNotNone(self.cache.get(keys[0]))
+        self.assertIsNone(self.cache.get(keys[1]))
+        self.assertIsNotNone(self.cache.get(keys[2]))
+
+
+class TestCachedBuild(TempDirMixin, unittest.TestCase):
+    def setUp(self):
+        super().setUp()
+        self.content = os.path.join(self.root, "content")
+        self.template = os.path.join(self.root, "template.html")
+        self.cache = ParseCache(os.path.join(self.root, ".cache", "pages"))
+        self.write(self.template, "<title>{{ Title }}</title><article>{{ Content }}</article>")
+        self.write(os.path.join(self.content, "index.md"), "# Home\n\n[link](/blog) and **bold**")
+        self.write(os.path.join(self.content, "blog", "post.md"), "# Post\n\n- one\n- two")
+
+    def read_tree(self, root):
+        pages = {}
+        for directory, _, files in os.walk(root):
+            for name in files:
+                path = os.path.join(directory, name)
+                with open(path, "r", encoding="utf-8") as file:
+                    pages[os.path.relpath(path, root)] = file.read()
+        return pages
+
+    def test_cached_build_matches_uncached(self):
+        """Builds servidos pelo cache produzem as mesmas páginas que um build sem cache."""
+        uncached = os.path.join(self.root, "uncached")
+        generate_pages_recursive(self.content, self.template, uncached, "/site/")
+        first, second = BuildReport(quiet=True), BuildReport(quiet=True)
+        cold = os.path.join(self.root, "cold")
+        warm = os.path.join(self.root, "warm")
+        generate_pages_recursive(self.content, self.template, cold, "/site/", report=first, parse_cache=self.cache)
+        generate_pages_recursive(self.content, self.template, warm, "/site/", report=second, parse_cache=self.cache)
+        self.assertEqual(first.counters["parse_cache_misses"], 2)
+        self.assertEqual(second.counters["parse_cache_hits"], 2)
+        self.assertEqual(self.read_tree(cold), self.read_tree(uncached))
+        self.assertEqual(self.read_tree(warm), self.read_tree(uncached))
+
+    def test_miss_streams_body_into_page_and_cache(self):
+        """Numa falha do cache, o corpo vai em streaming para a página e para a entrada, sem to_html()."""
+        dest = os.path.join(self.root, "public")
+        with mock.patch.object(ParentNode, "to_html", side_effect=AssertionError("materialized")):
+            generate_pages_recursive(self.content, self.template, dest, "/site/", parse_cache=self.cache)
+        html = self.read_tree(dest)["index.html"]
+        with open(os.path.join(self.content, "index.md"), "r", encoding="utf-8") as file:
+            key = self.cache.key(file.read(), generator.UrlRewriter("/site/"))
+        title, body = self.cache.get(key)
+        self.assertEqual(html, f"<title>{title}</title><article>{body}</article>")
+
+    def test_template_change_rewraps_cached_bodies(self):
+        """Se só o template mudou, as páginas são reembrulhadas sem converter o markdown."""
+        manifest = BuildManifest(os.path.join(self.root, "manifest.json"))
+        dest = os.path.join(self.root, "public")
+        generate_pages_recursive(self.content, self.template, dest, "/site/", manifest, parse_cache=self.cache)
+
+        self.write(self.template, "<main>{{ Content }}</main><h1>{{ Title }}</h1>")
+        report = BuildReport(quiet=True)
+        with mock.patch.object(generator, "markdown_to_html_node", side_effect=AssertionError("parsed")):
+            generate_pages_recursive(self.content, self.template, dest, "/site/", manifest,
+                                     report=report, parse_cache=self.cache)
+        self.assertEqual(report.counters["pages_rewrapped"], 2)
+        self.assertNotIn("pages_generated", report.counters)
+
+        expected = os.path.join(self.root, "expected")
+        generate_pages_recursive(self.content, self.template, expected, "/site/")
+        self.assertEqual(self.read_tree(dest), self.read_tree(expected))
+
+    def test_explicit_rewrap_and_changed_sources(self):
+        """rewrap=True reembrulha as páginas inalteradas; markdown alterado é convertido de novo."""
+        manifest = BuildManifest(os.path.join(self.root, "manifest.json"))
+        dest = os.path.join(self.root, "public")
+        generate_pages_recursive(self.content, self.template, dest, "/", manifest, parse_cache=self.cache)
+
+        self.write(os.path.join(self.content, "index.md"), "# Home\n\nChanged")
+        report = BuildReport(quiet=True)
+        generate_pages_recursive(self.content, self.template, dest, "/", manifest,
+                                 report=report, parse_cache=self.cache, rewrap=True)
+        self.assertEqual(report.counters["pages_rewrapped"], 1)
+        self.assertEqual(report.counters["pages_generated"], 1)
+        with open(os.path.join(dest, "index.html"), "r", encoding="utf-8") as file:
+            self.assertIn("<p>Changed</p>", file.read())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+import contextlib
+import io
+import json
+import os
+import tempfile
+import unittest
+from generator import generate_pages_recursive
+from leafnode import LeafNode
+from parentnode import ParentNode
+from report import PAGE_STAGES, BuildReport, count_nodes
+
+
+class TestBuildReport(unittest.TestCase):
+    def test_count_nodes(self):
+        """Deve contar todos os nós da árvore."""
+        tree = ParentNode("div", [ParentNode("p", [LeafNode("b", "x"), LeafNode(None, "y")])])
+        self.assertEqual(count_nodes(tree), 4)
+
+    def test_quiet_suppresses_messages(self):
+        """No modo quiet, log não deve escrever nada."""
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            BuildReport(quiet=True).log("Copied a to b")
+            BuildReport().log("Copied c to d")
+        self.assertEqual(output.getvalue(), "Copied c to d\n")
+
+    def test_profiled_build_writes_json_and_csv(self):
+        """Um build perfilado deve registrar as etapas de cada página e gravar JSON e CSV."""
+        with tempfile.TemporaryDirectory() as tmp:
+            content = os.path.join(tmp, "content")
+            os.makedirs(content)
+            for name in ("a", "b", "c"):
+                with open(os.path.join(content, f"{name}.md"), "w", encoding="utf-8") as file:
+                    file.write(f"# {name}\n\nSome **text**.")
+            template = os.path.join(tmp, "template.html")
+            with open(template, "w", encoding="utf-8") as file:
+                file.write("<title>{{ Title }}</title>{{ Content }}")
+
+            report = BuildReport(quiet=True, profile=True)
+            generate_pages_recursive(content, template, os.path.join(tmp, "public"), "/", report=report)
+            self.assertEqual(report.counters["pages_generated"], 3)
+            self.assertEqual(len(report.pages), 3)
+            for stage in PAGE_STAGES:
+                self.assertGreaterEqual(report.pages[0][stage], 0)
+            self.assertEqual(report.pages[0]["nodes"], 7)
+
+            json_path = os.path.join(tmp, "profile.json")
+            report.write(json_path, slowest=2)
+            with open(json_path, encoding="utf-8") as file:
+                data = json.load(file)
+            self.assertEqual(len(data["slowest"]), 2)
+            self.assertEqual(data["totals"]["bytes_in"], sum(page["bytes_in"] for page in report.pages))
+
+            csv_path = os.path.join(tmp, "profile.csv")
+            report.write(csv_path)
+            with open(csv_path, encoding="utf-8") as file:
+                self.assertEqual(len(file.read().strip().split("\n")), 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
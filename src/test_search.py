@@ -0,0 +1,115 @@
+import json
+import os
+import unittest
+from fixtures import TempDirMixin
+from generator import generate_pages_recursive
+from manifest import BuildManifest
+from search import SearchIndex, shard_name, tokenize
+
+
+TEMPLATE = "<title>{{ Title }}</title><article>{{ Content }}</article>"
+
+
+class TestTokenize(unittest.TestCase):
+    def test_tokenize(self):
+        """Termos em minúsculas, sem acentos e sem palavras de uma letra."""
+        self.assertEqual(tokenize("Númenor & a Queda de GONDOLIN!"), ["numenor", "queda", "de", "gondolin"])
+
+    def test_shard_name(self):
+        self.assertEqual(shard_name("gondolin"), "go")
+        self.assertEqual(shard_name("中文"), "_")
+
+
+class TestSearchIndex(TempDirMixin, unittest.TestCase):
+    def setUp(self):
+        super().setUp()
+        self.content = os.path.join(self.root, "content")
+        self.dest = os.path.join(self.root, "public")
+        self.template = os.path.join(self.root, "template.html")
+        self.state = os.path.join(self.root, ".cache", "search-index.json")
+        self.manifest = BuildManifest()
+        self.write(self.template, TEMPLATE)
+        self.write(os.path.join(self.content, "index.md"),
+                   "# Home\n\nWelcome to **Rivendell**, see [the blog](/blog/elrond).\n\n![Elrond portrait](/e.png)")
+        self.write(os.path.join(self.content, "blog", "elrond.md"), "# Elrond\n\n```\nprint('rivendell')\n```")
+
+    def read_json(self, name):
+        with open(os.path.join(self.dest, "search", name), "r", encoding="utf-8") as file:
+            return json.load(file)
+
+    def build(self, jobs=1, basepath="/"):
+        search = SearchIndex.load(self.state)
+        generate_pages_recursive(self.content, self.template, self.dest, basepath, self.manifest, jobs=jobs,
+                                 search=search)
+        search.save()
+        return search
+
+    def test_index_contents(self):
+        """O índice traz a tabela de páginas e os shards com os termos do texto, dos links, do alt e do código."""
+        self.build(basepath="/site/")
+        index = self.read_json("index.json")
+        self.assertEqual(index["pages"], [["/site/", "Home"], ["/site/blog/elrond.html", "Elrond"]])
+        self.assertIn("ri", index["shards"])
+        self.assertEqual(self.read_json("ri.json")["rivendell"], [0, 1, 1, 1])
+        self.assertEqual(self.read_json("bl.json")["blog"], [0, 1])
+        self.assertIn("portrait", self.read_json("po.json"))
+        self.assertIn("print", self.read_json("pr.json"))
+        # URLs não são indexadas
+        terms = set()
+        for name in index["shards"]:
+            terms.update(self.read_json(f"{name}.json"))
+        self.assertNotIn("png", terms)
+
+    def test_incremental_update(self):
+        """Só os shards dos termos de páginas alteradas são regravados; ids de páginas removidas são reaproveitados."""
+        self.build()
+        search_dir = os.path.join(self.dest, "search")
+        for name in os.listdir(search_dir):
+            os.utime(os.path.join(search_dir, name), ns=(1, 1))
+
+        self.write(os.path.join(self.content, "blog", "elrond.md"), "# Elrond\n\nLord of Imladris.")
+        self.build()
+        self.assertNotEqual(os.stat(os.path.join(search_dir, "im.json")).st_mtime_ns, 1)
+        self.assertEqual(os.stat(os.path.join(search_dir, "we.json")).st_mtime_ns, 1)
+        self.assertEqual(self.read_json("ri.json")["rivendell"], [0, 1])
+
+        os.remove(os.path.join(self.content, "blog", "elrond.md"))
+        self.build()
+        self.assertEqual(self.read_json("index.json")["pages"], [["/", "Home"]])
+        self.assertFalse(os.path.exists(os.path.join(search_dir, "im.json")))
+
+        self.write(os.path.join(self.content, "about.md"), "# About")
+        self.build()
+        self.assertEqual(self.read_json("index.json")["pages"], [["/", "Home"], ["/about.html", "About"]])
+
+    def test_failed_build_then_fixed_build(self):
+        """Termos gravados por um build que falhou têm os seus shards regravados no build seguinte."""
+        self.build()
+        elrond = os.path.join(self.content, "blog", "elrond.md")
+        with open(elrond, "r", encoding="utf-8") as file:
+            original = file.read()
+        self.write(os.path.join(self.content, "index.md"), "# Home\n\nWelcome to **Rivendellnew**")
+        self.write(elrond, "no title")
+        search = SearchIndex.load(self.state)
+        with self.assertRaises(ValueError):
+            generate_pages_recursive(self.content, self.template, self.dest, "/", self.manifest, search=search)
+        search.save()  # Como no finally do main.py
+
+        self.write(elrond, original)
+        self.build()
+        self.assertEqual(self.read_json("ri.json"), {"rivendell": [1, 1], "rivendellnew": [0, 1]})
+        self.assertFalse(os.path.exists(os.path.join(self.dest, "search", "bl.json")))
+
+    def test_parallel_build_matches_serial(self):
+        """Os termos coletados nos processos do pool produzem o mesmo índice do modo serial."""
+        self.build()
+        serial = {name: self.read_json(name) for name in os.listdir(os.path.join(self.dest, "search"))}
+        os.remove(self.state)
+        self.manifest = BuildManifest()
+        self.build(jobs=2)
+        parallel = {name: self.read_json(name) for name in os.listdir(os.path.join(self.dest, "search"))}
+        self.assertEqual(serial, parallel)
+
+
+if __name__ == "__main__":
+    unittest.main()
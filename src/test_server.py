@@ -0,0 +1,136 @@
+import asyncio
+import gzip
+import os
+import unittest
+from unittest import mock
+import server
+from fixtures import TempDirMixin
+from output import OutputWriter
+from server import FileCache, PreviewServer, accepts_gzip
+
+
+PAGE = "<html><body>" + "Hello, Middle-earth! " * 100 + "</body></html>"
+
+
+class TestPreviewServer(TempDirMixin, unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        super().setUp()
+        self.writer = OutputWriter()
+        self.writer.write(os.path.join(self.root, "index.html"), PAGE)
+        self.writer.write(os.path.join(self.root, "blog", "post", "index.html"), "<p>post</p>")
+        self.writer.write(os.path.join(self.root, "contact.html"), "<p>contact</p>")
+        self.server = PreviewServer(self.root, verbose=False)
+
+    async def get(self, target, **headers):
+        headers = {name.replace("_", "-"): value for name, value in headers.items()}
+        return await self.server.respond("GET", target, headers)
+
+    def test_accepts_gzip(self):
+        self.assertTrue(accepts_gzip("gzip, deflate, br"))
+        self.assertTrue(accepts_gzip("br;q=1.0, *;q=0.5"))
+        self.assertFalse(accepts_gzip("gzip;q=0, *"))
+        self.assertFalse(accepts_gzip(None))
+
+    async def test_etag_and_not_modified(self):
+        """A resposta traz um ETag forte; repeti-lo no If-None-Match devolve 304 sem corpo."""
+        response = await self.get("/")
+        self.assertEqual(response.status, 200)
+        self.assertEqual(response.body, PAGE.encode("utf-8"))
+        etag = response.header("ETag")
+        self.assertTrue(etag.startswith('"'))
+
+        cached = await self.get("/index.html", if_none_match=etag)
+        self.assertEqual(cached.status, 304)
+        self.assertEqual(cached.header("ETag"), etag)
+        self.assertNotIn(b"Content-Length", cached.encode())
+
+    async def test_gzip_negotiation(self):
+        """Com Accept-Encoding: gzip, o corpo vem comprimido e com um ETag próprio."""
+        plain = await self.get("/")
+        compressed = await self.get("/", accept_encoding="gzip")
+        self.assertEqual(compressed.header("Content-Encoding"), "gzip")
+        self.assertEqual(compressed.header("Vary"), "Accept-Encoding")
+        self.assertEqual(gzip.decompress(compressed.body), plain.body)
+        self.assertNotEqual(compressed.header("ETag"), plain.header("ETag"))
+        # Arquivos pequenos não valem a compressão
+        small = await self.get("/contact.html", accept_encoding="gzip")
+        self.assertIsNone(small.header("Content-Encoding"))
+
+    async def test_cache_is_invalidated_by_rewrites(self):
+        """Arquivos repetidos vêm do cache até o gerador reescrevê-los."""
+        first = await self.get("/")
+        await self.get("/")
+        self.assertEqual(self.server.cache.hits, 1)
+
+        self.writer.write(os.path.join(self.root, "index.html"), "<p>new</p>")
+        second = await self.get("/", if_none_match=first.header("ETag"))
+        self.assertEqual(second.status, 200)
+        self.assertEqual(second.body, b"<p>new</p>")
+
+    async def test_cache_is_bounded(self):
+        """O cache descarta os arquivos menos usados ao passar do limite."""
+        await self.get("/")
+        limit = self.server.cache.size + 20
+        self.server = PreviewServer(self.root, FileCache(max_bytes=limit), verbose=False)
+        await self.get("/")
+        await self.get("/contact")
+        self.assertEqual(len(self.server.cache.entries), 2)
+        await self.get("/blog/post/")
+        self.assertLessEqual(self.server.cache.size, limit)
+        self.assertNotIn(os.path.join(self.server.root, "index.html"), self.server.cache.entries)
+
+    async def test_large_files_are_streamed(self):
+        """Arquivos acima de MAX_CACHED_FILE não entram no cache nem são comprimidos, e o 304 não os lê."""
+        data = ("body { color: red; }\n" * 50).encode("utf-8")
+        self.writer.write(os.path.join(self.root, "big.css"), data)
+        with mock.patch.object(server, "MAX_CACHED_FILE", 100):
+            response = await self.get("/big.css", accept_encoding="gzip")
+            self.assertEqual((response.status, response.body, response.stream.size), (200, b"", len(data)))
+            self.assertIsNone(response.header("Content-Encoding"))
+            self.assertIn(f"Content-Length: {len(data)}".encode(), response.encode())
+            self.assertEqual(self.server.cache.entries, {})
+            with mock.patch("builtins.open", side_effect=AssertionError("read")):
+                cached = await self.get("/big.css", if_none_match=response.header("ETag"))
+            self.assertEqual(cached.status, 304)
+
+            server_ = await self.server.start("127.0.0.1", 0)
+            self.addAsyncCleanup(server_.wait_closed)
+            self.addCleanup(server_.close)
+            reader, writer = await asyncio.open_connection("127.0.0.1", server_.sockets[0].getsockname()[1])
+            writer.write(b"GET /big.css HTTP/1.1\r\nConnection: close\r\n\r\n")
+            self.assertTrue((await reader.read()).endswith(b"\r\n\r\n" + data))
+            writer.close()
+            await writer.wait_closed()
+
+    async def test_paths(self):
+        """Diretórios sem barra são redirecionados, "/contact" usa contact.html e nada sai da raiz."""
+        redirect = await self.get("/blog/post?x=1")
+        self.assertEqual((redirect.status, redirect.header("Location")), (301, "/blog/post/?x=1"))
+        self.assertEqual((await self.get("/contact")).body, b"<p>contact</p>")
+        self.assertEqual((await self.get("/missing")).status, 404)
+        self.assertEqual((await self.get("/../" + os.path.basename(self.root) + "/index.html")).status, 404)
+        self.assertEqual((await self.server.respond("POST", "/", {})).status, 405)
+
+    async def test_keep_alive_connection(self):
+        """Várias requisições podem usar a mesma conexão."""
+        server = await self.server.start("127.0.0.1", 0)
+        self.addAsyncCleanup(server.wait_closed)
+        self.addCleanup(server.close)
+        port = server.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        for _ in range(2):
+            writer.write(b"GET /contact.html HTTP/1.1\r\nHost: localhost\r\n\r\n")
+            head = await reader.readuntil(b"\r\n\r\n")
+            self.assertTrue(head.startswith(b"HTTP/1.1 200 OK"))
+            self.assertIn(b"Connection: keep-alive", head)
+            self.assertEqual(await reader.readexactly(len(b"<p>contact</p>")), b"<p>contact</p>")
+        writer.write(b"HEAD / HTTP/1.1\r\nConnection: close\r\n\r\n")
+        response = await reader.read()
+        self.assertIn(f"Content-Length: {len(PAGE)}".encode(), response)
+        self.assertTrue(response.endswith(b"\r\n\r\n"))
+        writer.close()
+        await writer.wait_closed()
+
+
+if __name__ == "__main__":
+    unittest.main()
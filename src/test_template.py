@@ -0,0 +1,55 @@
+import os
+import unittest
+from fixtures import TempDirMixin
+from template import compile_template
+
+
+class TestTemplate(TempDirMixin, unittest.TestCase):
+    def test_render_placeholders(self):
+        """Deve substituir os espaços reservados pelos valores nomeados."""
+        path = self.write("template.html", "<title>{{ Title }}</title><article>{{Content}}</article>")
+        template = compile_template(path)
+        self.assertEqual(template.names, {"Title", "Content"})
+        html = template.render({"Title": "Home", "Content": "<p>Hi</p>"})
+        self.assertEqual(html, "<title>Home</title><article><p>Hi</p></article>")
+
+    def test_values_are_not_rescanned(self):
+        """Valores que contêm espaços reservados não devem ser substituídos novamente."""
+        path = self.write("template.html", "{{ Title }}|{{ Content }}")
+        html = compile_template(path).render({"Title": "{{ Content }}", "Content": "body"})
+        self.assertEqual(html, "{{ Content }}|body")
+
+    def test_missing_value_keeps_placeholder(self):
+        """Espaços reservados sem valor devem ser mantidos como no texto original."""
+        path = self.write("template.html", "<p>{{ Author }}</p>")
+        self.assertEqual(compile_template(path).render({}), "<p>{{ Author }}</p>")
+
+    def test_include_partials(self):
+        """Parciais devem ser expandidos na compilação, relativos ao arquivo que os inclui."""
+        self.write("partials/head.html", "<title>{{ Title }}</title>{% include 'meta.html' %}")
+        self.write("partials/meta.html", "<meta charset=\"utf-8\" />")
+        path = self.write("template.html", "<head>{% include \"partials/head.html\" %}</head>{{ Content }}")
+        template = compile_template(path)
+        self.assertEqual(len(template.dependencies), 3)
+        html = template.render({"Title": "T", "Content": "C"})
+        self.assertEqual(html, "<head><title>T</title><meta charset=\"utf-8\" /></head>C")
+        self.assertEqual(len(template.parts), 4)
+
+    def test_circular_include(self):
+        """Inclusões circulares devem levantar ValueError."""
+        self.write("a.html", "{% include 'b.html' %}")
+        self.write("b.html", "{% include 'a.html' %}")
+        with self.assertRaises(ValueError):
+            compile_template(os.path.join(self.root, "a.html"))
+
+    def test_digest_tracks_partials(self):
+        """O hash do template deve mudar quando um parcial muda."""
+        self.write("nav.html", "<nav></nav>")
+        path = self.write("template.html", "{% include 'nav.html' %}{{ Content }}")
+        before = compile_template(path).digest
+        self.write("nav.html", "<nav>Home</nav>")
+        self.assertNotEqual(compile_template(path).digest, before)
+
+
+if __name__ == "__main__":
+    unittest.main()
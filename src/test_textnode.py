@@ -1,5 +1,5 @@
 import unittest
-from textnode import TextNode, TextType, text_node_to_html_node, split_nodes_delimiter, extract_markdown_images, extract_markdown_links, split_nodes_image, split_nodes_link, text_to_textnodes
+from textnode import TextNode, TextType, text_node_to_html_node, split_nodes_delimiter, extract_markdown_images, extract_markdown_links, split_nodes_image, split_nodes_link, text_to_textnodes, tokenize_inline
 from markdown import markdown_to_blocks
 
 
@@ -324,6 +324,30 @@ class TestTextNode(unittest.TestCase):
         ]
         self.assertEqual(text_to_textnodes(text), expected)
 
+    def test_underscore_inside_link_url(self):
+        """Delimitadores dentro da URL de um link não devem ser tratados como itálico."""
+        text = "See [docs](https://example.com/my_page) and _this_."
+        expected = [
+            TextNode("See ", TextType.NORMAL),
+            TextNode("docs", TextType.LINK, "https://example.com/my_page"),
+            TextNode(" and ", TextType.NORMAL),
+            TextNode("this", TextType.ITALIC),
+            TextNode(".", TextType.NORMAL)
+        ]
+        self.assertEqual(text_to_textnodes(text), expected)
+
+    def test_tokenize_unmatched_delimiter(self):
+        """O tokenizador deve levantar ValueError para delimitadores sem fechamento."""
+        with self.assertRaises(ValueError):
+            tokenize_inline("This is `broken code")
+
+    def test_tokenize_many_links(self):
+        """Textos com muitos links devem ser divididos corretamente em uma única passada."""
+        text = " ".join(f"[l{i}](/p{i})" for i in range(500))
+        nodes = tokenize_inline(text)
+        self.assertEqual(len(nodes), 999)
+        self.assertEqual(nodes[-1], TextNode("l499", TextType.LINK, "/p499"))
+
     def test_single_paragraph(self):
         """Testa um único parágrafo sem quebras de linha extras."""
         md = "This is a single paragraph."
@@ -0,0 +1,93 @@
+import os
+import unittest
+import main
+from copy_directory import sync_directory
+from fixtures import TempDirMixin
+from generator import generate_pages_recursive
+from manifest import BuildManifest
+from vfs import MemoryOutput
+
+
+TEMPLATE = "<title>{{ Title }}</title><article>{{ Content }}</article>"
+
+
+class TestMemoryOutput(TempDirMixin, unittest.TestCase):
+    def setUp(self):
+        super().setUp()
+        self.content = os.path.join(self.root, "content")
+        self.static = os.path.join(self.root, "static")
+        self.dest = os.path.join(self.root, "public")
+        self.template = os.path.join(self.root, "template.html")
+        self.write(self.template, TEMPLATE)
+        for i in range(4):
+            self.write(os.path.join(self.content, f"page{i}.md"), f"# Page {i}\n\nSome **text**.")
+        self.write(os.path.join(self.content, "blog", "post.md"), "# Post\n\n[Home](/)")
+        self.write(os.path.join(self.static, "index.css"), "body {}")
+
+    def build(self, writer=None, jobs=1):
+        sync_directory(self.static, self.dest, verbose=False, writer=writer)
+        generate_pages_recursive(self.content, self.template, self.dest, "/", jobs=jobs, writer=writer)
+
+    def test_build_does_not_touch_disk(self):
+        """O build em memória gera as mesmas páginas e assets do build em disco, sem criar o destino."""
+        output = MemoryOutput()
+        self.build(output)
+        self.assertFalse(os.path.exists(self.dest))
+        self.assertEqual(output.read(os.path.join(self.dest, "index.css")), b"body {}")
+
+        self.build()
+        self.assertEqual(output.diff(self.dest), ([], [], []))
+
+    def test_parallel_memory_build(self):
+        """Com jobs > 1, as páginas geradas nos processos voltam para a árvore principal."""
+        serial, parallel = MemoryOutput(), MemoryOutput()
+        self.build(serial)
+        self.build(parallel, jobs=2)
+        self.assertEqual(parallel.diff(self.dest, serial), ([], [], []))
+        self.assertEqual(parallel.written, 5)
+        self.build(parallel, jobs=2)
+        self.assertEqual(parallel.skipped, 5)
+
+    def test_incremental_build_and_diff(self):
+        """Com um manifesto, só as páginas alteradas são regeneradas; o diff entre builds mostra o que mudou."""
+        output, manifest = MemoryOutput(), BuildManifest()
+        generate_pages_recursive(self.content, self.template, self.dest, "/", manifest, writer=output)
+        previous = MemoryOutput()
+        previous.merge(dict(output.files))
+
+        os.remove(os.path.join(self.content, "page0.md"))
+        self.write(os.path.join(self.content, "page1.md"), "# Page 1\n\nChanged.")
+        self.write(os.path.join(self.content, "new.md"), "# New")
+        generate_pages_recursive(self.content, self.template, self.dest, "/", manifest, writer=output)
+        self.assertEqual(output.diff(self.dest, previous), (["new.html"], ["page1.html"], ["page0.html"]))
+
+    def test_flush(self):
+        """O flush grava a árvore no disco e não reescreve arquivos idênticos."""
+        output = MemoryOutput()
+        self.build(output)
+        self.assertEqual(output.flush().written, 6)
+        self.assertEqual(output.diff(self.dest), ([], [], []))
+        css = os.path.join(self.dest, "index.css")
+        # Os assets mantêm o mtime da origem, como na cópia para o disco
+        self.assertEqual(os.stat(css).st_mtime_ns, os.stat(os.path.join(self.static, "index.css")).st_mtime_ns)
+        self.assertEqual(output.flush().skipped, 6)
+
+    def test_memory_mode_creates_no_files(self):
+        """main.py --memory não grava nada no disco: nem docs/, nem manifesto, cache de parse ou de imagens."""
+        os.rename(self.content, os.path.join(self.root, main.CONTENT_DIR))
+        os.rename(self.template, os.path.join(self.root, main.TEMPLATE_FILE))
+        before = sorted(os.path.relpath(os.path.join(directory, name), self.root)
+                        for directory, _, names in os.walk(self.root) for name in names)
+        cwd = os.getcwd()
+        os.chdir(self.root)
+        self.addCleanup(os.chdir, cwd)
+        main.main(["--memory", "--search", "-q"])
+        after = sorted(os.path.relpath(os.path.join(directory, name), self.root)
+                       for directory, _, names in os.walk(self.root) for name in names)
+        self.assertEqual(after, before)
+        self.assertIn("pages written: 5", self.stdout.getvalue())
+        self.assertIn("0 changed, 0 removed compared to docs/static_site", self.stdout.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
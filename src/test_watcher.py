@@ -0,0 +1,114 @@
+import gzip
+import os
+import unittest
+from fixtures import SiteMixin
+from manifest import BuildManifest
+from generator import generate_pages_recursive
+from watcher import SiteWatcher, diff_snapshots, take_snapshot
+
+
+class TestSnapshots(unittest.TestCase):
+    def test_diff_snapshots(self):
+        """Deve separar arquivos adicionados, alterados e removidos."""
+        old = {"a": (1, 10), "b": (1, 10), "c": (1, 10)}
+        new = {"a": (1, 10), "b": (2, 10), "d": (1, 5)}
+        self.assertEqual(diff_snapshots(old, new), (["d"], ["b"], ["c"]))
+
+    def test_take_snapshot_missing_path(self):
+        """Um caminho inexistente deve produzir um retrato vazio."""
+        self.assertEqual(take_snapshot("/nonexistent/path/for/tests"), {})
+
+
+class TestSiteWatcher(SiteMixin, unittest.TestCase):
+    def setUp(self):
+        super().setUp()
+        self.manifest = BuildManifest()
+        generate_pages_recursive(self.content, self.template, self.dest, "/", self.manifest)
+        self.watcher = SiteWatcher(self.content, self.static, self.template, self.dest, "/", self.manifest)
+
+    def write(self, path, text):
+        super().write(path, text)
+        # Garante que o mtime muda mesmo em sistemas de arquivos com baixa resolução
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    def test_quiet_watcher_prints_no_per_file_messages(self):
+        """Com quiet=True, páginas e arquivos estáticos reconstruídos não geram mensagens."""
+        watcher = SiteWatcher(self.content, self.static, self.template, self.dest, "/", self.manifest, quiet=True,
+                              gzip_min_size=0)
+        self.write(os.path.join(self.content, "about.md"), "# About us")
+        self.write(os.path.join(self.static, "app.js"), "run()")
+        self.stdout.seek(0)
+        self.stdout.truncate()
+        self.assertTrue(watcher.poll())
+        self.assertIn("About us", self.read("about.html"))
+        self.assertTrue(os.path.exists(os.path.join(self.dest, "app.js.gz")))
+        self.assertEqual(self.stdout.getvalue(), "")
+
+    def test_no_changes(self):
+        """Sem alterações, poll não deve reconstruir nada."""
+        self.assertFalse(self.watcher.poll())
+
+    def test_content_change_rebuilds_only_that_page(self):
+        """Alterar um markdown deve regenerar somente a página correspondente."""
+        os.utime(os.path.join(self.dest, "about.html"), ns=(1, 1))
+        self.write(os.path.join(self.content, "index.md"), "# New Home")
+        self.assertTrue(self.watcher.poll())
+        self.assertIn("New Home", self.read("index.html"))
+        self.assertEqual(os.stat(os.path.join(self.dest, "about.html")).st_mtime_ns, 1)
+
+    def test_removed_content_removes_page(self):
+        """Remover um markdown deve remover a página gerada."""
+        os.remove(os.path.join(self.content, "about.md"))
+        self.watcher.poll()
+        self.assertFalse(os.path.exists(os.path.join(self.dest, "about.html")))
+        self.assertNotIn("about.md", self.manifest.pages)
+
+    def test_static_change_copies_asset(self):
+        """Um arquivo estático novo deve ser copiado e registrado no manifesto."""
+        self.write(os.path.join(self.static, "app.js"), "console.log(1)")
+        self.watcher.poll()
+        self.assertEqual(self.read("app.js"), "console.log(1)")
+        self.assertIn("app.js", self.manifest.assets)
+
+    def test_template_change_rewraps_all_pages(self):
+        """Alterar o template deve regenerar todas as páginas."""
+        self.write(self.template, "<main>{{ Content }}</main><title>{{ Title }}</title>")
+        self.watcher.poll()
+        self.assertTrue(self.read("index.html").startswith("<main>"))
+        self.assertTrue(self.read("about.html").startswith("<main>"))
+
+
+    def test_gzip_siblings_follow_rebuilds(self):
+        """Com gzip_min_size, os .gz acompanham cada página e asset reconstruído ou removido."""
+        watcher = SiteWatcher(self.content, self.static, self.template, self.dest, "/", self.manifest,
+                              gzip_min_size=0)
+        watcher.writer.verbose = False
+
+        def read_gzip(relative):
+            with gzip.open(os.path.join(self.dest, relative + ".gz"), "rt", encoding="utf-8") as file:
+                return file.read()
+
+        self.write(os.path.join(self.content, "about.md"), "# About us")
+        self.write(os.path.join(self.static, "app.js"), "run()")
+        watcher.poll()
+        self.assertEqual(read_gzip("about.html"), self.read("about.html"))
+        self.assertEqual(read_gzip("app.js"), "run()")
+
+        self.write(os.path.join(self.content, "about.md"), "# About them")
+        watcher.poll()
+        self.assertIn("About them", read_gzip("about.html"))
+
+        os.remove(os.path.join(self.content, "about.md"))
+        os.remove(os.path.join(self.static, "app.js"))
+        watcher.poll()
+        self.assertFalse(os.path.exists(os.path.join(self.dest, "about.html.gz")))
+        self.assertFalse(os.path.exists(os.path.join(self.dest, "app.js.gz")))
+
+        self.write(self.template, "<main>{{ Content }}</main><title>{{ Title }}</title>")
+        watcher.poll()
+        self.assertTrue(read_gzip("index.html").startswith("<main>"))
+
+
+if __name__ == "__main__":
+    unittest.main()
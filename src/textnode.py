@@ -16,6 +16,9 @@ class TextType(Enum):
 
 
 class TextNode:
+    # text_type guarda apenas a referência ao membro (único) de TextType
+    __slots__ = ("text", "text_type", "url")
+
     def __init__(self, text, text_type, url=None):
         self.text = text
         self.text_type = text_type
@@ -32,8 +35,14 @@ class TextNode:
         return f"TextNode({self.text}, {self.text_type.value}, {self.url})"
 
 
-def text_node_to_html_node(text_node):
-    """Converte um objeto TextNode em um objeto LeafNode correspondente com base no seu tipo (TextType)."""
+def text_node_to_html_node(text_node, urls=None, images=None):
+    """
+    Converte um objeto TextNode em um objeto LeafNode correspondente com base no seu tipo (TextType).
+
+    `urls` (por exemplo, um UrlRewriter) transforma a URL de links e imagens.
+    `images` (por exemplo, um PageImages) recebe a URL original de cada
+    imagem e retorna atributos extras (width, height, loading...).
+    """
     if text_node.text_type == TextType.NORMAL:
         return LeafNode(None, text_node.text)
     elif text_node.text_type == TextType.BOLD:
@@ -43,9 +52,14 @@ def text_node_to_html_node(text_node):
     elif text_node.text_type == TextType.CODE:
         return LeafNode("code", text_node.text)
     elif text_node.text_type == TextType.LINK:
-        return LeafNode("a", text_node.text, {"href": text_node.url})
+        url = urls(text_node.url) if urls is not None else text_node.url
+        return LeafNode("a", text_node.text, {"href": url})
     elif text_node.text_type == TextType.IMAGE:
-        return LeafNode("img", "",{"src": text_node.url,"alt": text_node.text})
+        url = urls(text_node.url) if urls is not None else text_node.url
+        props = {"src": url,"alt": text_node.text}
+        if images is not None:
+            props.update(images(text_node.url))
+        return LeafNode("img", "", props)
     else:
         raise ValueError("Unsupported TextType")
 
@@ -73,18 +87,26 @@ def split_nodes_delimiter(old_nodes, delimiter, text_type):
     return new_nodes
 
 
+IMAGE_PATTERN = re.compile(r"!\[([^\[\]]*)\]\(([^\(\)]*)\)")
+LINK_PATTERN = re.compile(r"(?<!!)\[([^\[\]]*)\]\(([^\(\)]*)\)")
+
+# Início de qualquer marcação inline: negrito, itálico, código, imagem ou link
+INLINE_OPENER = re.compile(r"\*\*|[_`\[]|!\[")
+INLINE_DELIMITERS = {"**": TextType.BOLD, "_": TextType.ITALIC, "`": TextType.CODE}
+
+
 def extract_markdown_images(text):
     """Extrai imagens em Markdown no formato ![alt text](URL)"""
-    return re.findall(r"!\[([^\[\]]*)\]\(([^\(\)]*)\)", text)
+    return IMAGE_PATTERN.findall(text)
 
 
 def extract_markdown_links(text):
     """Extrai links em Markdown no formato [anchor text](URL)"""
-    return re.findall(r"(?<!!)\[([^\[\]]*)\]\(([^\(\)]*)\)", text)
+    return LINK_PATTERN.findall(text)
 
 
-def split_nodes_image(old_nodes):
-    """Divide TextNodes em múltiplos nós baseando-se em imagens Markdown"""
+def _split_nodes_pattern(old_nodes, pattern, text_type):
+    """Divide os TextNodes normais nas ocorrências de `pattern`, percorrendo cada texto uma única vez."""
     new_nodes = []
 
     for node in old_nodes:
@@ -93,62 +115,83 @@ def split_nodes_image(old_nodes):
             continue
 
         text = node.text
-        images = extract_markdown_images(text)
-
-        if not images:
+        position = 0
+        for match in pattern.finditer(text):
+            if match.start() > position:
+                new_nodes.append(TextNode(text[position:match.start()], TextType.NORMAL))
+            new_nodes.append(TextNode(match.group(1), text_type, match.group(2)))
+            position = match.end()
+
+        if position == 0:
             new_nodes.append(node)
-            continue
+        elif position < len(text):
+            new_nodes.append(TextNode(text[position:], TextType.NORMAL))
 
-        for alt, url in images:
-            sections = text.split(f"![{alt}]({url})", 1)
-            if sections[0]:
-                new_nodes.append(TextNode(sections[0], TextType.NORMAL))
-            new_nodes.append(TextNode(alt, TextType.IMAGE, url))
-            text = sections[1] if len(sections) > 1 else ""
+    return new_nodes
 
-        if text:
-            new_nodes.append(TextNode(text, TextType.NORMAL))
 
-    return new_nodes
+def split_nodes_image(old_nodes):
+    """Divide TextNodes em múltiplos nós baseando-se em imagens Markdown"""
+    return _split_nodes_pattern(old_nodes, IMAGE_PATTERN, TextType.IMAGE)
 
 
 def split_nodes_link(old_nodes):
     """Divide TextNodes em múltiplos nós baseando-se em links Markdown"""
-    new_nodes = []
-
-    for node in old_nodes:
-        if node.text_type != TextType.NORMAL:
-            new_nodes.append(node)
+    return _split_nodes_pattern(old_nodes, LINK_PATTERN, TextType.LINK)
+
+
+def tokenize_inline(text: str) -> List[TextNode]:
+    """
+    Converte Markdown inline em TextNodes em uma única passada pelo texto.
+
+    A cada marcação encontrada o texto de abertura é casado diretamente com o
+    fechamento (str.find para delimitadores, regex ancorada para imagens e
+    links), de modo que cada caractere é visitado um número constante de vezes.
+    O conteúdo de negrito, itálico e código não é reprocessado, assim como na
+    sequência de split_nodes_*.
+    """
+    nodes = []
+    start = 0       # Início do trecho de texto normal pendente
+    position = 0
+    length = len(text)
+
+    while position < length:
+        opener = INLINE_OPENER.search(text, position)
+        if opener is None:
+            break
+        token = opener.group(0)
+        index = opener.start()
+
+        if token in INLINE_DELIMITERS:
+            close = text.find(token, index + len(token))
+            if close == -1:
+                raise ValueError(f"Invalid Markdown syntax: unmatched delimiter '{token}'")
+            if index > start:
+                nodes.append(TextNode(text[start:index], TextType.NORMAL))
+            inner = text[index + len(token):close]
+            if inner:
+                nodes.append(TextNode(inner, INLINE_DELIMITERS[token]))
+            position = start = close + len(token)
             continue
 
-        text = node.text
-        links = extract_markdown_links(text)
-
-        if not links:
-            new_nodes.append(node)
+        if token == "![":
+            match, text_type = IMAGE_PATTERN.match(text, index), TextType.IMAGE
+        else:
+            match, text_type = LINK_PATTERN.match(text, index), TextType.LINK
+        if match is None:
+            # Não é uma imagem/link válido: o caractere fica no texto normal
+            position = index + len(token)
             continue
+        if index > start:
+            nodes.append(TextNode(text[start:index], TextType.NORMAL))
+        nodes.append(TextNode(match.group(1), text_type, match.group(2)))
+        position = start = match.end()
 
-        for link_text, url in links:
-            sections = text.split(f"[{link_text}]({url})", 1)
-            if sections[0]:
-                new_nodes.append(TextNode(sections[0], TextType.NORMAL))
-            new_nodes.append(TextNode(link_text, TextType.LINK, url))
-            text = sections[1] if len(sections) > 1 else ""
-
-        if text:
-            new_nodes.append(TextNode(text, TextType.NORMAL))
-
-    return new_nodes
+    if start < length:
+        nodes.append(TextNode(text[start:], TextType.NORMAL))
+    return nodes
 
 
 def text_to_textnodes(text: str) -> List[TextNode]:
     """Converte uma string de Markdown para uma lista de TextNodes"""
-    nodes = [TextNode(text, TextType.NORMAL)]
-    
-    for delimiter, text_type in [("**", TextType.BOLD), ("_", TextType.ITALIC), ("`", TextType.CODE)]:
-        nodes = split_nodes_delimiter(nodes, delimiter, text_type)
-
-    nodes = split_nodes_image(nodes)
-    nodes = split_nodes_link(nodes)
-
-    return nodes
+    return tokenize_inline(text)
@@ -0,0 +1,82 @@
+import hashlib
+import json
+import re
+
+# Atributos href/src de um trecho de HTML (usado apenas nos literais do template)
+URL_ATTRIBUTE = re.compile(r'\b(href|src)="([^"]*)"')
+
+
+class UrlRewriter:
+    """
+    Transformação aplicada às URLs dos links e imagens de cada página.
+
+    URLs absolutas do site ("/blog", "/images/tom.png") recebem o basepath
+    e, se o asset tiver um nome com hash em `assets`, passam a apontar para
+    ele. URLs externas, relativas ou protocol-relative ("//cdn...") ficam
+    como estão. É aplicada aos props dos LeafNodes durante a construção da
+    árvore e, uma única vez, aos literais do template compilado; o HTML da
+    página nunca é varrido depois de pronto.
+    """
+
+    def __init__(self, basepath="/", assets=None):
+        self.basepath = basepath
+        self.assets = assets or {}
+        self.identity = basepath == "/" and not self.assets
+        # Identifica a transformação inteira (cache inline) e só o basepath (chaves do cache de parse)
+        state = json.dumps([basepath, self.assets], sort_keys=True)
+        self.key = hashlib.sha256(state.encode("utf-8")).hexdigest()
+        self.parse_key = hashlib.sha256(json.dumps([basepath]).encode("utf-8")).hexdigest()
+        self._originals = {hashed: path for path, hashed in self.assets.items()}
+
+    def __call__(self, url):
+        if self.identity or not url.startswith("/") or url.startswith("//"):
+            return url
+        path = url[1:]
+        if self.assets:
+            end = len(path)
+            for separator in "?#":
+                position = path.find(separator)
+                if position != -1:
+                    end = min(end, position)
+            path = self.assets.get(path[:end], path[:end]) + path[end:]
+        return self.basepath + path
+
+    def references(self, node):
+        """
+        URLs do site usadas nos href/src de uma árvore já transformada: {URL original: URL transformada}.
+
+        Guardadas com o corpo no cache de parse: em vez de a chave depender
+        de todos os assets do site, cada entrada é validada só com as URLs
+        que a página usa (ver ParseCache.get). Consultas e fragmentos
+        ("?v=1", "#topo") ficam de fora.
+        """
+        found = {}
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            props = current.props
+            for name in ("href", "src"):
+                url = props.get(name) if props else None
+                if not isinstance(url, str) or not url.startswith(self.basepath) or url.startswith("//"):
+                    continue
+                path = url[len(self.basepath):]
+                for separator in "?#":
+                    path = path.split(separator, 1)[0]
+                found["/" + self._originals.get(path, path)] = self.basepath + path
+            stack.extend(current.children)
+        return found
+
+    def rewrite_html(self, text):
+        """Aplica a transformação aos atributos href e src de um trecho de HTML."""
+        if self.identity:
+            return text
+        return URL_ATTRIBUTE.sub(lambda match: f'{match.group(1)}="{self(match.group(2))}"', text)
+
+    def __eq__(self, other):
+        return isinstance(other, UrlRewriter) and self.key == other.key
+
+    def __hash__(self):
+        return hash(self.key)
+
+    def __repr__(self):
+        return f"UrlRewriter(basepath={self.basepath!r}, assets={len(self.assets)})"
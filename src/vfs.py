@@ -0,0 +1,150 @@
+import contextlib
+import hashlib
+import io
+import os
+import time
+from output import OutputWriter
+
+
+class VirtualFile:
+    """Conteúdo de um arquivo da árvore em memória, com o mtime e o hash."""
+
+    def __init__(self, data, mtime_ns=None):
+        self.data = data
+        self.mtime_ns = mtime_ns if mtime_ns is not None else time.time_ns()
+        self.digest = hashlib.sha256(data).hexdigest()
+
+    @property
+    def size(self):
+        return len(self.data)
+
+    def __repr__(self):
+        return f"VirtualFile(size={self.size}, digest={self.digest[:10]})"
+
+
+class MemoryOutput:
+    """
+    Árvore de saída em memória, com a mesma interface do OutputWriter.
+
+    Pode ser passada como `writer` a generate_pages_recursive, a
+    sync_directory e a sync_fingerprinted: páginas, assets e arquivos
+    gerados vão para `files` ({caminho normalizado: VirtualFile}) em vez
+    do disco. Conteúdo idêntico ao já guardado conta como `skipped`, como
+    no OutputWriter. A árvore pode depois ser comparada com outra (`diff`)
+    ou gravada no disco de uma vez (`flush`).
+    """
+
+    def __init__(self):
+        self.files = {}
+        self.written = 0
+        self.skipped = 0
+
+    @staticmethod
+    def _key(path):
+        return os.path.normpath(path)
+
+    def _store(self, path, data, mtime_ns=None):
+        key = self._key(path)
+        current = self.files.get(key)
+        if current is not None and current.data == data:
+            self.skipped += 1
+            return False
+        self.files[key] = VirtualFile(data, mtime_ns)
+        self.written += 1
+        return True
+
+    @contextlib.contextmanager
+    def open(self, path):
+        """Abre um stream de texto para `path`; o conteúdo é guardado ao final do bloco with."""
+        stream = io.StringIO()
+        yield stream
+        self._store(path, stream.getvalue().encode("utf-8"))
+
+    def write(self, path, text):
+        self._store(path, text.encode("utf-8"))
+
+    def copy(self, src_path, dest_path, checksum=False, link=False):
+        """Copia um arquivo do disco para a árvore (mesma assinatura e retorno de sync_file)."""
+        stat = os.stat(src_path)
+        current = self.files.get(self._key(dest_path))
+        if current is not None and current.size == stat.st_size and current.mtime_ns == stat.st_mtime_ns:
+            return "skipped"
+        with open(src_path, "rb") as file:
+            data = file.read()
+        self.files[self._key(dest_path)] = VirtualFile(data, stat.st_mtime_ns)
+        return "copied"
+
+    def remove(self, path, root=None):
+        """Remove um arquivo da árvore (mesma assinatura e retorno de remove_file)."""
+        return self.files.pop(self._key(path), None) is not None
+
+    def exists(self, path):
+        return self._key(path) in self.files
+
+    def read(self, path):
+        return self.files[self._key(path)].data
+
+    def tree(self, root):
+        """Arquivos sob `root`, indexados pelo caminho relativo com "/"."""
+        root = self._key(root)
+        prefix = "" if root == "." else root + os.sep
+        return {key[len(prefix):].replace(os.sep, "/"): file
+                for key, file in self.files.items() if key.startswith(prefix)}
+
+    def diff(self, root, other=None):
+        """
+        Compara os arquivos sob `root` com outra árvore ou com o diretório no disco.
+
+        `other` é outro MemoryOutput; sem ele, a comparação é com os
+        arquivos de `root` no disco (pelo tamanho e, se preciso, pelo hash).
+        Retorna (adicionados, alterados, removidos), com caminhos relativos
+        ordenados.
+        """
+        ours = self.tree(root)
+        if other is not None:
+            theirs = {path: (file.size, file.digest) for path, file in other.tree(root).items()}
+        else:
+            theirs = {}
+            for directory, dirs, names in os.walk(root):
+                dirs.sort()
+                for name in names:
+                    path = os.path.join(directory, name)
+                    theirs[os.path.relpath(path, root).replace(os.sep, "/")] = path
+        added, changed = [], []
+        for path, file in sorted(ours.items()):
+            if path not in theirs:
+                added.append(path)
+            elif other is not None:
+                if theirs[path] != (file.size, file.digest):
+                    changed.append(path)
+            elif not OutputWriter.matches(theirs[path], file.size, file.digest):
+                changed.append(path)
+        removed = sorted(set(theirs) - set(ours))
+        return added, changed, removed
+
+    def flush(self, writer=None):
+        """
+        Grava todos os arquivos da árvore no disco em uma única passada.
+
+        A gravação usa o `writer` (OutputWriter), então arquivos idênticos
+        aos do disco não são reescritos; o mtime guardado (o da origem, nos
+        assets) é preservado. Retorna o writer, com os contadores.
+        """
+        writer = writer if writer is not None else OutputWriter()
+        for path, file in sorted(self.files.items()):
+            written = writer.written
+            with writer.open(path) as stream:
+                stream.write(file.data)
+            if writer.written != written:
+                os.utime(path, ns=(file.mtime_ns, file.mtime_ns))
+        return writer
+
+    def take(self):
+        """Retorna e esvazia os arquivos guardados (usado para devolver as páginas dos processos do pool)."""
+        files, self.files = self.files, {}
+        return files
+
+    def merge(self, files):
+        """Incorpora arquivos vindos de outra árvore, contando os gravados e os inalterados."""
+        for path, file in files.items():
+            self._store(path, file.data, file.mtime_ns)
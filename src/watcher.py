@@ -0,0 +1,226 @@
+import os
+import time
+from compress import GzipWriter, compress_directory
+from fingerprint import fingerprint_assets, sync_fingerprinted
+from generator import generate_pages_recursive, load_template, rebuild_page, resolve_jobs
+from images import ImageSizes
+from output import OutputWriter
+from report import BuildReport
+
+
+def take_snapshot(path):
+    """
+    Tira um retrato dos arquivos sob `path` (arquivo ou diretório).
+
+    Retorna um dicionário {caminho: (mtime_ns, tamanho)} obtido apenas com
+    os.scandir/os.stat, sem ler o conteúdo de nenhum arquivo.
+    """
+    snapshot = {}
+    if os.path.isfile(path):
+        stat = os.stat(path)
+        snapshot[path] = (stat.st_mtime_ns, stat.st_size)
+        return snapshot
+    stack = [path]
+    while stack:
+        directory = stack.pop()
+        try:
+            entries = os.scandir(directory)
+        except (FileNotFoundError, NotADirectoryError):
+            continue
+        with entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    else:
+                        stat = entry.stat()
+                        snapshot[entry.path] = (stat.st_mtime_ns, stat.st_size)
+                except FileNotFoundError:
+                    continue  # Removido durante a varredura
+    return snapshot
+
+
+def diff_snapshots(old, new):
+    """Compara dois retratos e retorna as listas ordenadas (adicionados, alterados, removidos)."""
+    added = sorted(path for path in new if path not in old)
+    removed = sorted(path for path in old if path not in new)
+    changed = sorted(path for path, info in new.items() if path in old and old[path] != info)
+    return added, changed, removed
+
+
+class SiteWatcher:
+    """
+    Observa content/, static/ e o template e reconstrói apenas o que depende da mudança.
+
+    - markdown alterado/criado/removido: regenera ou remove só aquela página;
+    - arquivo estático alterado/criado/removido: copia ou remove só aquele arquivo;
+    - template ou parcial alterado: regenera todas as páginas.
+
+    Com fingerprint=True, uma mudança em static/ sincroniza os assets com os
+    nomes com hash e, se algum hash mudou, atualiza as referências em todas
+    as páginas. Com `image_cache` (caminho do cache de dimensões), as
+    dimensões das imagens são relidas e, se mudaram, todas as páginas são
+    regeneradas. Com `search` (SearchIndex), o índice de busca acompanha
+    cada página reconstruída ou removida. Com `gzip_min_size` (o valor de
+    --gzip-min-size), os .gz de cada arquivo gravado ou removido são
+    atualizados junto com ele. Com quiet=True (-q), as mensagens por página
+    e por arquivo são suprimidas, como no build inicial.
+    """
+
+    def __init__(self, content_dir, static_dir, template_path, dest_dir, basepath, manifest=None, jobs=1,
+                 parse_cache=None, fingerprint=False, image_cache=None, search=None, gzip_min_size=None,
+                 quiet=False):
+        self.content_dir = content_dir
+        self.static_dir = static_dir
+        self.template_path = template_path
+        self.dest_dir = dest_dir
+        self.basepath = basepath
+        self.manifest = manifest
+        self.jobs = jobs
+        self.parse_cache = parse_cache
+        self.fingerprint = fingerprint
+        self.search = search
+        self.gzip_min_size = gzip_min_size
+        self.quiet = quiet
+        self.writer = GzipWriter(gzip_min_size, verbose=not quiet) if gzip_min_size is not None else OutputWriter()
+        self.assets = fingerprint_assets(static_dir, manifest) if fingerprint else None
+        self.image_cache = image_cache
+        self.images = ImageSizes.load(static_dir, image_cache) if image_cache is not None else None
+        self.template = load_template(template_path)
+        self.failures = 0  # Reconstruções que falharam (o erro é exibido e o laço continua)
+        self.snapshots = {
+            "content": take_snapshot(content_dir),
+            "static": take_snapshot(static_dir),
+        }
+        self.snapshots["template"] = self.snapshot_template()
+
+    def poll(self):
+        """Verifica uma vez se algo mudou e aplica as reconstruções necessárias. Retorna True se houve mudança."""
+        changed_any = False
+
+        template = self.snapshot_template()
+        if template != self.snapshots["template"]:
+            self.on_template_change()
+            # Os parciais incluídos podem ter mudado junto com o template
+            self.snapshots["template"] = self.snapshot_template()
+            changed_any = True
+
+        static = take_snapshot(self.static_dir)
+        added, changed, removed = diff_snapshots(self.snapshots["static"], static)
+        self.snapshots["static"] = static
+        if added or changed or removed:
+            self.on_static_change(added + changed, removed)
+            changed_any = True
+
+        content = take_snapshot(self.content_dir)
+        added, changed, removed = diff_snapshots(self.snapshots["content"], content)
+        self.snapshots["content"] = content
+        pages = [path for path in added + changed + removed if path.endswith(".md")]
+        if pages:
+            self.on_content_change(pages)
+            changed_any = True
+
+        if changed_any:
+            self.save()
+        return changed_any
+
+    def save(self):
+        """Grava o manifesto e o estado do índice de busca."""
+        if self.manifest is not None:
+            self.manifest.save()
+        if self.search is not None:
+            self.search.save()
+
+    def snapshot_template(self):
+        """Retrato do template e de todos os parciais incluídos por ele."""
+        snapshot = {}
+        for path in [self.template_path, *self.template.dependencies[1:]]:
+            snapshot.update(take_snapshot(path))
+        return snapshot
+
+    def on_template_change(self):
+        print(f"Template {self.template_path} changed, regenerating all pages...")
+        self.regenerate_all()
+
+    def regenerate_all(self):
+        try:
+            self.template = load_template(self.template_path)
+            generate_pages_recursive(self.content_dir, self.template_path, self.dest_dir,
+                                     self.basepath, self.manifest, jobs=self.jobs, report=BuildReport(quiet=self.quiet),
+                                     parse_cache=self.parse_cache, writer=self.writer, assets=self.assets,
+                                     images=self.images, search=self.search)
+            if self.gzip_min_size is not None:
+                # Com jobs > 1 as páginas são gravadas pelos processos do pool, sem passar pelo GzipWriter
+                compress_directory(self.dest_dir, min_size=self.gzip_min_size, jobs=resolve_jobs(self.jobs),
+                                   verbose=not self.quiet)
+        except Exception as error:
+            self.failures += 1
+            print(f"Failed to regenerate pages: {type(error).__name__}: {error}")
+
+    def on_static_change(self, updated, removed):
+        if self.fingerprint:
+            pages_changed = self.sync_fingerprinted()
+        else:
+            self.sync_static(updated, removed)
+            pages_changed = False
+        if self.image_cache is not None:
+            images = ImageSizes.load(self.static_dir, self.image_cache)
+            if images.key != self.images.key:
+                print("Image dimensions changed, regenerating all pages...")
+                self.images = images
+                pages_changed = True
+        if pages_changed:
+            self.regenerate_all()
+
+    def sync_static(self, updated, removed):
+        assets = set(self.manifest.assets) if self.manifest is not None else set()
+        for src_path in updated:
+            relative_path = os.path.relpath(src_path, self.static_dir)
+            dest_path = os.path.join(self.dest_dir, relative_path)
+            if self.writer.copy(src_path, dest_path) != "skipped" and not self.quiet:
+                print(f"Copied {src_path} to {dest_path}")
+            assets.add(relative_path)
+        for src_path in removed:
+            relative_path = os.path.relpath(src_path, self.static_dir)
+            dest_path = os.path.join(self.dest_dir, relative_path)
+            if self.writer.remove(dest_path, self.dest_dir) and not self.quiet:
+                print(f"Removed stale asset {dest_path}")
+            assets.discard(relative_path)
+        if self.manifest is not None:
+            self.manifest.assets = sorted(assets)
+
+    def sync_fingerprinted(self):
+        """Sincroniza static/ com os nomes com hash; retorna True se algum hash mudou."""
+        result, assets = sync_fingerprinted(self.static_dir, self.dest_dir, self.manifest, writer=self.writer,
+                                            basepath=self.basepath, verbose=not self.quiet)
+        if self.manifest is not None:
+            self.manifest.assets = result.files
+        if assets == self.assets:
+            return False
+        print("Asset fingerprints changed, updating references in all pages...")
+        self.assets = assets
+        return True
+
+    def on_content_change(self, pages):
+        for markdown_path in pages:
+            try:
+                rebuild_page(self.content_dir, markdown_path, self.template,
+                             self.dest_dir, self.basepath, self.manifest, report=BuildReport(quiet=self.quiet),
+                             parse_cache=self.parse_cache, writer=self.writer, assets=self.assets, images=self.images, search=self.search)
+            except Exception as error:
+                # Um markdown com erro não deve derrubar o modo watch
+                self.failures += 1
+                print(f"Failed to generate {markdown_path}: {type(error).__name__}: {error}")
+
+    def run(self, interval=0.05):
+        """Executa o laço de verificação até ser interrompido (Ctrl+C)."""
+        print(f"Watching {self.content_dir}, {self.static_dir} and {self.template_path} for changes...")
+        try:
+            while True:
+                started = time.perf_counter()
+                if self.poll():
+                    elapsed = (time.perf_counter() - started) * 1000
+                    print(f"Rebuilt in {elapsed:.1f} ms")
+                time.sleep(interval)
+        except KeyboardInterrupt:
+            print("Stopped watching.")